@@ -40,6 +40,57 @@ class CEP:
         self.__evaluation_manager.eval(events, matches, data_formatter)
         return (datetime.now() - start).total_seconds()
 
+    async def run_async(self, events, matches, data_formatter: DataFormatter):
+        """
+        An asyncio version of run. The events can be provided by an asynchronous iterator (e.g., an AsyncStream) and
+        the matches can be delivered to a sink whose add_item and close methods are coroutines. A regular input stream
+        is read in an executor thread. The evaluation yields control to the event loop between micro-batches of events.
+        Returns the total time elapsed during evaluation.
+        """
+        start = datetime.now()
+        await self.__evaluation_manager.eval_async(events, matches, data_formatter)
+        return (datetime.now() - start).total_seconds()
+
+    def iter_matches(self, events: InputStream, data_formatter: DataFormatter):
+        """
+        Applies the evaluation mechanism to detect the predefined patterns in a given stream of events, yielding the
+        matches as they are detected. The events are consumed lazily and no output stream is involved, hence the
+        consumer can stop at any point by abandoning the returned generator.
+        """
+        return self.__evaluation_manager.iter_matches(events, data_formatter)
+
+    def push_event(self, event, data_formatter: DataFormatter):
+        """
+        Feeds a single raw event to the engine and returns the list of matches detected as a result.
+        Unlike run, the state of the evaluation (including the partial matches within the time window) is retained
+        between the calls, hence the engine can serve as a long-lived handle fed in an online fashion.
+        The events must be pushed in the order of their timestamps.
+        """
+        return self.__evaluation_manager.push_events([event], data_formatter)
+
+    def push_events(self, events: List, data_formatter: DataFormatter):
+        """
+        Feeds a batch of raw events to the engine and returns the list of matches detected as a result.
+        """
+        return self.__evaluation_manager.push_events(events, data_formatter)
+
+    def flush(self):
+        """
+        Returns the matches that would otherwise only be reported at the end of the input (e.g., matches of patterns
+        ending with a negative event which wait for the time window to expire). The engine remains usable afterwards.
+        """
+        return self.__evaluation_manager.flush()
+
+    def advance_watermark(self, watermark: datetime):
+        """
+        Declares that no more events with timestamps preceding the given watermark will be pushed. The logical time of
+        the engine is advanced to the watermark, evicting the expired partial matches throughout the evaluation
+        structure, including the parts that receive no new events. Returns the list of matches detected as a result
+        (e.g., matches of patterns ending with a negative event whose time window has passed).
+        Can be invoked periodically as a heartbeat when the events are sparse.
+        """
+        return self.__evaluation_manager.advance_watermark(watermark)
+
     def get_pattern_match(self):
         """
         Returns one match from the output stream.
@@ -55,8 +106,22 @@ class CEP:
         """
         return self.__evaluation_manager.get_pattern_match_stream()
 
+    def get_reorder_statistics(self):
+        """
+        Returns the metrics of the out-of-order event handling (e.g., the number of dropped late events), or None if
+        no lateness bound was configured.
+        """
+        return self.__evaluation_manager.get_reorder_statistics()
+
     def get_evaluation_mechanism_structure_summary(self):
         """
         Returns an object summarizing the structure of the underlying evaluation mechanism.
         """
         return self.__evaluation_manager.get_structure_summary()
+
+    def get_evaluation_mechanism_storage_summary(self):
+        """
+        Returns an object summarizing the structure of the underlying evaluation mechanism along with the kind of
+        storage selected for the partial matches of each node (e.g., a hash index for a join by an equality condition).
+        """
+        return self.__evaluation_manager.get_storage_summary()
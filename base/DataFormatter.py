@@ -1,4 +1,7 @@
 from abc import ABC
+from typing import List
+
+from misc.TimestampUtils import datetime_to_epoch_micros
 
 
 class EventTypeClassifier(ABC):
@@ -30,12 +33,45 @@ class DataFormatter(ABC):
         """
         raise NotImplementedError()
 
+    def get_raw_event_type(self, raw_data: str):
+        """
+        Deduces and returns the type of the event represented by the given raw data object without fully parsing it.
+        This method is optional for a DataFormatter subclass and is only used to quickly drop the raw data items
+        whose type is not referenced by any pattern. By default, None is returned, meaning that the type cannot be
+        deduced without parsing the entire item.
+        """
+        return None
+
     def get_event_timestamp(self, event_payload: dict):
         """
         Deduces and returns the timestamp of the event specified by the given payload.
         """
         raise NotImplementedError()
 
+    def get_event_timestamps(self, event_payloads: List[dict]):
+        """
+        Deduces and returns the timestamps of the events specified by the given list of payloads.
+        Subclasses may override this method to convert a batch of timestamps more efficiently.
+        """
+        get_event_timestamp = self.get_event_timestamp
+        return [get_event_timestamp(event_payload) for event_payload in event_payloads]
+
+    def get_event_timestamp_micros(self, event_payload: dict):
+        """
+        Returns the timestamp of the event specified by the given payload as an integer number of microseconds since
+        the epoch. By default, the datetime returned by get_event_timestamp is converted. Subclasses may override this
+        method to compute the integer timestamp directly from the raw attribute values.
+        """
+        return datetime_to_epoch_micros(self.get_event_timestamp(event_payload))
+
+    def get_event_timestamps_micros(self, event_payloads: List[dict]):
+        """
+        Returns the timestamps of the events specified by the given list of payloads as integer numbers of
+        microseconds since the epoch.
+        """
+        get_event_timestamp_micros = self.get_event_timestamp_micros
+        return [get_event_timestamp_micros(event_payload) for event_payload in event_payloads]
+
     def get_event_type(self, event_payload: dict):
         """
         Deduces and returns the type of the event specified by the given payload.
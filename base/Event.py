@@ -1,6 +1,8 @@
+from collections.abc import Mapping
 from typing import List
 
 from base.DataFormatter import DataFormatter
+from misc.TimestampUtils import datetime_to_epoch_micros
 
 
 class Event:
@@ -10,22 +12,95 @@ class Event:
     attributes using an appropriate data formatter.
     """
 
+    __slots__ = ("payload", "type", "min_timestamp", "max_timestamp", "timestamp", "probability")
+
     # used in order to assign a serial number to each event that enters the system
     counter = 0
 
     INDEX_ATTRIBUTE_NAME = "InternalIndexAttributeName"
     HIDDEN_ATTRIBUTE_NAMES = [INDEX_ATTRIBUTE_NAME]
 
-    def __init__(self, raw_data: str, data_formatter: DataFormatter):
-        self.payload = data_formatter.parse_event(raw_data)
+    def __init__(self, raw_data: str, data_formatter: DataFormatter, payload: dict = None, timestamp=None):
+        """
+        Creates an event from the given raw data item. If the payload was already obtained by parsing the raw data,
+        it can be provided to avoid parsing the same item twice. Similarly, a timestamp already extracted from the
+        payload (e.g., as a part of a batch) can be provided.
+        """
+        self.payload = data_formatter.parse_event(raw_data) if payload is None else payload
         self.type = data_formatter.get_event_type(self.payload)
-        self.min_timestamp = self.max_timestamp = self.timestamp = data_formatter.get_event_timestamp(self.payload)
+        if timestamp is None:
+            timestamp = data_formatter.get_event_timestamp(self.payload)
+        self.min_timestamp = self.max_timestamp = self.timestamp = timestamp
         self.payload[Event.INDEX_ATTRIBUTE_NAME] = Event.counter
         self.probability = data_formatter.get_probability(self.payload)
         if self.probability is not None and (self.probability < 0.0 or self.probability > 1.0):
             raise Exception("Invalid value for probability:%s" % (self.probability,))
         Event.counter += 1
 
+    @classmethod
+    def from_raw_data(cls, raw_data, data_formatter: DataFormatter, integer_timestamps: bool = False):
+        """
+        Returns the event corresponding to the given item of an input stream, parsing the item exactly once.
+        An input stream may also yield ready Event objects, in which case they are returned as is.
+        None is returned for raw items that do not represent an event (e.g., a CSV header row).
+        If integer_timestamps is set, the timestamps of the returned event are integer microseconds since the epoch.
+        """
+        if isinstance(raw_data, Event):
+            return raw_data.with_integer_timestamps() if integer_timestamps else raw_data
+        payload = data_formatter.parse_event(raw_data)
+        if payload is None:
+            return None
+        timestamp = data_formatter.get_event_timestamp_micros(payload) if integer_timestamps else None
+        return cls(raw_data, data_formatter, payload, timestamp)
+
+    @classmethod
+    def from_raw_data_batch(cls, raw_data_batch: list, data_formatter: DataFormatter,
+                            integer_timestamps: bool = False):
+        """
+        Returns the events corresponding to the given batch of input stream items, preserving their order.
+        Items that do not represent an event are omitted. The timestamps of the newly parsed events are extracted
+        using a single bulk call to the data formatter.
+        """
+        items, payloads = [], []
+        for raw_data in raw_data_batch:
+            if isinstance(raw_data, Event):
+                items.append(raw_data.with_integer_timestamps() if integer_timestamps else raw_data)
+                continue
+            payload = data_formatter.parse_event(raw_data)
+            if payload is not None:
+                items.append(raw_data)
+                payloads.append(payload)
+        if len(payloads) == 0:
+            return items
+        timestamps = data_formatter.get_event_timestamps_micros(payloads) if integer_timestamps \
+            else data_formatter.get_event_timestamps(payloads)
+        events = []
+        parsed_index = 0
+        for item in items:
+            if isinstance(item, Event):
+                events.append(item)
+                continue
+            events.append(cls(item, data_formatter, payloads[parsed_index], timestamps[parsed_index]))
+            parsed_index += 1
+        return events
+
+    def with_integer_timestamps(self):
+        """
+        Returns an event identical to this one whose timestamps are integer microseconds since the epoch.
+        The event itself is returned if its timestamps are already integers. Otherwise, a copy sharing the payload of
+        this event is created, as the original event might be concurrently processed by other components.
+        """
+        if isinstance(self.timestamp, int):
+            return self
+        event = object.__new__(type(self))
+        event.payload = self.payload
+        event.type = self.type
+        event.probability = self.probability
+        event.timestamp = datetime_to_epoch_micros(self.timestamp)
+        event.min_timestamp = datetime_to_epoch_micros(self.min_timestamp)
+        event.max_timestamp = datetime_to_epoch_micros(self.max_timestamp)
+        return event
+
     def __eq__(self, other):
         return self.payload[Event.INDEX_ATTRIBUTE_NAME] == other.payload[Event.INDEX_ATTRIBUTE_NAME]
 
@@ -44,11 +119,81 @@ class Event:
         return result
 
 
+class EventSchema:
+    """
+    The attribute layout shared by all compact events whose payloads consist of the same attributes in the same order.
+    """
+    __slots__ = ("keys", "positions")
+
+    # maps a tuple of attribute names to the corresponding schema
+    __schemas = {}
+
+    def __init__(self, keys: tuple):
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+
+    @staticmethod
+    def get_schema(keys: tuple):
+        """
+        Returns the schema of the given attribute names, creating it on first use.
+        """
+        schema = EventSchema.__schemas.get(keys)
+        if schema is None:
+            schema = EventSchema.__schemas.setdefault(keys, EventSchema(keys))
+        return schema
+
+
+class CompactPayload(Mapping):
+    """
+    A read-only dict-like event payload storing the attribute values in a tuple, while the attribute names and
+    positions are kept in a schema shared by all events of the same structure.
+    """
+    __slots__ = ("schema", "values")
+
+    def __init__(self, payload: dict):
+        self.schema = EventSchema.get_schema(tuple(payload.keys()))
+        self.values = tuple(payload.values())
+
+    def __getitem__(self, key):
+        return self.values[self.schema.positions[key]]
+
+    def get(self, key, default=None):
+        position = self.schema.positions.get(key)
+        return default if position is None else self.values[position]
+
+    def __contains__(self, key):
+        return key in self.schema.positions
+
+    def __iter__(self):
+        return iter(self.schema.keys)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return repr(dict(zip(self.schema.keys, self.values)))
+
+
+class CompactEvent(Event):
+    """
+    A memory-efficient representation of a primitive event. The payload is converted upon creation into a
+    CompactPayload, which is accessed exactly like a regular payload dictionary by conditions and other components.
+    Compact events are useful when a large number of events must be kept in memory, e.g., due to long time windows.
+    """
+    __slots__ = ()
+
+    def __init__(self, raw_data: str, data_formatter: DataFormatter, payload: dict = None, timestamp=None):
+        super().__init__(raw_data, data_formatter, payload, timestamp)
+        self.payload = CompactPayload(self.payload)
+
+
 class AggregatedEvent(Event):
     """
     Represents a set of events produced by a Kleene closure operator.
     TODO: as of now, can only be used for a flat (non-nested) Kleene closure.
     """
+    __slots__ = ("primitive_events",)
+
     def __init__(self, events: List[Event], probability: float):
         self.type = None if len(events) == 0 else events[0].type  # will not be set correctly for nested Kleene closures
         self.probability = probability
@@ -1,6 +1,8 @@
 from base.Event import Event
 from typing import List
 
+from misc.TimestampUtils import epoch_micros_to_datetime
+
 
 class PatternMatch:
     """
@@ -16,6 +18,25 @@ class PatternMatch:
         self.pattern_ids = []
         self.probability = probability
 
+    @property
+    def first_datetime(self):
+        """
+        Returns the earliest timestamp of this match as a datetime object. If the match was created by an engine
+        operating on integer timestamps, the conversion only takes place upon request.
+        """
+        return PatternMatch.__to_datetime(self.first_timestamp)
+
+    @property
+    def last_datetime(self):
+        """
+        Returns the latest timestamp of this match as a datetime object.
+        """
+        return PatternMatch.__to_datetime(self.last_timestamp)
+
+    @staticmethod
+    def __to_datetime(timestamp):
+        return epoch_micros_to_datetime(timestamp) if isinstance(timestamp, int) else timestamp
+
     def __eq__(self, other):
         return isinstance(other, PatternMatch) and set(self.events) == set(other.events) and \
                self.pattern_ids == other.pattern_ids
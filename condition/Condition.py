@@ -35,6 +35,13 @@ class RelopTypes(Enum):
             return RelopTypes.GreaterEqual
         return None
 
+    @staticmethod
+    def is_range_relop_type(relop_type):
+        """
+        Returns True if the given relation operation type is one of "smaller than" and "greater than" relations.
+        """
+        return relop_type in (RelopTypes.Greater, RelopTypes.GreaterEqual, RelopTypes.Smaller, RelopTypes.SmallerEqual)
+
 
 class EquationSides(Enum):
     left = 0,
@@ -14,8 +14,53 @@ class EvaluationMechanism(ABC):
         """
         raise NotImplementedError()
 
+    def iter_matches(self, events: InputStream, data_formatter: DataFormatter):
+        """
+        Receives an input stream of events and lazily yields the detected pattern matches.
+        """
+        raise NotImplementedError()
+
+    async def eval_async(self, events, matches, data_formatter: DataFormatter):
+        """
+        An asyncio version of eval, receiving an asynchronous input stream and an asynchronous match sink.
+        """
+        raise NotImplementedError()
+
+    def push_events(self, raw_events: list, data_formatter: DataFormatter):
+        """
+        Incrementally evaluates the given events, keeping the state of the evaluation between the calls.
+        Returns the matches detected as a result.
+        """
+        raise NotImplementedError()
+
+    def flush(self):
+        """
+        Returns the matches pending the end of the input stream without discarding the state of the evaluation.
+        """
+        raise NotImplementedError()
+
+    def advance_watermark(self, watermark):
+        """
+        Advances the logical time of the evaluation to the given watermark, evicting the expired state.
+        Returns the matches detected as a result.
+        """
+        raise NotImplementedError()
+
+    def get_reorder_statistics(self):
+        """
+        Returns the metrics of the out-of-order event handling, or None if it is disabled.
+        """
+        raise NotImplementedError()
+
     def get_structure_summary(self):
         """
         Returns an object summarizing the structure of this evaluation mechanism.
         """
         raise NotImplementedError()
+
+    def get_storage_summary(self):
+        """
+        Returns an object summarizing the structure of this evaluation mechanism along with the way the partial
+        matches are stored.
+        """
+        raise NotImplementedError()
@@ -39,11 +39,30 @@ class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
                  storage_params: TreeStorageParameters = TreeStorageParameters(),
                  optimizer_params: OptimizerParameters = StatisticsDeviationAwareOptimizerParameters(),
                  tree_update_type: TreeEvaluationMechanismUpdateTypes = DefaultConfig.DEFAULT_TREE_UPDATE_TYPE,
-                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters()):
+                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters(),
+                 batch_size: int = DefaultConfig.EVENT_BATCH_SIZE,
+                 compact_events: bool = DefaultConfig.USE_COMPACT_EVENTS,
+                 integer_timestamps: bool = DefaultConfig.USE_INTEGER_TIMESTAMPS,
+                 max_lateness: timedelta = DefaultConfig.MAX_EVENT_LATENESS,
+                 watermark_interval: timedelta = DefaultConfig.WATERMARK_INTERVAL):
         super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params)
+        if batch_size < 1:
+            raise Exception("batch_size must be a positive number, got %s" % (batch_size,))
+        if integer_timestamps and optimizer_params.statistics_updates_time_window is not None:
+            # TODO: support integer timestamps in the statistics collectors
+            raise Exception("Integer timestamps are not supported in the adaptive evaluation mode")
+        if max_lateness is not None and max_lateness < timedelta(0):
+            raise Exception("max_lateness must not be negative, got %s" % (max_lateness,))
+        if watermark_interval is not None and watermark_interval <= timedelta(0):
+            raise Exception("watermark_interval must be positive, got %s" % (watermark_interval,))
         self.storage_params = storage_params
         self.tree_update_type = tree_update_type
         self.local_search_params = local_search_params
+        self.batch_size = batch_size
+        self.compact_events = compact_events
+        self.integer_timestamps = integer_timestamps
+        self.max_lateness = max_lateness
+        self.watermark_interval = watermark_interval
 
 
 class EvaluationMechanismFactory:
@@ -87,7 +106,10 @@ class EvaluationMechanismFactory:
 
         return EvaluationMechanismFactory.__create_tree_based_evaluation_mechanism_by_update_type(
             pattern_to_tree_plan_map, eval_mechanism_params.storage_params, runtime_statistics_collector, optimizer,
-            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type)
+            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type,
+            eval_mechanism_params.batch_size, eval_mechanism_params.compact_events,
+            eval_mechanism_params.integer_timestamps, eval_mechanism_params.max_lateness,
+            eval_mechanism_params.watermark_interval)
 
     @staticmethod
     def __merge_tree_plans(pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
@@ -121,7 +143,12 @@ class EvaluationMechanismFactory:
                                                                 statistics_collector: StatisticsCollector,
                                                                 optimizer: Optimizer,
                                                                 statistics_update_time_window: timedelta,
-                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes):
+                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes,
+                                                                batch_size: int,
+                                                                compact_events: bool,
+                                                                integer_timestamps: bool,
+                                                                max_lateness: timedelta,
+                                                                watermark_interval: timedelta):
         """
         Instantiates a tree-based evaluation mechanism given all the parameters.
         """
@@ -130,12 +157,22 @@ class EvaluationMechanismFactory:
                                                        storage_params,
                                                        statistics_collector,
                                                        optimizer,
-                                                       statistics_update_time_window)
+                                                       statistics_update_time_window,
+                                                       batch_size,
+                                                       compact_events,
+                                                       integer_timestamps,
+                                                       max_lateness,
+                                                       watermark_interval)
 
         if tree_update_type == TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION:
             return SimultaneousTreeBasedEvaluationMechanism(pattern_to_tree_plan_map,
                                                             storage_params,
                                                             statistics_collector,
                                                             optimizer,
-                                                            statistics_update_time_window)
+                                                            statistics_update_time_window,
+                                                            batch_size,
+                                                            compact_events,
+                                                            integer_timestamps,
+                                                            max_lateness,
+                                                            watermark_interval)
         raise Exception("Unknown evaluation mechanism type: %s" % (tree_update_type,))
@@ -0,0 +1,115 @@
+"""
+This file contains the reorder buffer, which restores the timestamp order of a slightly out-of-order event stream
+(e.g., a stream merged from multiple sources) before the events are passed to an evaluation mechanism.
+"""
+import heapq
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from base.Event import Event
+
+
+class ReorderBufferStatistics:
+    """
+    Metrics collected by a reorder buffer.
+    """
+    def __init__(self):
+        # the number of events that arrived after an event with a later timestamp
+        self.out_of_order_events = 0
+        # the number of events that arrived too late to be reordered and were dropped
+        self.dropped_late_events = 0
+        # the maximal difference between the latest timestamp seen so far and the timestamp of an arriving event
+        self.max_observed_lateness = None
+
+    def __repr__(self):
+        return "out-of-order events: %s, dropped late events: %s, max observed lateness: %s" % \
+               (self.out_of_order_events, self.dropped_late_events, self.max_observed_lateness)
+
+
+class ReorderBuffer:
+    """
+    Holds the arriving events in a min-heap ordered by timestamp. An event is released once an event whose timestamp
+    exceeds its own by at least max_lateness has arrived, hence the released events are always sorted as long as no
+    event is delayed by more than max_lateness. An event arriving later than that, that is, with a timestamp preceding
+    the timestamp of an already released event, is dropped.
+    """
+    def __init__(self, max_lateness: timedelta or int):
+        self.__max_lateness = max_lateness
+        self.__heap = []
+        # breaks timestamp ties such that the events sharing a timestamp are released in the order of their arrival
+        self.__sequence_number = 0
+        self.__max_timestamp = None
+        self.__last_released_timestamp = None
+        self.statistics = ReorderBufferStatistics()
+
+    def add(self, event: Event):
+        """
+        Adds an event to the buffer and returns the events that can now be released, sorted by timestamp.
+        """
+        self.__push(event)
+        return self.__release()
+
+    def add_many(self, events: Iterable[Event]):
+        """
+        Adds a batch of events to the buffer and returns the events that can now be released, sorted by timestamp.
+        """
+        for event in events:
+            self.__push(event)
+        return self.__release()
+
+    def release_until(self, watermark: datetime or int):
+        """
+        Releases the events whose timestamps do not exceed the given watermark, sorted by timestamp. As the watermark
+        promises that no earlier events will follow, events preceding it that arrive afterwards are dropped.
+        """
+        heap = self.__heap
+        released_events = []
+        while len(heap) > 0 and heap[0][0] <= watermark:
+            released_events.append(heapq.heappop(heap)[2])
+        if self.__last_released_timestamp is None or watermark > self.__last_released_timestamp:
+            self.__last_released_timestamp = watermark
+        return released_events
+
+    def flush(self):
+        """
+        Releases all the events held in the buffer, sorted by timestamp.
+        """
+        released_events = [heapq.heappop(self.__heap)[2] for _ in range(len(self.__heap))]
+        if len(released_events) > 0:
+            self.__last_released_timestamp = released_events[-1].timestamp
+        return released_events
+
+    def __len__(self):
+        return len(self.__heap)
+
+    def __push(self, event: Event):
+        """
+        Inserts the event into the heap unless it is too late to be reordered.
+        """
+        timestamp = event.timestamp
+        if self.__max_timestamp is None or timestamp >= self.__max_timestamp:
+            self.__max_timestamp = timestamp
+        else:
+            self.statistics.out_of_order_events += 1
+            lateness = self.__max_timestamp - timestamp
+            if self.statistics.max_observed_lateness is None or lateness > self.statistics.max_observed_lateness:
+                self.statistics.max_observed_lateness = lateness
+        if self.__last_released_timestamp is not None and timestamp < self.__last_released_timestamp:
+            self.statistics.dropped_late_events += 1
+            return
+        heapq.heappush(self.__heap, (timestamp, self.__sequence_number, event))
+        self.__sequence_number += 1
+
+    def __release(self):
+        """
+        Releases the events that can no longer be preceded by an event arriving within the lateness bound.
+        """
+        heap = self.__heap
+        if len(heap) == 0 or heap[0][0] > self.__max_timestamp - self.__max_lateness:
+            return []
+        release_threshold = self.__max_timestamp - self.__max_lateness
+        released_events = []
+        while len(heap) > 0 and heap[0][0] <= release_threshold:
+            released_events.append(heapq.heappop(heap)[2])
+        self.__last_released_timestamp = released_events[-1].timestamp
+        return released_events
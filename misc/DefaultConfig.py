@@ -20,6 +20,16 @@ from plan.multi.MultiPatternTreePlanMergeApproaches import MultiPatternTreePlanM
 
 # general settings
 DEFAULT_EVALUATION_MECHANISM_TYPE = EvaluationMechanismTypes.TREE_BASED
+EVENT_BATCH_SIZE = 1  # the number of events pulled from the input stream at once (1 disables micro-batching)
+USE_COMPACT_EVENTS = False  # if enabled, the events are stored using the memory-efficient CompactEvent class
+# if enabled, the tree engine represents timestamps and windows as integer microseconds since the epoch
+USE_INTEGER_TIMESTAMPS = False
+# the maximal number of events evaluated before yielding control to other tasks in the asynchronous evaluation mode
+ASYNC_MICRO_BATCH_SIZE = 128
+# the maximal delay of an out-of-order event (a timedelta); later events are dropped. None assumes ordered input
+MAX_EVENT_LATENESS = None
+# the event time between watermarks advancing the logical time through the whole tree (a timedelta, None to disable)
+WATERMARK_INTERVAL = None
 
 # plan generation-related defaults
 DEFAULT_TREE_PLAN_BUILDER = TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE
@@ -34,6 +44,25 @@ SECONDARY_SELECTION_STRATEGY = SelectionStrategies.MATCH_SINGLE
 SHOULD_SORT_STORAGE = False
 CLEANUP_INTERVAL = 10  # the default number of pattern match additions between subsequent storage cleanups
 PRIORITIZE_SORTING_BY_TIMESTAMP = True
+HASH_EQUALITY_CONDITIONS = True  # use hashed rather than sorted storage for matches looked up by equality conditions
+INDEX_RANGE_CONDITIONS = True  # use range-indexed rather than sorted storage for matches looked up by range conditions
+BUILD_COMPOSITE_STORAGE_INDICES = True  # index the matches by all equality conditions and a range condition
+AUTOMATIC_STORAGE_SELECTION = True  # select the storage of each node according to the conditions of its parent
+STORAGE_TIME_BUCKETS_PER_WINDOW = 0  # time buckets per window in unsorted internal node storage (0 - disabled)
+
+# input stream settings
+FILE_STREAM_READ_AHEAD_SIZE = 4096  # the maximal number of lines read ahead by a file stream (None to read everything)
+RING_BUFFER_STREAM_CAPACITY = 65536
+PARALLEL_CSV_STREAM_WORKERS = 4  # the number of processes parsing the files of a ParallelMultiFileCSVStream
+PARALLEL_CSV_STREAM_CHUNK_SIZE = 4096  # the number of rows read from a single file at once
+
+# output stream settings
+OUTPUT_STREAM_QUEUE_CAPACITY = 65536  # the maximal number of items waiting for a background writer thread
+OUTPUT_STREAM_WRITE_BATCH_SIZE = 1024  # the maximal number of items written to the output file at once
+OUTPUT_STREAM_FLUSH_INTERVAL = 1.0  # the time in seconds between flushes of the output file (None to disable)
+
+# local socket / named pipe stream settings
+LOCAL_STREAM_FRAME_SIZE = 4096  # the maximal number of items sent in a single frame
 
 # iterative improvement defaults
 ITERATIVE_IMPROVEMENT_TYPE = IterativeImprovementType.SWAP_BASED
@@ -47,6 +76,8 @@ DEFAULT_PARALLEL_UNITS_NUMBER = 1
 DEFAULT_PARALLEL_KEY = None
 DEFAULT_PARALLEL_ATTRIBUTES_DICT = None
 DEFAULT_PARALLEL_MULTIPLE = 12
+# the capacity of the ring buffer streams delivering the events to the execution units (None for unbounded queues)
+DATA_PARALLEL_UNIT_STREAM_CAPACITY = 65536
 
 # settings for pattern transformation rules
 PREPROCESSING_RULES_ORDER = None  # disabled for now
@@ -0,0 +1,86 @@
+"""
+This file contains utility functions for converting event timestamps between datetime objects and integer
+microseconds since the epoch. Integer timestamps are much cheaper to create and to compare than datetime objects.
+Naive datetime objects are assumed to represent UTC time.
+"""
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECONDS_IN_SECOND = 1000000
+MICROSECONDS_IN_MINUTE = 60 * MICROSECONDS_IN_SECOND
+MICROSECONDS_IN_HOUR = 60 * MICROSECONDS_IN_MINUTE
+MICROSECONDS_IN_DAY = 24 * MICROSECONDS_IN_HOUR
+
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_epoch_micros(timestamp: datetime):
+    """
+    Converts the given datetime object into the number of microseconds since the epoch.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None) - timestamp.utcoffset()
+    return (timestamp - EPOCH) // _ONE_MICROSECOND
+
+
+def epoch_micros_to_datetime(timestamp: int):
+    """
+    Converts the given number of microseconds since the epoch into a (naive) datetime object.
+    """
+    return EPOCH + timedelta(microseconds=timestamp)
+
+
+def timedelta_to_micros(interval: timedelta):
+    """
+    Converts the given time interval into an integer number of microseconds.
+    """
+    return interval // _ONE_MICROSECOND
+
+
+def datetimes_to_epoch_micros(timestamps: Iterable[datetime]) -> List[int]:
+    """
+    Converts a batch of datetime objects into integer microseconds since the epoch.
+    """
+    return [datetime_to_epoch_micros(timestamp) for timestamp in timestamps]
+
+
+def convert_distinct_values(values: List, convert: Callable) -> List:
+    """
+    Applies the given conversion function to a batch of raw timestamp values, converting each distinct value only
+    once. Consecutive events of a stream frequently share the same raw timestamp.
+    """
+    converted = {}
+    for value in values:
+        if value not in converted:
+            converted[value] = convert(value)
+    return [converted[value] for value in values]
+
+
+class DayEpochCache:
+    """
+    Caches the number of microseconds since the epoch at the beginning of each day. Since the events of a stream
+    typically span a small number of days, this makes the conversion of a timestamp to integer microseconds a
+    matter of a dictionary lookup and a few integer operations.
+    """
+    def __init__(self):
+        self.__day_to_micros: Dict[tuple, int] = {}
+
+    def get_day_micros(self, year: int, month: int, day: int):
+        """
+        Returns the number of microseconds between the epoch and the beginning of the given day.
+        """
+        key = (year, month, day)
+        micros = self.__day_to_micros.get(key)
+        if micros is None:
+            micros = (datetime(year, month, day) - EPOCH) // _ONE_MICROSECOND
+            self.__day_to_micros[key] = micros
+        return micros
+
+    def to_epoch_micros(self, year: int, month: int, day: int,
+                        hour: int = 0, minute: int = 0, second: int = 0, microsecond: int = 0):
+        """
+        Returns the number of microseconds between the epoch and the given point in time.
+        """
+        return (self.get_day_micros(year, month, day) + hour * MICROSECONDS_IN_HOUR +
+                minute * MICROSECONDS_IN_MINUTE + second * MICROSECONDS_IN_SECOND + microsecond)
@@ -34,3 +34,6 @@ class DataParallelEvaluationManager(ParallelEvaluationManager, ABC):
 
     def get_structure_summary(self):
         return self.__algorithm.get_structure_summary()
+
+    def get_storage_summary(self):
+        return self.__algorithm.get_storage_summary()
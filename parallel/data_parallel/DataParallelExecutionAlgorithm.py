@@ -1,8 +1,11 @@
 from abc import ABC
+
+from misc import DefaultConfig
 from base.Pattern import Pattern
 from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
 from base.DataFormatter import DataFormatter
 from base.PatternMatch import *
+from base.Event import CompactEvent
 from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatform, Lock
 from stream.Stream import *
 from parallel.manager.EvaluationManager import EvaluationManager
@@ -23,6 +26,8 @@ class DataParallelExecutionAlgorithm(ABC):
         self.evaluation_managers = [SequentialEvaluationManager(patterns, eval_mechanism_params)
                                     for _ in range(self.units_number)]
         self.match_lock = platform.create_lock()
+        compact_events = getattr(eval_mechanism_params, "compact_events", DefaultConfig.USE_COMPACT_EVENTS)
+        self.__event_class = CompactEvent if compact_events else Event
 
     def eval(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
         """
@@ -42,11 +47,13 @@ class DataParallelExecutionAlgorithm(ABC):
             execution_unit.start()
             execution_units.append(execution_unit)
 
-        # iterate over all events
+        # iterate over all events - each event is parsed once and the units receive the parsed events
         for raw_event in events:
-            event = Event(raw_event, data_formatter)
+            event = self.__event_class.from_raw_data(raw_event, data_formatter)
+            if event is None:
+                continue
             for unit_id in self._classifier(event):
-                execution_units[unit_id].add_event(raw_event)
+                execution_units[unit_id].add_event(event)
 
         # waits for all execution_units to terminate
         for execution_unit in execution_units:
@@ -70,12 +77,16 @@ class DataParallelExecutionAlgorithm(ABC):
     def get_structure_summary(self):
         return tuple(map(lambda em: em.get_structure_summary(), self.evaluation_managers))
 
+    def get_storage_summary(self):
+        return tuple(map(lambda em: em.get_storage_summary(), self.evaluation_managers))
+
     class ExecutionUnit:
         """
         A wrap for single unit that has input stream and an execution unit.
         """
         def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter):
-            self.events = Stream()
+            self.events = Stream() if DefaultConfig.DATA_PARALLEL_UNIT_STREAM_CAPACITY is None \
+                else RingBufferStream(DefaultConfig.DATA_PARALLEL_UNIT_STREAM_CAPACITY)
             self.execution_unit = platform.create_parallel_execution_unit(unit_id,
                                                                           self._run,
                                                                           evaluation_manager,
@@ -87,12 +98,12 @@ class DataParallelExecutionAlgorithm(ABC):
         def start(self):
             self.execution_unit.start()
 
-        def add_event(self, raw_event):
+        def add_event(self, event: Event):
             """
-            :param raw_event: from the input stream
+            :param event: a parsed event from the input stream
             :returns: adds a specific event to the execution unit's event stream.
             """
-            self.events.add_item(raw_event)
+            self.events.add_item(event)
 
         def wait(self):
             self.events.close()
@@ -38,7 +38,7 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         Sets the algorithm's start time as the time of the first event, this start time will be referenced by
         the calling methods as a base point.
         """
-        first_event = Event(events.first(), data_formatter)
+        first_event = Event.from_raw_data(events.first(), data_formatter)
         self._start_time = first_event.timestamp
         super(RIPParallelExecutionAlgorithm, self).eval(events, matches, data_formatter)
 
@@ -47,7 +47,7 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         Only allows a match to pass if it was returned by the first of the two overlapping execution units.
         """
         def skip_item(item: PatternMatch):
-            first_matching_unit = self.__get_unit_number(item.first_timestamp)
+            first_matching_unit = self.__get_unit_number(item.first_datetime)
             return first_matching_unit != unit_id
         return skip_item
 
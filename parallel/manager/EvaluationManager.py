@@ -3,9 +3,10 @@ This file contains the interface that must be implemented by an OpenCEP evaluati
 An evaluation manager is a component responsible for parallel and/or distributed execution of the CEP functionality.
 It internally activates and uses a CEP evaluation mechanism.
 """
+import threading
 from abc import ABC
 
-from stream.Stream import InputStream, OutputStream
+from stream.Stream import InputStream, OutputStream, Stream
 from base.DataFormatter import DataFormatter
 
 
@@ -20,6 +21,64 @@ class EvaluationManager(ABC):
         """
         raise NotImplementedError()
 
+    def iter_matches(self, event_stream: InputStream, data_formatter: DataFormatter):
+        """
+        Yields the pattern matches extracted from the given input stream as they are detected.
+        This default implementation runs eval in a background thread and yields the matches from an intermediate
+        stream. The evaluation runs to completion even if the consumer stops early. Evaluation managers capable of
+        evaluating lazily should override this method.
+        """
+        matches = Stream()
+        errors = []
+
+        def evaluate():
+            try:
+                self.eval(event_stream, matches, data_formatter)
+            except Exception as e:
+                errors.append(e)
+                matches.close()
+
+        evaluation_thread = threading.Thread(target=evaluate, daemon=True)
+        evaluation_thread.start()
+        yield from matches
+        evaluation_thread.join()
+        if len(errors) > 0:
+            raise errors[0]
+
+    async def eval_async(self, event_stream, pattern_matches, data_formatter: DataFormatter):
+        """
+        An asyncio version of eval. Evaluation managers supporting the asynchronous evaluation mode must override this
+        method.
+        """
+        raise Exception("Asynchronous evaluation is not supported by %s" % (type(self).__name__,))
+
+    def push_events(self, raw_events: list, data_formatter: DataFormatter):
+        """
+        Incrementally evaluates the given events and returns the detected matches. Evaluation managers supporting the
+        push-based evaluation mode must override this method.
+        """
+        raise Exception("Push-based evaluation is not supported by %s" % (type(self).__name__,))
+
+    def flush(self):
+        """
+        Returns the matches pending the end of the input stream. Evaluation managers supporting the push-based
+        evaluation mode must override this method.
+        """
+        raise Exception("Push-based evaluation is not supported by %s" % (type(self).__name__,))
+
+    def advance_watermark(self, watermark):
+        """
+        Advances the logical time of the evaluation to the given watermark and returns the detected matches.
+        Evaluation managers supporting the push-based evaluation mode must override this method.
+        """
+        raise Exception("Push-based evaluation is not supported by %s" % (type(self).__name__,))
+
+    def get_reorder_statistics(self):
+        """
+        Returns the metrics of the out-of-order event handling, or None if it is disabled or not supported.
+        """
+        return None
+
     def get_pattern_match_stream(self):
         """
         Returns the most recently used pattern match stream.
@@ -31,3 +90,9 @@ class EvaluationManager(ABC):
         Returns a string containing a short description of the underlying evaluation mechanism structure
         """
         raise NotImplementedError()
+
+    def get_storage_summary(self):
+        """
+        Returns a short description of the way the underlying evaluation mechanism stores the partial matches
+        """
+        raise NotImplementedError()
@@ -28,8 +28,30 @@ class SequentialEvaluationManager(EvaluationManager):
         self.__pattern_matches = pattern_matches
         self.__eval_mechanism.eval(event_stream, pattern_matches, data_formatter)
 
+    async def eval_async(self, event_stream, pattern_matches, data_formatter: DataFormatter):
+        self.__pattern_matches = pattern_matches
+        await self.__eval_mechanism.eval_async(event_stream, pattern_matches, data_formatter)
+
+    def iter_matches(self, event_stream: InputStream, data_formatter: DataFormatter):
+        return self.__eval_mechanism.iter_matches(event_stream, data_formatter)
+
+    def push_events(self, raw_events: list, data_formatter: DataFormatter):
+        return self.__eval_mechanism.push_events(raw_events, data_formatter)
+
+    def flush(self):
+        return self.__eval_mechanism.flush()
+
+    def advance_watermark(self, watermark):
+        return self.__eval_mechanism.advance_watermark(watermark)
+
+    def get_reorder_statistics(self):
+        return self.__eval_mechanism.get_reorder_statistics()
+
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
     def get_structure_summary(self):
         return self.__eval_mechanism.get_structure_summary()
+
+    def get_storage_summary(self):
+        return self.__eval_mechanism.get_storage_summary()
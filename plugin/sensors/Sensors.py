@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
+from typing import List
 import random
 
 from base.DataFormatter import DataFormatter, EventTypeClassifier
+from misc.TimestampUtils import DayEpochCache, convert_distinct_values
 from misc.Utils import str_to_number
 
 SENSORS_TIMESTAMP_KEY = "TimeStamp"
@@ -54,6 +56,9 @@ class SensorsDataFormatter(DataFormatter):
 
     def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier()):
         super().__init__(event_type_classifier)
+        self.__is_classified_by_sensor_type = isinstance(event_type_classifier, SensorsEventTypeClassifier)
+        self.__day_epoch_cache = DayEpochCache()
+        self.__parsed_dates = {}
 
     def parse_event(self, raw_data: str):
         """
@@ -65,12 +70,58 @@ class SensorsDataFormatter(DataFormatter):
             map(str_to_number, event_attributes)
         ))
 
+    def get_raw_event_type(self, raw_data: str):
+        """
+        If the events are classified by their sensor types, extracts the type from the first column of the string.
+        """
+        if not self.__is_classified_by_sensor_type:
+            return None
+        separator_index = raw_data.find(",")
+        return str_to_number(raw_data if separator_index < 0 else raw_data[:separator_index])
+
     def get_event_timestamp(self, event_payload: dict):
         """
         The event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format.
         """
-        timestamp_str = event_payload[SENSORS_TIMESTAMP_KEY]
-        return datetime.strptime(timestamp_str, "%m/%d/%Y %H:%M:%S")
+        return self.__to_datetime(event_payload[SENSORS_TIMESTAMP_KEY])
+
+    def get_event_timestamps(self, event_payloads: List[dict]):
+        """
+        Converts the timestamps of a batch of events, parsing each distinct timestamp string only once.
+        """
+        return convert_distinct_values([event_payload[SENSORS_TIMESTAMP_KEY] for event_payload in event_payloads],
+                                       self.__to_datetime)
+
+    def get_event_timestamp_micros(self, event_payload: dict):
+        """
+        Computes the integer timestamp directly from the "%m/%d/%Y %H:%M:%S" representation.
+        """
+        return self.__to_epoch_micros(event_payload[SENSORS_TIMESTAMP_KEY])
+
+    def get_event_timestamps_micros(self, event_payloads: List[dict]):
+        """
+        Computes the integer timestamps of a batch of events, parsing each distinct timestamp string only once.
+        """
+        return convert_distinct_values([event_payload[SENSORS_TIMESTAMP_KEY] for event_payload in event_payloads],
+                                       self.__to_epoch_micros)
+
+    def __to_datetime(self, timestamp_str: str):
+        return datetime(*self.__split_timestamp(timestamp_str))
+
+    def __to_epoch_micros(self, timestamp_str: str):
+        return self.__day_epoch_cache.to_epoch_micros(*self.__split_timestamp(timestamp_str))
+
+    def __split_timestamp(self, timestamp_str: str):
+        """
+        Splits a "%m/%d/%Y %H:%M:%S" timestamp into its components. The date components are only parsed once per day.
+        """
+        date_str, time_str = timestamp_str.split(" ")
+        date = self.__parsed_dates.get(date_str)
+        if date is None:
+            month, day, year = date_str.split("/")
+            date = self.__parsed_dates[date_str] = (int(year), int(month), int(day))
+        hour, minute, second = time_str.split(":")
+        return date[0], date[1], date[2], int(hour), int(minute), int(second)
 
 
 def random_str(lowest, highest):
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from base.DataFormatter import DataFormatter, EventTypeClassifier
+from misc.TimestampUtils import DayEpochCache, convert_distinct_values
 from misc.Utils import str_to_number
 
 METASTOCK_STOCK_TICKER_KEY = "Stock Ticker"
@@ -38,6 +39,8 @@ class MetastockDataFormatter(DataFormatter):
     """
     def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier()):
         super().__init__(event_type_classifier)
+        self.__is_classified_by_ticker = isinstance(event_type_classifier, MetastockByTickerEventTypeClassifier)
+        self.__day_epoch_cache = DayEpochCache()
 
     def parse_event(self, raw_data: str):
         """
@@ -49,13 +52,58 @@ class MetastockDataFormatter(DataFormatter):
             map(str_to_number, event_attributes)
         ))
 
+    def get_raw_event_type(self, raw_data: str):
+        """
+        If the events are classified by their stock tickers, extracts the ticker from the first column of the string.
+        """
+        if not self.__is_classified_by_ticker:
+            return None
+        separator_index = raw_data.find(",")
+        return str_to_number(raw_data if separator_index < 0 else raw_data[:separator_index])
+
     def get_event_timestamp(self, event_payload: dict):
         """
         The event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format.
         """
-        timestamp_str = str(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
-        return datetime(year=int(timestamp_str[0:4]), month=int(timestamp_str[4:6]), day=int(timestamp_str[6:8]),
-                        hour=int(timestamp_str[8:10]), minute=int(timestamp_str[10:12]))
+        return self.__to_datetime(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
+
+    def get_event_timestamps(self, event_payloads: List[dict]):
+        """
+        Stock events are reported at a granularity of minutes, hence a batch typically contains many identical
+        timestamps. Each distinct timestamp is only converted once.
+        """
+        return convert_distinct_values([event_payload[METASTOCK_EVENT_TIMESTAMP_KEY]
+                                        for event_payload in event_payloads], self.__to_datetime)
+
+    def get_event_timestamp_micros(self, event_payload: dict):
+        """
+        Computes the integer timestamp directly from the YYYYMMDDhhmm representation.
+        """
+        return self.__to_epoch_micros(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
+
+    def get_event_timestamps_micros(self, event_payloads: List[dict]):
+        """
+        Computes the integer timestamps of a batch of events, converting each distinct timestamp only once.
+        """
+        return convert_distinct_values([event_payload[METASTOCK_EVENT_TIMESTAMP_KEY]
+                                        for event_payload in event_payloads], self.__to_epoch_micros)
+
+    def __to_datetime(self, timestamp: int or str):
+        year, month, day, hour, minute = self.__split_timestamp(timestamp)
+        return datetime(year=year, month=month, day=day, hour=hour, minute=minute)
+
+    def __to_epoch_micros(self, timestamp: int or str):
+        return self.__day_epoch_cache.to_epoch_micros(*self.__split_timestamp(timestamp))
+
+    @staticmethod
+    def __split_timestamp(timestamp: int or str):
+        """
+        Splits a YYYYMMDDhhmm timestamp into its components using integer arithmetic.
+        """
+        if not isinstance(timestamp, int):
+            timestamp = int(timestamp)
+        date, time = divmod(timestamp, 10000)
+        return date // 10000, date // 100 % 100, date % 100, time // 100, time % 100
 
     def get_probability(self, event_payload: Dict[str, Any]) -> Optional[float]:
         return event_payload.get(PROBABILITY_KEY, None)
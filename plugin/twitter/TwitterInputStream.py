@@ -38,6 +38,10 @@ class TwitterInputStream(InputStream, tweepy.StreamListener):
         super().close()
         self.__tweet_stream.disconnect()
 
+    def _is_item_available(self):
+        # the tweets are added to the internal queue by the listener
+        return not self._stream.empty()
+
     def on_status(self, status):
         raw_data = json.dumps(status._json)
         self._stream.put(raw_data)
@@ -0,0 +1,215 @@
+"""
+This file contains the stream classes and helpers used by the asynchronous (asyncio-based) evaluation mode.
+"""
+import asyncio
+import inspect
+from collections import deque
+from typing import Iterable, List
+
+from stream.LocalStream import FRAME_HEADER_SIZE, decode_frame_header, decode_frame_body
+
+# marks the end of an asynchronous stream
+_END_OF_STREAM = object()
+
+
+class AsyncStream:
+    """
+    A stream for usage with asyncio. Producers add items using the add_item coroutine (which only suspends if the
+    capacity of the stream is exhausted) and consumers iterate over the stream using 'async for'.
+    An AsyncStream can serve both as an input stream and as a match sink of CEP.run_async.
+    """
+    def __init__(self, capacity: int = None):
+        self.__queue = asyncio.Queue(maxsize=0 if capacity is None else capacity)
+        self.__is_exhausted = False
+
+    async def add_item(self, item: object):
+        await self.__queue.put(item)
+
+    def add_item_nowait(self, item: object):
+        """
+        Adds an item without waiting. Raises asyncio.QueueFull if the capacity of the stream is exhausted.
+        """
+        self.__queue.put_nowait(item)
+
+    async def close(self):
+        await self.__queue.put(_END_OF_STREAM)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__is_exhausted:
+            raise StopAsyncIteration()
+        item = await self.__queue.get()
+        if item is _END_OF_STREAM:
+            self.__is_exhausted = True
+            raise StopAsyncIteration()
+        return item
+
+    async def get_many(self, max_items: int) -> List[object]:
+        """
+        Waits until at least one item is available and returns up to max_items items without waiting any further.
+        An empty list indicates that the stream is exhausted.
+        """
+        items = []
+        if self.__is_exhausted:
+            return items
+        item = await self.__queue.get()
+        while item is not _END_OF_STREAM:
+            items.append(item)
+            if len(items) >= max_items or self.__queue.empty():
+                return items
+            item = self.__queue.get_nowait()
+        self.__is_exhausted = True
+        return items
+
+
+class AsyncLocalInputStream:
+    """
+    An asynchronous counterpart of LocalInputStream. Receives framed items over a Unix domain socket or a named pipe
+    using an asyncio stream reader, such that waiting for the next frame only suspends the consuming task.
+    The stream is created by awaiting connect_unix_socket or open_named_pipe.
+    """
+    def __init__(self, reader: asyncio.StreamReader, connection):
+        # the connection (a stream writer or a transport) is referenced to keep it open until the stream is closed
+        self.__reader = reader
+        self.__connection = connection
+        self.__buffer = deque()
+        self.__is_exhausted = False
+
+    @classmethod
+    async def connect_unix_socket(cls, socket_path: str):
+        """
+        Connects to a producer listening at the given path.
+        """
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        return cls(reader, writer)
+
+    @classmethod
+    async def open_named_pipe(cls, pipe_path: str):
+        """
+        Opens the given named pipe. Opening a pipe blocks until a writer opens it as well, hence it is performed in
+        an executor thread.
+        """
+        loop = asyncio.get_running_loop()
+        pipe = await loop.run_in_executor(None, open, pipe_path, "rb", 0)
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        return cls(reader, transport)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if len(self.__buffer) == 0 and not await self.__read_frame():
+            raise StopAsyncIteration()
+        return self.__buffer.popleft()
+
+    async def get_many(self, max_items: int) -> List[object]:
+        """
+        Waits for a frame if no items are buffered and returns up to max_items items, without waiting for a frame
+        beyond the current one. An empty list indicates that the stream is exhausted.
+        """
+        if len(self.__buffer) == 0 and not await self.__read_frame():
+            return []
+        count = min(max_items, len(self.__buffer))
+        popleft = self.__buffer.popleft
+        return [popleft() for _ in range(count)]
+
+    async def __read_frame(self):
+        """
+        Waits for the next frame and adds its items to the buffer. Returns False if the stream has ended.
+        """
+        while not self.__is_exhausted:
+            try:
+                header = await self.__reader.readexactly(FRAME_HEADER_SIZE)
+            except asyncio.IncompleteReadError as e:
+                if len(e.partial) > 0:
+                    raise Exception("The stream ended in the middle of a frame")
+                self.__is_exhausted = True
+                break
+            body_length, item_count = decode_frame_header(header)
+            try:
+                body = await self.__reader.readexactly(body_length)
+            except asyncio.IncompleteReadError:
+                raise Exception("The stream ended in the middle of a frame")
+            if item_count > 0:
+                self.__buffer.extend(decode_frame_body(body, item_count))
+                return True
+        return False
+
+    def close(self):
+        self.__connection.close()
+
+
+async def _next_item(iterator):
+    """
+    Awaits the next item of the given asynchronous iterator, returning _END_OF_STREAM once it is exhausted.
+    """
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END_OF_STREAM
+
+
+async def iterate_in_micro_batches(events, micro_batch_size: int):
+    """
+    Yields the items of the given input stream in lists of up to micro_batch_size items, each containing the items
+    that are available without waiting:
+    - a stream whose get_many method is a coroutine (e.g., an AsyncStream) is read using this method;
+    - any other asynchronous iterator is drained as long as its next item is ready within a single pass of the event
+      loop;
+    - a synchronous input stream is read using its get_many method in an executor thread, as it might block.
+    """
+    get_many = getattr(events, "get_many", None)
+    if inspect.iscoroutinefunction(get_many):
+        while True:
+            items = await get_many(micro_batch_size)
+            if len(items) == 0:
+                return
+            yield items
+    elif hasattr(events, "__aiter__"):
+        iterator = events.__aiter__()
+        next_item = asyncio.ensure_future(_next_item(iterator))
+        try:
+            while True:
+                item = await next_item
+                if item is _END_OF_STREAM:
+                    return
+                items = [item]
+                next_item = asyncio.ensure_future(_next_item(iterator))
+                while len(items) < micro_batch_size:
+                    await asyncio.sleep(0)
+                    if not next_item.done() or next_item.result() is _END_OF_STREAM:
+                        break
+                    items.append(next_item.result())
+                    next_item = asyncio.ensure_future(_next_item(iterator))
+                yield items
+        finally:
+            next_item.cancel()
+    else:
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await loop.run_in_executor(None, events.get_many, micro_batch_size)
+            if len(items) == 0:
+                return
+            yield items
+
+
+async def add_items(sink, items: Iterable[object]):
+    """
+    Adds the given items to a synchronous or an asynchronous sink.
+    """
+    for item in items:
+        result = sink.add_item(item)
+        if inspect.isawaitable(result):
+            await result
+
+
+async def close_sink(sink):
+    """
+    Closes a synchronous or an asynchronous sink.
+    """
+    result = sink.close()
+    if inspect.isawaitable(result):
+        await result
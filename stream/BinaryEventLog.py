@@ -0,0 +1,363 @@
+"""
+A compact binary format for storing a parsed event stream on the disk.
+
+A stream is converted once using an arbitrary DataFormatter (see convert_to_binary_event_log). Afterwards, it can be
+replayed any number of times via BinaryEventLogInputStream together with BinaryEventLogDataFormatter. The log file is
+memory-mapped, the stream yields lightweight references into the mapped file, and the attributes of a record are only
+decoded when the record is parsed by the formatter. No string parsing or type conversion takes place during a replay.
+
+File structure:
+- a fixed header: a magic string followed by the offset of the footer;
+- the records, each consisting of a fixed-size part followed by the bytes of its variable-size attributes;
+- a JSON footer describing the layouts of the records.
+All records sharing the event type, the attribute names and the attribute kinds share a single layout.
+
+Only primitive attribute values (None, booleans, 64-bit integers, floats, strings and naive datetime objects) can be
+stored. As no arbitrary objects are serialized, replaying a log never executes code stored in the file.
+"""
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from base.DataFormatter import DataFormatter, EventTypeClassifier
+from base.Event import Event
+from stream.Stream import InputStream
+
+BINARY_EVENT_LOG_MAGIC = b"OCEPLOG1"
+
+# the header consists of the magic string followed by the offset of the footer
+_HEADER_STRUCT = struct.Struct("<8sQ")
+# each record starts with its total length and the index of its layout
+_RECORD_PREFIX_STRUCT = struct.Struct("<IH")
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# attribute kinds
+_BOOL_KIND = "b"
+_INT_KIND = "i"
+_FLOAT_KIND = "f"
+_STR_KIND = "s"
+_DATETIME_KIND = "t"
+_NONE_KIND = "n"
+
+# the struct format character used to store each attribute kind in the fixed-size part of a record
+_KIND_FORMATS = {
+    _BOOL_KIND: "?",
+    _INT_KIND: "q",
+    _FLOAT_KIND: "d",
+    _STR_KIND: "I",  # the length of the string, the encoded bytes are stored in the variable-size part
+    _DATETIME_KIND: "q",  # the number of microseconds since the epoch
+    _NONE_KIND: "",
+}
+_VARIABLE_SIZE_KINDS = {_STR_KIND}
+_MIN_INT, _MAX_INT = -2 ** 63, 2 ** 63 - 1
+
+
+def _get_value_kind(value: Any):
+    """
+    Returns the kind of the given attribute value. Raises an exception if the value cannot be stored in a log.
+    """
+    if value is None:
+        return _NONE_KIND
+    if isinstance(value, bool):
+        return _BOOL_KIND
+    if isinstance(value, int) and _MIN_INT <= value <= _MAX_INT:
+        return _INT_KIND
+    if isinstance(value, float):
+        return _FLOAT_KIND
+    if isinstance(value, str):
+        return _STR_KIND
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return _DATETIME_KIND
+    raise Exception("Binary event logs only store None, booleans, 64-bit integers, floats, strings and naive datetime "
+                    "objects, got %s" % (repr(value),))
+
+
+class _RecordLayout:
+    """
+    Describes the binary structure of all records sharing an event type, a set of attributes and attribute kinds.
+    The timestamp and the probability of the event are stored as two additional attributes preceding the payload.
+    """
+    def __init__(self, event_type: Any, keys: List[str], kinds: List[str]):
+        for kind in kinds:
+            if kind not in _KIND_FORMATS:
+                raise Exception("Unsupported attribute kind in a binary event log: %s" % (kind,))
+        self.event_type = event_type
+        self.keys = keys
+        self.kinds = kinds
+        self.struct = struct.Struct("<" + "".join(_KIND_FORMATS[kind] for kind in kinds))
+        self.__variable_size_indices = [i for i, kind in enumerate(kinds) if kind in _VARIABLE_SIZE_KINDS]
+        # the position of each attribute among the values unpacked from the fixed-size part (None kinds have none)
+        self.__value_positions = []
+        position = 0
+        for kind in kinds:
+            self.__value_positions.append(None if kind == _NONE_KIND else position)
+            if kind != _NONE_KIND:
+                position += 1
+
+    def to_json(self):
+        return {"type": self.event_type, "keys": self.keys, "kinds": self.kinds}
+
+    @staticmethod
+    def from_json(json_layout: dict):
+        return _RecordLayout(json_layout["type"], json_layout["keys"], json_layout["kinds"])
+
+    def encode(self, values: List[Any]):
+        """
+        Returns the fixed-size and the variable-size parts of a record containing the given values.
+        """
+        fixed_values = []
+        variable_parts = []
+        for value, kind in zip(values, self.kinds):
+            if kind == _NONE_KIND:
+                continue
+            if kind == _DATETIME_KIND:
+                value = (value - _EPOCH) // _ONE_MICROSECOND
+            elif kind in _VARIABLE_SIZE_KINDS:
+                encoded_value = value.encode()
+                variable_parts.append(encoded_value)
+                value = len(encoded_value)
+            fixed_values.append(value)
+        return self.struct.pack(*fixed_values), b"".join(variable_parts)
+
+    def decode(self, buffer, offset: int):
+        """
+        Decodes the values of the record located at the given offset of the buffer (not including the record prefix).
+        """
+        fixed_values = self.struct.unpack_from(buffer, offset)
+        values = [None if position is None else fixed_values[position] for position in self.__value_positions]
+        if len(self.__variable_size_indices) > 0:
+            variable_offset = offset + self.struct.size
+            for i in self.__variable_size_indices:
+                length = values[i]
+                raw_value = buffer[variable_offset:variable_offset + length]
+                values[i] = raw_value.decode()
+                variable_offset += length
+        for i, kind in enumerate(self.kinds):
+            if kind == _DATETIME_KIND:
+                values[i] = _EPOCH + timedelta(microseconds=values[i])
+        return values
+
+
+class BinaryEventLogWriter:
+    """
+    Writes parsed events into a binary event log file.
+    """
+    def __init__(self, file_path: str):
+        self.__file = open(file_path, "wb")
+        self.__file.write(_HEADER_STRUCT.pack(BINARY_EVENT_LOG_MAGIC, 0))
+        self.__layouts = []
+        self.__layout_indices = {}
+        self.__count = 0
+
+    def write(self, payload: Dict[str, Any], event_type: Any, timestamp: Any, probability: Optional[float] = None):
+        """
+        Appends a single event, given by its payload, type, timestamp and probability, to the log.
+        """
+        keys = [key for key in payload.keys() if key not in Event.HIDDEN_ATTRIBUTE_NAMES]
+        values = [timestamp, probability] + [payload[key] for key in keys]
+        kinds = [_get_value_kind(value) for value in values]
+        layout_key = (event_type, tuple(keys), tuple(kinds))
+        layout_index = self.__layout_indices.get(layout_key)
+        if layout_index is None:
+            layout_index = len(self.__layouts)
+            if layout_index > 0xFFFF:
+                raise Exception("Too many distinct record layouts in a binary event log")
+            self.__layouts.append(_RecordLayout(event_type, keys, kinds))
+            self.__layout_indices[layout_key] = layout_index
+        fixed_part, variable_part = self.__layouts[layout_index].encode(values)
+        record_length = _RECORD_PREFIX_STRUCT.size + len(fixed_part) + len(variable_part)
+        self.__file.write(_RECORD_PREFIX_STRUCT.pack(record_length, layout_index))
+        self.__file.write(fixed_part)
+        self.__file.write(variable_part)
+        self.__count += 1
+
+    def count(self):
+        """
+        Returns the number of events written so far.
+        """
+        return self.__count
+
+    def close(self):
+        """
+        Writes the footer and closes the log file.
+        """
+        if self.__file.closed:
+            return
+        footer_offset = self.__file.tell()
+        self.__file.write(json.dumps([layout.to_json() for layout in self.__layouts]).encode())
+        self.__file.seek(0)
+        self.__file.write(_HEADER_STRUCT.pack(BINARY_EVENT_LOG_MAGIC, footer_offset))
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def convert_to_binary_event_log(input_stream: InputStream, data_formatter: DataFormatter, file_path: str):
+    """
+    Parses the given stream using the given formatter and stores the resulting events in a binary event log.
+    Raw items that are not parsed into events (e.g., header lines) are skipped.
+    Returns the number of events written to the log.
+    """
+    with BinaryEventLogWriter(file_path) as writer:
+        for raw_data in input_stream:
+            payload = data_formatter.parse_event(raw_data)
+            if payload is None:
+                continue
+            writer.write(payload, data_formatter.get_event_type(payload),
+                         data_formatter.get_event_timestamp(payload), data_formatter.get_probability(payload))
+        return writer.count()
+
+
+class BinaryEventRecord:
+    """
+    A reference to a single record of a memory-mapped binary event log. This is the raw item produced by
+    BinaryEventLogInputStream. The contents of the record are only decoded by BinaryEventLogDataFormatter.
+    """
+    __slots__ = ("buffer", "offset", "layout")
+
+    def __init__(self, buffer, offset: int, layout: _RecordLayout):
+        self.buffer = buffer
+        self.offset = offset
+        self.layout = layout
+
+
+class BinaryEventPayload(dict):
+    """
+    An event payload decoded from a binary event log record. Along with the attributes of the event, it carries the
+    event type, timestamp and probability as stored in the log.
+    """
+    __slots__ = ("event_type", "event_timestamp", "event_probability")
+
+
+class BinaryEventLogInputStream(InputStream):
+    """
+    Replays the events stored in a binary event log file. The file is memory-mapped rather than read, and the stream
+    yields BinaryEventRecord objects referring to the mapped file. This stream must be used together with
+    BinaryEventLogDataFormatter.
+    Closing the stream (or leaving a 'with' block) unmaps the file, hence the records must be parsed beforehand.
+    """
+    def __init__(self, file_path: str, start_offset: Optional[int] = None):
+        super().__init__()
+        self.__file_path = file_path
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER_STRUCT.size:
+                raise Exception("%s is not a valid binary event log" % (file_path,))
+            self.__buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.__end_offset = _HEADER_STRUCT.unpack_from(self.__buffer, 0)
+        if magic != BINARY_EVENT_LOG_MAGIC or self.__end_offset == 0:
+            self.__buffer.close()
+            raise Exception("%s is not a valid binary event log" % (file_path,))
+        self.__layouts = [_RecordLayout.from_json(json_layout)
+                          for json_layout in json.loads(self.__buffer[self.__end_offset:].decode())]
+        self.__offset = _HEADER_STRUCT.size if start_offset is None else start_offset
+
+    def __next__(self):
+        if self.__offset >= self.__end_offset:
+            raise StopIteration()
+        record, record_length = self.__get_record(self.__offset)
+        self.__offset += record_length
+        return record
+
+    def __get_record(self, offset: int):
+        """
+        Returns the record located at the given offset of the log along with its total length.
+        """
+        record_length, layout_index = _RECORD_PREFIX_STRUCT.unpack_from(self.__buffer, offset)
+        return BinaryEventRecord(self.__buffer, offset + _RECORD_PREFIX_STRUCT.size,
+                                 self.__layouts[layout_index]), record_length
+
+    def close(self):
+        """
+        Stops the stream and unmaps the log file. The records retrieved from this stream become invalid.
+        """
+        self.__offset = self.__end_offset
+        self.__buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def duplicate(self):
+        """
+        Creates a new stream over the same log, starting from the first record not yet consumed from this stream.
+        """
+        return BinaryEventLogInputStream(self.__file_path, self.__offset)
+
+    def count(self):
+        """
+        Returns the number of records remaining in this stream.
+        """
+        count = 0
+        offset = self.__offset
+        while offset < self.__end_offset:
+            offset += _RECORD_PREFIX_STRUCT.unpack_from(self.__buffer, offset)[0]
+            count += 1
+        return count
+
+    def first(self):
+        if self.__offset >= self.__end_offset:
+            return None
+        return self.__get_record(self.__offset)[0]
+
+    def last(self):
+        last_offset = None
+        offset = self.__offset
+        while offset < self.__end_offset:
+            last_offset = offset
+            offset += _RECORD_PREFIX_STRUCT.unpack_from(self.__buffer, offset)[0]
+        return None if last_offset is None else self.__get_record(last_offset)[0]
+
+
+class BinaryEventLogEventTypeClassifier(EventTypeClassifier):
+    """
+    Assigns the event type stored in the binary event log to each event.
+    """
+    def get_event_type(self, event_payload: dict):
+        return event_payload.event_type
+
+
+class BinaryEventLogDataFormatter(DataFormatter):
+    """
+    A data formatter for the records of a binary event log produced by BinaryEventLogInputStream.
+    The event type, timestamp and probability are the ones computed by the original formatter upon the conversion.
+    """
+    def __init__(self, event_type_classifier: EventTypeClassifier = BinaryEventLogEventTypeClassifier()):
+        super().__init__(event_type_classifier)
+        self.__is_classified_by_stored_type = isinstance(event_type_classifier, BinaryEventLogEventTypeClassifier)
+
+    def parse_event(self, raw_data: BinaryEventRecord):
+        """
+        Decodes a binary event log record into an event payload.
+        """
+        layout = raw_data.layout
+        values = layout.decode(raw_data.buffer, raw_data.offset)
+        payload = BinaryEventPayload(zip(layout.keys, values[2:]))
+        payload.event_type = layout.event_type
+        payload.event_timestamp = values[0]
+        payload.event_probability = values[1]
+        return payload
+
+    def get_raw_event_type(self, raw_data: BinaryEventRecord):
+        """
+        The event type is stored in the layout of the record and is available without decoding it.
+        """
+        if not self.__is_classified_by_stored_type:
+            return None
+        return raw_data.layout.event_type
+
+    def get_event_timestamp(self, event_payload: dict):
+        return event_payload.event_timestamp
+
+    def get_probability(self, event_payload: dict):
+        return event_payload.event_probability
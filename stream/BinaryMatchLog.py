@@ -0,0 +1,202 @@
+"""
+A compact binary format for storing the pattern matches detected by the system.
+
+Instead of the textual representation of every event of every match, a match is stored as the list of the pattern IDs
+it satisfies followed by the indices of its events (see Event.INDEX_ATTRIBUTE_NAME). Optionally, every event referenced
+by at least one match is stored exactly once in an event dictionary, which is a binary event log (see BinaryEventLog).
+A consumer can then re-hydrate the matches using BinaryMatchLogReader.
+
+File structure:
+- a fixed header: a magic string followed by the offset of the footer;
+- the records, each consisting of the number of pattern IDs, the number of events, the pattern IDs and the event
+  indices;
+- the indices of the events in the event dictionary, in the order in which they were written to the dictionary;
+- a JSON footer.
+"""
+import json
+import struct
+from typing import Dict, List, Optional
+
+from base.Event import Event, AggregatedEvent
+from base.PatternMatch import PatternMatch
+from stream.BinaryEventLog import BinaryEventLogWriter, BinaryEventLogInputStream, BinaryEventLogDataFormatter
+from stream.Stream import OutputStream
+
+BINARY_MATCH_LOG_MAGIC = b"OCEPMAT1"
+
+# the header consists of the magic string followed by the offset of the footer
+_HEADER_STRUCT = struct.Struct("<8sQ")
+# each record starts with the number of pattern IDs and the number of events
+_RECORD_PREFIX_STRUCT = struct.Struct("<HI")
+_PATTERN_ID_FORMAT = "I"
+_EVENT_INDEX_FORMAT = "Q"
+
+# the size of the buffer accumulating the encoded matches before they are written to the file
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+class BinaryMatchRecord:
+    """
+    A single match read from a binary match log.
+    """
+    __slots__ = ("pattern_ids", "event_indices")
+
+    def __init__(self, pattern_ids: List[int], event_indices: List[int]):
+        self.pattern_ids = pattern_ids
+        self.event_indices = event_indices
+
+
+class BinaryMatchOutputStream(OutputStream):
+    """
+    Writes pattern matches into a binary match log file. If event_dictionary_path is provided, the events referenced
+    by the matches are also written to a binary event log at the given path, each event exactly once.
+    """
+    def __init__(self, file_path: str, event_dictionary_path: str = None):
+        super().__init__()
+        self.__file = open(file_path, "wb")
+        self.__file.write(_HEADER_STRUCT.pack(BINARY_MATCH_LOG_MAGIC, 0))
+        self.__buffer = bytearray()
+        self.__record_structs = {}
+        self.__count = 0
+        self.__event_dictionary_path = event_dictionary_path
+        self.__event_dictionary = None
+        self.__event_dictionary_indices = []
+        self.__written_event_indices = set()
+        if event_dictionary_path is not None:
+            self.__event_dictionary = BinaryEventLogWriter(event_dictionary_path)
+
+    def add_item(self, item: PatternMatch):
+        """
+        Encodes the given match into the write buffer.
+        """
+        events = self.__get_primitive_events(item.events)
+        event_indices = [event.payload[Event.INDEX_ATTRIBUTE_NAME] for event in events]
+        pattern_ids = item.pattern_ids
+        record_key = (len(pattern_ids), len(event_indices))
+        record_struct = self.__record_structs.get(record_key)
+        if record_struct is None:
+            record_struct = struct.Struct("<HI%d%s%d%s" % (len(pattern_ids), _PATTERN_ID_FORMAT,
+                                                          len(event_indices), _EVENT_INDEX_FORMAT))
+            self.__record_structs[record_key] = record_struct
+        self.__buffer += record_struct.pack(len(pattern_ids), len(event_indices), *pattern_ids, *event_indices)
+        self.__count += 1
+        if self.__event_dictionary is not None:
+            self.__write_to_event_dictionary(events, event_indices)
+        if len(self.__buffer) >= _WRITE_BUFFER_SIZE:
+            self.__flush_buffer()
+
+    def count(self):
+        """
+        Returns the number of matches written so far.
+        """
+        return self.__count
+
+    def close(self):
+        """
+        Writes the event dictionary indices and the footer and closes the file.
+        """
+        if self.__file.closed:
+            return
+        self.__flush_buffer()
+        dictionary_offset = self.__file.tell()
+        self.__file.write(struct.pack("<%d%s" % (len(self.__event_dictionary_indices), _EVENT_INDEX_FORMAT),
+                                      *self.__event_dictionary_indices))
+        footer_offset = self.__file.tell()
+        footer = {
+            "count": self.__count,
+            "event_dictionary_path": self.__event_dictionary_path,
+            "event_dictionary_offset": dictionary_offset,
+            "event_dictionary_size": len(self.__event_dictionary_indices),
+        }
+        self.__file.write(json.dumps(footer).encode())
+        self.__file.seek(0)
+        self.__file.write(_HEADER_STRUCT.pack(BINARY_MATCH_LOG_MAGIC, footer_offset))
+        self.__file.close()
+        if self.__event_dictionary is not None:
+            self.__event_dictionary.close()
+
+    def __write_to_event_dictionary(self, events: List[Event], event_indices: List[int]):
+        """
+        Writes the events that were not yet referenced by a previous match to the event dictionary.
+        """
+        for event, event_index in zip(events, event_indices):
+            if event_index in self.__written_event_indices:
+                continue
+            self.__written_event_indices.add(event_index)
+            self.__event_dictionary_indices.append(event_index)
+            self.__event_dictionary.write(event.payload, event.type, event.timestamp, event.probability)
+
+    def __flush_buffer(self):
+        self.__file.write(self.__buffer)
+        self.__buffer = bytearray()
+
+    @staticmethod
+    def __get_primitive_events(events: List[Event]):
+        """
+        Replaces the aggregated events produced by Kleene closure operators with their primitive events.
+        """
+        if not any(isinstance(event, AggregatedEvent) for event in events):
+            return events
+        primitive_events = []
+        for event in events:
+            if isinstance(event, AggregatedEvent):
+                primitive_events.extend(BinaryMatchOutputStream.__get_primitive_events(event.primitive_events))
+            else:
+                primitive_events.append(event)
+        return primitive_events
+
+
+class BinaryMatchLogReader:
+    """
+    Reads the matches stored in a binary match log.
+    """
+    def __init__(self, file_path: str):
+        with open(file_path, "rb") as log_file:
+            self.__data = log_file.read()
+        magic, footer_offset = _HEADER_STRUCT.unpack_from(self.__data, 0)
+        if magic != BINARY_MATCH_LOG_MAGIC:
+            raise Exception("%s is not a binary match log" % (file_path,))
+        footer = json.loads(self.__data[footer_offset:].decode())
+        self.__count = footer["count"]
+        self.__event_dictionary_path = footer["event_dictionary_path"]
+        self.__event_dictionary_offset = footer["event_dictionary_offset"]
+        self.__event_dictionary_size = footer["event_dictionary_size"]
+
+    def __iter__(self):
+        """
+        Iterates over the matches in the order in which they were written.
+        """
+        offset = _HEADER_STRUCT.size
+        for _ in range(self.__count):
+            pattern_id_count, event_count = _RECORD_PREFIX_STRUCT.unpack_from(self.__data, offset)
+            offset += _RECORD_PREFIX_STRUCT.size
+            pattern_ids = list(struct.unpack_from("<%d%s" % (pattern_id_count, _PATTERN_ID_FORMAT), self.__data, offset))
+            offset += pattern_id_count * struct.calcsize(_PATTERN_ID_FORMAT)
+            event_indices = list(struct.unpack_from("<%d%s" % (event_count, _EVENT_INDEX_FORMAT), self.__data, offset))
+            offset += event_count * struct.calcsize(_EVENT_INDEX_FORMAT)
+            yield BinaryMatchRecord(pattern_ids, event_indices)
+
+    def count(self):
+        """
+        Returns the number of matches in the log.
+        """
+        return self.__count
+
+    def load_event_dictionary(self, event_dictionary_path: Optional[str] = None) -> Dict[int, dict]:
+        """
+        Returns a dictionary mapping the index of every event referenced by the matches to its payload.
+        The path of the event dictionary can be overridden, e.g., if the dictionary file was moved.
+        """
+        if event_dictionary_path is None:
+            event_dictionary_path = self.__event_dictionary_path
+        if event_dictionary_path is None:
+            raise Exception("No event dictionary was written for this match log")
+        event_indices = struct.unpack_from("<%d%s" % (self.__event_dictionary_size, _EVENT_INDEX_FORMAT),
+                                           self.__data, self.__event_dictionary_offset)
+        data_formatter = BinaryEventLogDataFormatter()
+        event_log = BinaryEventLogInputStream(event_dictionary_path)
+        try:
+            return {event_index: data_formatter.parse_event(record)
+                    for event_index, record in zip(event_indices, event_log)}
+        finally:
+            event_log.close()
@@ -1,5 +1,8 @@
 from datetime import datetime
+from typing import List
+from misc.TimestampUtils import DayEpochCache, convert_distinct_values, datetime_to_epoch_micros
 from base.DataFormatter import DataFormatter, EventTypeClassifier
+import csv
 import hashlib
 
 class CitiBikeEventTypeClassifier(EventTypeClassifier):
@@ -28,6 +31,7 @@ class CitiBikeDataFormatter(DataFormatter):
             event_type_classifier = CitiBikeEventTypeClassifier()
         super().__init__(event_type_classifier)
         self._headers = None
+        self.__day_epoch_cache = DayEpochCache()
     
     def set_headers(self, headers):
         """
@@ -35,12 +39,17 @@ class CitiBikeDataFormatter(DataFormatter):
         """
         self._headers = headers
     
-    def parse_event(self, raw_data: str):
+    def parse_event(self, raw_data: str or list):
         """
         Parses a CSV line into an event payload dictionary.
+        The line can also be provided as a list of values already split by a CSV reader.
         """
-        raw_data = raw_data.strip()
-        values = raw_data.split(',')
+        if isinstance(raw_data, list):
+            values = raw_data
+        else:
+            raw_data = raw_data.strip()
+            # only fall back to the (slower) CSV reader if the line contains quoted values
+            values = next(csv.reader([raw_data])) if '"' in raw_data else raw_data.split(',')
         
         if not self._headers:
             if self.is_header_row(values):
@@ -83,20 +92,62 @@ class CitiBikeDataFormatter(DataFormatter):
     def get_event_timestamp(self, event_payload: dict):
         """
         Extracts timestamp from the starttime field.
-        Format: YYYY-MM-DD HH:MM:SS
+        Format: YYYY-MM-DD HH:MM:SS, optionally followed by fractional seconds.
         """
+        return self.__to_datetime(self.__get_starttime(event_payload))
+
+    def get_event_timestamps(self, event_payloads: List[dict]):
+        """
+        Extracts the timestamps of a batch of events, parsing each distinct starttime value only once.
+        """
+        return convert_distinct_values([self.__get_starttime(event_payload) for event_payload in event_payloads],
+                                       self.__to_datetime)
+
+    def get_event_timestamp_micros(self, event_payload: dict):
+        """
+        Computes the integer timestamp directly from the starttime field.
+        """
+        return self.__to_epoch_micros(self.__get_starttime(event_payload))
+
+    def get_event_timestamps_micros(self, event_payloads: List[dict]):
+        """
+        Computes the integer timestamps of a batch of events, parsing each distinct starttime value only once.
+        """
+        return convert_distinct_values([self.__get_starttime(event_payload) for event_payload in event_payloads],
+                                       self.__to_epoch_micros)
+
+    @staticmethod
+    def __get_starttime(event_payload: dict):
         timestamp_str = event_payload.get("starttime")
         if not timestamp_str:
             raise Exception("No starttime timestamp found in event")
-        
+        return timestamp_str
+
+    @staticmethod
+    def __to_datetime(timestamp_str: str):
+        """
+        Parses both the 2013 format and the format with milliseconds in a single pass. The trip timestamps are local
+        times, hence timestamps specifying a time zone are rejected rather than mixed with naive ones.
+        """
         try:
-            # Try without milliseconds first (2013 format)
-            dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-            return dt
+            timestamp = datetime.fromisoformat(timestamp_str)
         except ValueError:
-            try:
-                # Try with milliseconds as fallback
-                dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S.%f")
-                return dt
-            except ValueError:
-                raise Exception(f"Invalid timestamp format: {timestamp_str}")
\ No newline at end of file
+            raise Exception(f"Invalid timestamp format: {timestamp_str}")
+        if timestamp.tzinfo is not None:
+            raise Exception(f"Timezone-aware timestamps are not supported: {timestamp_str}")
+        return timestamp
+
+    def __to_epoch_micros(self, timestamp_str: str):
+        """
+        Converts a YYYY-MM-DD HH:MM:SS[.ffffff] string using integer arithmetic. Any other representation is delegated
+        to the datetime-based parsing.
+        """
+        fraction = timestamp_str[20:]
+        if len(timestamp_str) < 19 or timestamp_str[4] != "-" or timestamp_str[10] != " " or \
+                (len(timestamp_str) > 19 and (timestamp_str[19] != "." or not fraction.isdigit())):
+            return datetime_to_epoch_micros(self.__to_datetime(timestamp_str))
+        microsecond = int(fraction.ljust(6, "0")[:6]) if fraction else 0
+        return self.__day_epoch_cache.to_epoch_micros(int(timestamp_str[0:4]), int(timestamp_str[5:7]),
+                                                      int(timestamp_str[8:10]), int(timestamp_str[11:13]),
+                                                      int(timestamp_str[14:16]), int(timestamp_str[17:19]),
+                                                      microsecond)
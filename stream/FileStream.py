@@ -1,23 +1,124 @@
 import os
+import threading
+import time
+from collections import deque
+from queue import Queue, Empty, Full
 
+from misc import DefaultConfig
 from stream.Stream import InputStream, OutputStream
 
 
 # FileInputStream:
 # - Inherits from InputStream
-# - Reads the entire file in the constructor and stores each line in an internal queue (_stream)
-# - Calls close() immediately after reading is complete
+# - Reads the file lazily: lines are only read from the disk when the stream is consumed
+# - At most read_ahead_size lines are held in memory at any given moment (None loads the entire file at once)
 class FileInputStream(InputStream):
     """
     Reads the objects from a predefined input file.
+    The lines are read on demand into a bounded read-ahead buffer, so that the memory consumption and the time until
+    the first item is available do not depend on the file size.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, read_ahead_size: int = DefaultConfig.FILE_STREAM_READ_AHEAD_SIZE,
+                 start_offset: int = 0, lines_to_skip: int = 0):
         super().__init__()
-        # TODO: reading the entire content of the input file here is very inefficient
-        with open(file_path, "r") as f:
-            for line in f.readlines():
-                self._stream.put(line)
-        self.close()
+        if read_ahead_size is not None and read_ahead_size <= 0:
+            raise Exception("read_ahead_size should be positive.")
+        self.__file_path = file_path
+        self.__read_ahead_size = read_ahead_size
+        self.__buffer = deque()
+        self.__file = open(file_path, "r")
+        if start_offset > 0:
+            self.__file.seek(start_offset)
+        self.__is_exhausted = False
+        # the position of the first line of the current read-ahead chunk and the number of lines consumed from it.
+        # This information is sufficient for resuming the stream from the current position in duplicate()
+        self.__chunk_offset = start_offset
+        self.__consumed_in_chunk = 0
+        for _ in range(lines_to_skip):
+            if not self.__file.readline():
+                break
+        if lines_to_skip > 0:
+            self.__chunk_offset = self.__file.tell()
+
+    def __next__(self):
+        if len(self.__buffer) == 0 and not self.__read_chunk():
+            raise StopIteration()
+        self.__consumed_in_chunk += 1
+        return self.__buffer.popleft()
+
+    def get_many(self, max_items: int):
+        """
+        Removes and returns up to max_items lines, without reading beyond the current read-ahead chunk.
+        """
+        if len(self.__buffer) == 0 and not self.__read_chunk():
+            return []
+        count = min(max_items, len(self.__buffer))
+        popleft = self.__buffer.popleft
+        items = [popleft() for _ in range(count)]
+        self.__consumed_in_chunk += count
+        return items
+
+    def __read_chunk(self):
+        """
+        Refills the read-ahead buffer with the next lines of the file.
+        Returns False if the end of the file was reached and no lines could be read.
+        """
+        if self.__is_exhausted:
+            return False
+        self.__chunk_offset = self.__file.tell()
+        self.__consumed_in_chunk = 0
+        if self.__read_ahead_size is None:
+            self.__buffer.extend(self.__file.readlines())
+            self.__is_exhausted = True
+        else:
+            readline = self.__file.readline
+            for _ in range(self.__read_ahead_size):
+                line = readline()
+                if not line:
+                    self.__is_exhausted = True
+                    break
+                self.__buffer.append(line)
+        if self.__is_exhausted:
+            self.__file.close()
+        return len(self.__buffer) > 0
+
+    def close(self):
+        """
+        Stops reading the file. The items that were already read ahead can still be consumed.
+        """
+        if not self.__is_exhausted:
+            self.__is_exhausted = True
+            self.__file.close()
+
+    def duplicate(self):
+        """
+        Creates a new stream over the same file, starting from the first item not yet consumed from this stream.
+        """
+        return FileInputStream(self.__file_path, self.__read_ahead_size,
+                               self.__chunk_offset, self.__consumed_in_chunk)
+
+    def count(self):
+        """
+        Returns the number of items remaining in this stream. Scans the remainder of the file without loading it.
+        """
+        count = 0
+        for _ in self.duplicate():
+            count += 1
+        return count
+
+    def first(self):
+        if len(self.__buffer) == 0 and not self.__read_chunk():
+            return None
+        return self.__buffer[0]
+
+    def last(self):
+        """
+        Returns the last item of this stream. Scans the remainder of the file without loading it.
+        """
+        last = None
+        for item in self.duplicate():
+            last = item
+        return last
 
 
 #   FileOutputStream:Inherits from OutputStream
@@ -59,3 +160,109 @@ class FileOutputStream(OutputStream):
             for item in self:
                 self.__output_file.write(str(item))
         self.__output_file.close()
+
+
+# marks the end of the items passed to the writer thread of a BackgroundFileOutputStream
+_END_OF_OUTPUT = object()
+
+
+class BackgroundFileOutputStream(OutputStream):
+    """
+    Writes the objects into a predefined output file using a background writer thread.
+    The items are passed to the writer through a bounded queue, so that at most queue_capacity items are held in
+    memory regardless of the number of items written. The writer converts the items to strings and writes them in
+    batches of up to write_batch_size items. The file is flushed every flush_interval seconds (None to only flush the
+    file upon closing the stream).
+    Once the queue is full, add_item blocks until the writer catches up.
+    """
+    def __init__(self, base_path: str, file_name: str,
+                 queue_capacity: int = DefaultConfig.OUTPUT_STREAM_QUEUE_CAPACITY,
+                 write_batch_size: int = DefaultConfig.OUTPUT_STREAM_WRITE_BATCH_SIZE,
+                 flush_interval: float = DefaultConfig.OUTPUT_STREAM_FLUSH_INTERVAL):
+        super().__init__()
+        if queue_capacity <= 0 or write_batch_size <= 0:
+            raise Exception("queue_capacity and write_batch_size should be positive.")
+        if not os.path.exists(base_path):
+            os.makedirs(base_path, exist_ok=True)
+        self.__output_file = open(os.path.join(base_path, file_name), 'w')
+        self.__items = Queue(maxsize=queue_capacity)
+        self.__write_batch_size = write_batch_size
+        self.__flush_interval = flush_interval
+        self.__error = None
+        self.__is_closed = False
+        self.__writer = threading.Thread(target=self.__write_items, daemon=True)
+        self.__writer.start()
+
+    def add_item(self, item: object):
+        """
+        Passes the item to the writer thread, blocking while the queue is full.
+        """
+        try:
+            self.__items.put_nowait(item)
+            return
+        except Full:
+            pass
+        while True:
+            self.__check_writer()
+            try:
+                self.__items.put(item, timeout=self.__get_wait_timeout())
+                return
+            except Full:
+                continue
+
+    def close(self):
+        """
+        Waits for the writer thread to write all the pending items and closes the output file.
+        """
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        try:
+            self.add_item(_END_OF_OUTPUT)
+            self.__writer.join()
+        finally:
+            self.__output_file.close()
+        self.__check_writer()
+
+    def __write_items(self):
+        """
+        The main loop of the writer thread.
+        """
+        try:
+            last_flush_time = time.monotonic()
+            is_finished = False
+            while not is_finished:
+                try:
+                    item = self.__items.get(timeout=self.__flush_interval)
+                except Empty:
+                    self.__output_file.flush()
+                    last_flush_time = time.monotonic()
+                    continue
+                batch = []
+                while True:
+                    if item is _END_OF_OUTPUT:
+                        is_finished = True
+                        break
+                    batch.append(str(item))
+                    if len(batch) >= self.__write_batch_size:
+                        break
+                    try:
+                        item = self.__items.get_nowait()
+                    except Empty:
+                        break
+                self.__output_file.write("".join(batch))
+                if self.__flush_interval is not None and time.monotonic() - last_flush_time >= self.__flush_interval:
+                    self.__output_file.flush()
+                    last_flush_time = time.monotonic()
+        except Exception as e:
+            self.__error = e
+
+    def __check_writer(self):
+        """
+        Raises an exception if the writer thread has failed.
+        """
+        if self.__error is not None:
+            raise Exception("Failed to write to the output file: %s" % (self.__error,))
+
+    def __get_wait_timeout(self):
+        return self.__flush_interval if self.__flush_interval is not None else 1.0
@@ -0,0 +1,341 @@
+"""
+Streams transferring items between processes on the same machine over Unix domain sockets and named pipes.
+
+The items are sent in batched frames, such that the cost of a system call is shared by all the items of a frame.
+Each frame consists of:
+- a fixed header: the total length of the encoded items and the number of items;
+- the lengths of the encoded items;
+- the UTF-8 encoded items, back to back.
+An input stream yields the received items as strings (e.g., the lines of an event file to be parsed by a
+DataFormatter), while an output stream sends the string representation of its items (e.g., of pattern matches).
+
+LocalStreamProducer is a small stand-in for an external producer, allowing to test the streams locally.
+"""
+import os
+import socket
+import stat
+import struct
+import threading
+from collections import deque
+from typing import Iterable, List, Optional
+
+from misc import DefaultConfig
+from stream.Stream import InputStream, OutputStream
+
+_FRAME_HEADER_STRUCT = struct.Struct("<II")
+_ITEM_LENGTH_FORMAT = "I"
+FRAME_HEADER_SIZE = _FRAME_HEADER_STRUCT.size
+
+
+def encode_frame(items: List[str]):
+    """
+    Encodes the given items into a single frame.
+    """
+    encoded_items = [item.encode() for item in items]
+    data = b"".join(encoded_items)
+    lengths = struct.pack("<%d%s" % (len(encoded_items), _ITEM_LENGTH_FORMAT), *map(len, encoded_items))
+    return _FRAME_HEADER_STRUCT.pack(len(data), len(encoded_items)) + lengths + data
+
+
+def _read_exactly(binary_file, size: int):
+    """
+    Reads exactly size bytes from the given file. Returns None if the end of the file was reached before the first
+    byte and raises an exception if it was reached in the middle.
+    """
+    data = binary_file.read(size)
+    if len(data) == size:
+        return data
+    if len(data) == 0:
+        return None
+    chunks = [data]
+    remaining = size - len(data)
+    while remaining > 0:
+        chunk = binary_file.read(remaining)
+        if not chunk:
+            raise Exception("The stream ended in the middle of a frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def decode_frame_header(header: bytes):
+    """
+    Decodes a frame header of FRAME_HEADER_SIZE bytes into the length of the rest of the frame and the number of
+    items in it.
+    """
+    data_length, item_count = _FRAME_HEADER_STRUCT.unpack(header)
+    return item_count * struct.calcsize(_ITEM_LENGTH_FORMAT) + data_length, item_count
+
+
+def decode_frame_body(body: bytes, item_count: int):
+    """
+    Decodes the items from the rest of a frame following its header.
+    """
+    lengths = struct.unpack_from("<%d%s" % (item_count, _ITEM_LENGTH_FORMAT), body)
+    items = []
+    offset = item_count * struct.calcsize(_ITEM_LENGTH_FORMAT)
+    for length in lengths:
+        end = offset + length
+        items.append(body[offset:end].decode())
+        offset = end
+    return items
+
+
+def read_frame(binary_file):
+    """
+    Reads and decodes the next frame from the given file. Returns None if there are no more frames.
+    """
+    header = _read_exactly(binary_file, FRAME_HEADER_SIZE)
+    if header is None:
+        return None
+    body_length, item_count = decode_frame_header(header)
+    body = _read_exactly(binary_file, body_length)
+    if body is None:
+        raise Exception("The stream ended in the middle of a frame")
+    return decode_frame_body(body, item_count)
+
+
+def _get_unix_socket_family():
+    if not hasattr(socket, "AF_UNIX"):
+        raise Exception("Unix domain sockets are not supported on this platform")
+    return socket.AF_UNIX
+
+
+class LocalInputStream(InputStream):
+    """
+    Reads framed items from a binary file object, such as a connected socket or an open named pipe.
+    Frames are only read when the items are consumed.
+    """
+    def __init__(self, binary_file):
+        super().__init__()
+        self._file = binary_file
+        self.__buffer = deque()
+        self.__is_exhausted = False
+
+    def __next__(self):
+        if len(self.__buffer) == 0 and not self.__read_frame():
+            raise StopIteration()
+        return self.__buffer.popleft()
+
+    def get_many(self, max_items: int):
+        """
+        Removes and returns up to max_items items, without waiting for a frame beyond the current one.
+        """
+        if len(self.__buffer) == 0 and not self.__read_frame():
+            return []
+        count = min(max_items, len(self.__buffer))
+        popleft = self.__buffer.popleft
+        return [popleft() for _ in range(count)]
+
+    def __read_frame(self):
+        """
+        Waits for the next frame and adds its items to the buffer. Returns False if the stream has ended.
+        """
+        while not self.__is_exhausted:
+            items = read_frame(self._file)
+            if items is None:
+                self.__is_exhausted = True
+                break
+            if len(items) > 0:
+                self.__buffer.extend(items)
+                return True
+        return False
+
+    def close(self):
+        self._file.close()
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def count(self):
+        """
+        Returns the number of items that were received and not yet consumed.
+        """
+        return len(self.__buffer)
+
+    def first(self):
+        return self.__buffer[0] if len(self.__buffer) > 0 else None
+
+    def last(self):
+        return self.__buffer[-1] if len(self.__buffer) > 0 else None
+
+
+class LocalOutputStream(OutputStream):
+    """
+    Sends the string representations of the items as frames of up to frame_size items over a binary file object,
+    such as a connected socket or an open named pipe.
+    """
+    def __init__(self, binary_file, frame_size: int = DefaultConfig.LOCAL_STREAM_FRAME_SIZE):
+        super().__init__()
+        if frame_size <= 0:
+            raise Exception("frame_size should be positive.")
+        self._file = binary_file
+        self.__frame_size = frame_size
+        self.__pending_items = []
+
+    def add_item(self, item: object):
+        self.__pending_items.append(str(item))
+        if len(self.__pending_items) >= self.__frame_size:
+            self.__write_frame()
+
+    def put_many(self, items: Iterable[object]):
+        for item in items:
+            self.add_item(item)
+
+    def flush(self):
+        """
+        Sends the pending items without waiting for the frame to fill up.
+        """
+        if len(self.__pending_items) > 0:
+            self.__write_frame()
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __write_frame(self):
+        self._file.write(encode_frame(self.__pending_items))
+        self.__pending_items = []
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def count(self):
+        """
+        Returns the number of items waiting to be sent.
+        """
+        return len(self.__pending_items)
+
+
+class UnixSocketInputStream(LocalInputStream):
+    """
+    Receives framed items over a Unix domain socket. Either connects to a producer listening at socket_path or uses an
+    already connected socket.
+    """
+    def __init__(self, socket_path: str = None, connection: socket.socket = None):
+        if connection is None:
+            if socket_path is None:
+                raise Exception("Either a socket path or a connected socket must be provided")
+            connection = socket.socket(_get_unix_socket_family(), socket.SOCK_STREAM)
+            connection.connect(socket_path)
+        self.__connection = connection
+        super().__init__(connection.makefile("rb"))
+
+    def close(self):
+        super().close()
+        self.__connection.close()
+
+
+class UnixSocketOutputStream(LocalOutputStream):
+    """
+    Sends framed items over a Unix domain socket. Either connects to a consumer listening at socket_path or uses an
+    already connected socket.
+    """
+    def __init__(self, socket_path: str = None, connection: socket.socket = None,
+                 frame_size: int = DefaultConfig.LOCAL_STREAM_FRAME_SIZE):
+        if connection is None:
+            if socket_path is None:
+                raise Exception("Either a socket path or a connected socket must be provided")
+            connection = socket.socket(_get_unix_socket_family(), socket.SOCK_STREAM)
+            connection.connect(socket_path)
+        self.__connection = connection
+        super().__init__(connection.makefile("wb"), frame_size)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.__connection.close()
+
+
+class NamedPipeInputStream(LocalInputStream):
+    """
+    Receives framed items over a named pipe. Opening the pipe blocks until a writer opens it as well.
+    """
+    def __init__(self, pipe_path: str):
+        super().__init__(open(pipe_path, "rb"))
+
+
+class NamedPipeOutputStream(LocalOutputStream):
+    """
+    Sends framed items over a named pipe. Opening the pipe blocks until a reader opens it as well.
+    """
+    def __init__(self, pipe_path: str, frame_size: int = DefaultConfig.LOCAL_STREAM_FRAME_SIZE):
+        super().__init__(open(pipe_path, "wb"), frame_size)
+
+
+class LocalStreamProducer:
+    """
+    A stand-in for an external producer feeding the given items over a Unix domain socket or a named pipe.
+    The items are sent from a background thread in frames of up to frame_size items.
+    """
+    def __init__(self, items: Iterable[str], frame_size: int = DefaultConfig.LOCAL_STREAM_FRAME_SIZE):
+        self.__items = items
+        self.__frame_size = frame_size
+        self.__thread: Optional[threading.Thread] = None
+        self.__error = None
+
+    def serve_unix_socket(self, socket_path: str):
+        """
+        Starts listening at the given path and sends the items to the first consumer that connects.
+        """
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise Exception("%s exists and is not a socket" % (socket_path,))
+            os.remove(socket_path)
+        server = socket.socket(_get_unix_socket_family(), socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+
+        def serve():
+            try:
+                connection, _ = server.accept()
+            finally:
+                server.close()
+                os.remove(socket_path)
+            with connection:
+                self.__send(connection.makefile("wb"))
+
+        self.__start(serve)
+
+    def serve_named_pipe(self, pipe_path: str):
+        """
+        Creates the named pipe if needed and sends the items once a consumer opens it.
+        """
+        if not os.path.exists(pipe_path):
+            os.mkfifo(pipe_path)
+        self.__start(lambda: self.__send(open(pipe_path, "wb")))
+
+    def join(self):
+        """
+        Waits until all the items are sent. Raises an exception if sending the items failed.
+        """
+        if self.__thread is not None:
+            self.__thread.join()
+        if self.__error is not None:
+            raise Exception("Failed to send the items: %s" % (self.__error,))
+
+    def __start(self, target):
+        if self.__thread is not None:
+            raise Exception("The producer was already started")
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                self.__error = e
+
+        self.__thread = threading.Thread(target=run, daemon=True)
+        self.__thread.start()
+
+    def __send(self, binary_file):
+        output_stream = LocalOutputStream(binary_file, self.__frame_size)
+        try:
+            output_stream.put_many(self.__items)
+        finally:
+            output_stream.close()
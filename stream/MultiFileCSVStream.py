@@ -1,6 +1,12 @@
 import os
 import glob
 import csv
+import copy
+import heapq
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from base.Event import Event
+from misc import DefaultConfig
 from stream.Stream import InputStream
 from stream.CitiBikeDataFormatter import CitiBikeDataFormatter
 
@@ -8,9 +14,12 @@ class CSVFileInputStream(InputStream):
     """
     Reads events from a CSV file with lazy loading support.
     Unlike FileInputStream, this doesn't load the entire file into memory at once.
+    In the row mode, the rows are returned as the lists of values produced by the CSV reader, so that the data
+    formatter does not have to split them again. This is both faster and correct for quoted values containing commas.
     """
     
-    def __init__(self, file_path: str, data_formatter: CitiBikeDataFormatter = None, has_header: bool = True):
+    def __init__(self, file_path: str, data_formatter: CitiBikeDataFormatter = None, has_header: bool = True,
+                 yield_rows: bool = False):
         """
         Initialize the CSV input stream.
         
@@ -18,11 +27,13 @@ class CSVFileInputStream(InputStream):
             file_path: Path to the CSV file
             data_formatter: Data formatter that knows how to parse CSV rows (optional)
             has_header: Whether the CSV file has a header row (default: True)
+            yield_rows: Whether to return the split rows instead of CSV strings (default: False)
         """
         super().__init__()
         self._file_path = file_path
         self._data_formatter = data_formatter
         self._has_header = has_header
+        self._yield_rows = yield_rows
         self._file = None
         self._csv_reader = None
         self._is_initialized = False
@@ -54,6 +65,8 @@ class CSVFileInputStream(InputStream):
             
         try:
             row = next(self._csv_reader)
+            if self._yield_rows:
+                return row
             # Convert row back to CSV string format for compatibility
             return ','.join(row)
         except StopIteration:
@@ -94,7 +107,8 @@ class CSVFileInputStream(InputStream):
         return CSVFileInputStream(
             self._file_path,
             self._data_formatter,
-            self._has_header
+            self._has_header,
+            self._yield_rows
         )
 
 class MultiFileCSVStream(InputStream):
@@ -104,7 +118,7 @@ class MultiFileCSVStream(InputStream):
     """
     
     def __init__(self, directory_path: str, pattern: str = "*.csv", 
-                 data_formatter: CitiBikeDataFormatter = None, has_header: bool = True):
+                 data_formatter: CitiBikeDataFormatter = None, has_header: bool = True, yield_rows: bool = False):
         """
         Initialize the multi-file CSV stream.
         
@@ -113,12 +127,14 @@ class MultiFileCSVStream(InputStream):
             pattern: Glob pattern for matching files (default: "*.csv")
             data_formatter: Data formatter that knows how to parse CSV rows
             has_header: Whether CSV files have header rows (default: True)
+            yield_rows: Whether to return the split rows instead of CSV strings (default: False)
         """
         super().__init__()
         self._directory_path = directory_path
         self._pattern = pattern
         self._data_formatter = data_formatter
         self._has_header = has_header
+        self._yield_rows = yield_rows
         
         # Get list of matching files
         self._file_paths = sorted(glob.glob(os.path.join(directory_path, pattern)))
@@ -147,7 +163,8 @@ class MultiFileCSVStream(InputStream):
         self._current_stream = CSVFileInputStream(
             file_path, 
             self._data_formatter,
-            has_header=self._has_header and not skip_header
+            has_header=self._has_header and not skip_header,
+            yield_rows=self._yield_rows
         )
         
         self._headers_read = True
@@ -207,9 +224,205 @@ class MultiFileCSVStream(InputStream):
             self._directory_path,
             self._pattern,
             self._data_formatter,
-            self._has_header
+            self._has_header,
+            self._yield_rows
         )
 
+def _read_csv_file_chunk(file_path: str, data_formatter, skip_header: bool, offset: int, chunk_size: int,
+                         yield_rows: bool):
+    """
+    Reads and parses up to chunk_size events of a CSV file, starting at the given byte offset. This function is
+    executed by the worker processes of a ParallelMultiFileCSVStream.
+    Returns the header row (if skip_header is set), the list of (timestamp, payload, raw data) triplets, and the offset
+    following the last row read, which is None if the end of the file was reached.
+    """
+    headers = None
+    chunk = []
+    with open(file_path, 'rb') as file:
+        file.seek(offset)
+        # the lines are fetched one at a time, such that the offset of the file matches the rows returned by the reader
+        csv_reader = csv.reader(line.decode() for line in iter(file.readline, b""))
+        if skip_header:
+            headers = next(csv_reader, None)
+            if headers is not None and hasattr(data_formatter, 'set_headers'):
+                data_formatter.set_headers(headers)
+        for row in csv_reader:
+            raw_data = row if yield_rows else ','.join(row)
+            payload = data_formatter.parse_event(raw_data)
+            if payload is None:
+                continue
+            chunk.append((data_formatter.get_event_timestamp(payload), payload, raw_data))
+            if len(chunk) >= chunk_size:
+                return headers, chunk, file.tell()
+    return headers, chunk, None
+
+
+class _CSVFileChunkReader:
+    """
+    Keeps track of reading a single CSV file of a ParallelMultiFileCSVStream. Each chunk is read and parsed by a worker
+    process starting at the offset where the previous chunk ended. Only a single chunk of a file is read at any given
+    moment, hence the chunks of a file are received in order.
+    """
+    def __init__(self, file_path: str, data_formatter: CitiBikeDataFormatter, has_header: bool, chunk_size: int,
+                 yield_rows: bool):
+        self.file_path = file_path
+        # every file gets its own formatter since the formatter keeps the headers of the file being parsed
+        self.data_formatter = copy.copy(data_formatter)
+        self.__has_header = has_header
+        self.__chunk_size = chunk_size
+        self.__yield_rows = yield_rows
+        self.__offset = 0
+
+    def submit_chunk(self, executor: ProcessPoolExecutor):
+        """
+        Starts reading the next chunk of the file. Returns None if the file is exhausted.
+        """
+        if self.__offset is None:
+            return None
+        return executor.submit(_read_csv_file_chunk, self.file_path, self.data_formatter,
+                               self.__has_header and self.__offset == 0, self.__offset, self.__chunk_size,
+                               self.__yield_rows)
+
+    def receive_chunk(self, pending_chunk: Future):
+        """
+        Waits for the given chunk to be read and returns its (timestamp, payload, raw data) triplets.
+        """
+        headers, chunk, self.__offset = pending_chunk.result()
+        if headers is not None and hasattr(self.data_formatter, 'set_headers'):
+            self.data_formatter.set_headers(headers)
+        return chunk
+
+
+class ParallelMultiFileCSVStream(MultiFileCSVStream):
+    """
+    Reads the CSV files of a directory concurrently and merges their events into a single stream ordered by timestamp.
+    The rows of each file are expected to be sorted by timestamp, as is the case for CitiBike trip data.
+    The files are read and parsed by a pool of worker processes in chunks of chunk_size rows, such that parsing is not
+    limited to a single core. At any given moment, at most one chunk of each file is being consumed and at most one
+    more chunk is being read ahead, which bounds the memory consumption regardless of the file sizes.
+    Unlike the other CSV streams, this stream returns ready Event objects, as the rows have to be parsed anyway in
+    order to be merged. The workers return the parsed payloads and timestamps, and the events are created by the
+    consumer in the order of their timestamps. The data formatter must therefore be picklable.
+    """
+    def __init__(self, directory_path: str, pattern: str = "*.csv",
+                 data_formatter: CitiBikeDataFormatter = None, has_header: bool = True, yield_rows: bool = False,
+                 max_workers: int = DefaultConfig.PARALLEL_CSV_STREAM_WORKERS,
+                 chunk_size: int = DefaultConfig.PARALLEL_CSV_STREAM_CHUNK_SIZE):
+        """
+        Initialize the parallel multi-file CSV stream.
+
+        Args:
+            directory_path: Path to the directory containing CSV files
+            pattern: Glob pattern for matching files (default: "*.csv")
+            data_formatter: Data formatter that knows how to parse CSV rows (mandatory)
+            has_header: Whether CSV files have header rows (default: True)
+            yield_rows: Whether to hand the split rows to the data formatter instead of CSV strings (default: False)
+            max_workers: The number of worker processes reading and parsing the files
+            chunk_size: The number of rows read from a file at once
+        """
+        if data_formatter is None:
+            raise Exception("A data formatter is required in order to merge the files by timestamp")
+        if chunk_size < 1:
+            raise Exception("chunk_size must be a positive number, got %s" % (chunk_size,))
+        super().__init__(directory_path, pattern, data_formatter, has_header, yield_rows)
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self.__executor = None
+        self.__readers = None
+        self.__buffers = None
+        self.__pending_chunks = None
+        # a heap of (timestamp, file index) pairs for the files whose buffers are not empty
+        self.__heap = None
+
+    def __start(self):
+        """
+        Opens all files and starts reading their first chunks.
+        """
+        self.__executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        self.__readers = [_CSVFileChunkReader(file_path, self._data_formatter, self._has_header, self._chunk_size,
+                                              self._yield_rows)
+                          for file_path in self._file_paths]
+        self.__buffers = [deque() for _ in self.__readers]
+        self.__pending_chunks = [reader.submit_chunk(self.__executor) for reader in self.__readers]
+        self.__heap = []
+        for file_index in range(len(self.__readers)):
+            if self.__refill(file_index):
+                self.__heap.append((self.__buffers[file_index][0][0], file_index))
+        heapq.heapify(self.__heap)
+
+    def __refill(self, file_index: int):
+        """
+        Replaces the empty buffer of the given file with the chunk read ahead and starts reading the next chunk.
+        Returns False if the file is exhausted.
+        """
+        pending_chunk = self.__pending_chunks[file_index]
+        if pending_chunk is None:
+            return False
+        reader = self.__readers[file_index]
+        chunk = reader.receive_chunk(pending_chunk)
+        self.__pending_chunks[file_index] = reader.submit_chunk(self.__executor)
+        if len(chunk) == 0:
+            # the file ended right after the previous chunk
+            return False
+        self.__buffers[file_index] = deque(chunk)
+        return True
+
+    def __next__(self):
+        """
+        Returns the event with the earliest timestamp among the heads of all files.
+        """
+        if self.__heap is None:
+            self.__start()
+        if len(self.__heap) == 0:
+            self.__release()
+            raise StopIteration()
+        file_index = self.__heap[0][1]
+        buffer = self.__buffers[file_index]
+        timestamp, payload, raw_data = buffer.popleft()
+        if len(buffer) > 0 or self.__refill(file_index):
+            heapq.heapreplace(self.__heap, (self.__buffers[file_index][0][0], file_index))
+        else:
+            heapq.heappop(self.__heap)
+        event = Event(raw_data, self.__readers[file_index].data_formatter, payload, timestamp)
+        if len(self.__heap) == 0:
+            # all files were consumed - the worker processes are released without waiting for close()
+            self.__release()
+        return event
+
+    def __iter__(self):
+        return self
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        self.__release()
+        InputStream.close(self)
+
+    def __release(self):
+        """
+        Stops the worker processes, unless they were already released.
+        """
+        if self.__executor is None:
+            return
+        for pending_chunk in self.__pending_chunks:
+            if pending_chunk is not None:
+                pending_chunk.cancel()
+        self.__executor.shutdown(wait=True)
+        self.__executor = None
+
+    def duplicate(self):
+        return ParallelMultiFileCSVStream(
+            self._directory_path,
+            self._pattern,
+            self._data_formatter,
+            self._has_header,
+            self._yield_rows,
+            self._max_workers,
+            self._chunk_size
+        )
+
+
 class MultiDirectoryCSVStream(InputStream):
     """
     Reads events from CSV files across multiple directories.
@@ -217,7 +430,7 @@ class MultiDirectoryCSVStream(InputStream):
     """
     
     def __init__(self, directory_paths: list, pattern: str = "*.csv",
-                 data_formatter: CitiBikeDataFormatter = None, has_header: bool = True):
+                 data_formatter: CitiBikeDataFormatter = None, has_header: bool = True, yield_rows: bool = False):
         """
         Initialize the multi-directory CSV stream.
         
@@ -226,12 +439,14 @@ class MultiDirectoryCSVStream(InputStream):
             pattern: Glob pattern for matching files (default: "*.csv")
             data_formatter: Data formatter that knows how to parse CSV rows
             has_header: Whether CSV files have header rows (default: True)
+            yield_rows: Whether to return the split rows instead of CSV strings (default: False)
         """
         super().__init__()
         self._directory_paths = directory_paths
         self._pattern = pattern
         self._data_formatter = data_formatter
         self._has_header = has_header
+        self._yield_rows = yield_rows
         
         self._current_dir_index = 0
         self._current_stream = None
@@ -254,7 +469,8 @@ class MultiDirectoryCSVStream(InputStream):
                 directory_path,
                 self._pattern,
                 self._data_formatter,
-                self._has_header
+                self._has_header,
+                self._yield_rows
             )
             self._current_dir_index += 1
             return True
@@ -298,5 +514,6 @@ class MultiDirectoryCSVStream(InputStream):
             self._directory_paths,
             self._pattern,
             self._data_formatter,
-            self._has_header
+            self._has_header,
+            self._yield_rows
         )
\ No newline at end of file
@@ -1,4 +1,8 @@
 from queue import Queue
+import threading
+from typing import Iterable, List
+
+from misc import DefaultConfig
 
 
 class Stream:
@@ -31,6 +35,35 @@ class Stream:
     def get_item(self):
         return self.__next__()
 
+    def put_many(self, items: Iterable[object]):
+        """
+        Adds all the given items to the stream.
+        """
+        for item in items:
+            self.add_item(item)
+
+    def get_many(self, max_items: int) -> List[object]:
+        """
+        Removes and returns up to max_items items from the stream. Blocks only until the first item is available and
+        then returns the items that are available without waiting, hence fewer than max_items items might be returned
+        before the stream is exhausted. An empty list indicates that the stream is exhausted.
+        Every stream implementing this method follows these semantics.
+        """
+        items = []
+        for item in self:
+            items.append(item)
+            if len(items) >= max_items or not self._is_item_available():
+                return items
+        # the end of the stream was consumed, restore it for the following calls
+        self._stream.put(None)
+        return items
+
+    def _is_item_available(self):
+        """
+        Returns True if the next item (or the end of the stream) can be retrieved without waiting.
+        """
+        return not self._stream.empty()
+
     def count(self):
         return self._stream.qsize()
 
@@ -44,6 +77,156 @@ class Stream:
         return x
 
 
+class RingBufferStream(Stream):
+    """
+    A bounded stream backed by a ring buffer, intended for a single producer thread and a single consumer thread.
+    Unlike the default Queue-based implementation, no lock is acquired when adding or removing items. The producer
+    only advances the write position and the consumer only advances the read position, which is safe under the GIL.
+    The consumer only blocks when the stream is empty, and the producer only blocks when the stream is full. The
+    latter provides backpressure towards a producer that is faster than the consumer.
+    Note that a producer and a consumer running in the same thread must never let the stream fill up.
+    """
+    def __init__(self, capacity: int = DefaultConfig.RING_BUFFER_STREAM_CAPACITY):
+        super().__init__()
+        if capacity <= 0:
+            raise Exception("Ring buffer capacity must be positive, got %s" % (capacity,))
+        self._capacity = capacity
+        self._buffer = [None] * capacity
+        # the total number of items ever added and removed, respectively
+        self._write_position = 0
+        self._read_position = 0
+        self._is_closed = False
+        # used for blocking in the slow path only, that is, when the buffer is empty or full
+        self._not_empty = threading.Event()
+        self._not_full = threading.Event()
+        self._is_consumer_waiting = False
+        self._is_producer_waiting = False
+
+    def __next__(self):
+        if self._read_position == self._write_position:
+            self._wait_for_items()
+        read_position = self._read_position
+        index = read_position % self._capacity
+        item = self._buffer[index]
+        self._buffer[index] = None
+        self._read_position = read_position + 1
+        if self._is_producer_waiting:
+            self._not_full.set()
+        return item
+
+    def add_item(self, item: object, block: bool = True):
+        """
+        Adds an item to the stream. If the stream is full, either waits for the consumer to free a slot or raises an
+        exception, depending on the block parameter.
+        """
+        if self._write_position - self._read_position == self._capacity:
+            self._wait_for_free_slots(block)
+        write_position = self._write_position
+        self._buffer[write_position % self._capacity] = item
+        self._write_position = write_position + 1
+        if self._is_consumer_waiting:
+            self._not_empty.set()
+
+    def put_many(self, items: Iterable[object], block: bool = True):
+        """
+        Adds all the given items to the stream, publishing them to the consumer in as few steps as possible.
+        """
+        if not isinstance(items, list):
+            items = list(items)
+        start = 0
+        while start < len(items):
+            free_slots = self._capacity - (self._write_position - self._read_position)
+            if free_slots == 0:
+                self._wait_for_free_slots(block)
+                continue
+            end = min(len(items), start + free_slots)
+            write_position = self._write_position
+            first_index = write_position % self._capacity
+            first_length = min(end - start, self._capacity - first_index)
+            self._buffer[first_index:first_index + first_length] = items[start:start + first_length]
+            self._buffer[0:end - start - first_length] = items[start + first_length:end]
+            self._write_position = write_position + end - start
+            if self._is_consumer_waiting:
+                self._not_empty.set()
+            start = end
+
+    def get_many(self, max_items: int) -> List[object]:
+        """
+        Removes and returns up to max_items items as defined by Stream.get_many, copying them in at most two slices.
+        """
+        if self._read_position == self._write_position:
+            try:
+                self._wait_for_items()
+            except StopIteration:
+                return []
+        read_position = self._read_position
+        count = min(max_items, self._write_position - read_position)
+        first_index = read_position % self._capacity
+        first_length = min(count, self._capacity - first_index)
+        items = self._buffer[first_index:first_index + first_length]
+        self._buffer[first_index:first_index + first_length] = [None] * first_length
+        if first_length < count:
+            items += self._buffer[0:count - first_length]
+            self._buffer[0:count - first_length] = [None] * (count - first_length)
+        self._read_position = read_position + count
+        if self._is_producer_waiting:
+            self._not_full.set()
+        return items
+
+    def _wait_for_items(self):
+        """
+        Blocks until the stream is not empty. Raises StopIteration if the stream is closed and exhausted.
+        """
+        while self._read_position == self._write_position:
+            if self._is_closed:
+                # the producer might have added items right before closing the stream
+                if self._read_position == self._write_position:
+                    raise StopIteration()
+                return
+            self._not_empty.clear()
+            self._is_consumer_waiting = True
+            if self._read_position == self._write_position and not self._is_closed:
+                self._not_empty.wait()
+            self._is_consumer_waiting = False
+
+    def _wait_for_free_slots(self, block: bool):
+        """
+        Blocks until the stream is not full.
+        """
+        if not block:
+            raise Exception("Ring buffer stream is full")
+        while self._write_position - self._read_position == self._capacity:
+            self._not_full.clear()
+            self._is_producer_waiting = True
+            if self._write_position - self._read_position == self._capacity:
+                self._not_full.wait()
+            self._is_producer_waiting = False
+
+    def close(self):
+        self._is_closed = True
+        if self._is_consumer_waiting:
+            self._not_empty.set()
+
+    def duplicate(self):
+        ret = RingBufferStream(self._capacity)
+        ret.put_many(self.__get_pending_items())
+        ret._is_closed = self._is_closed
+        return ret
+
+    def count(self):
+        return self._write_position - self._read_position
+
+    def first(self):
+        return self._buffer[self._read_position % self._capacity] if self.count() > 0 else None
+
+    def last(self):
+        return self._buffer[(self._write_position - 1) % self._capacity] if self.count() > 0 else None
+
+    def __get_pending_items(self):
+        return [self._buffer[position % self._capacity]
+                for position in range(self._read_position, self._write_position)]
+
+
 class InputStream(Stream):
     """
     A stream receiving its items from some external source.
@@ -51,6 +234,12 @@ class InputStream(Stream):
     def add_item(self, item: object):
         raise Exception("Unsupported operation")
 
+    def _is_item_available(self):
+        """
+        By default, the items of an input stream are read from its source (e.g., a file) on demand.
+        """
+        return True
+
 
 class OutputStream(Stream):
     """
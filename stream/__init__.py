@@ -1,7 +1,23 @@
 # Stream module exports
-from .Stream import Stream, InputStream, OutputStream
-from .FileStream import FileInputStream, FileOutputStream
-from .MultiFileCSVStream import CSVFileInputStream, MultiFileCSVStream, MultiDirectoryCSVStream
+from .Stream import Stream, RingBufferStream, InputStream, OutputStream
+from .FileStream import FileInputStream, FileOutputStream, BackgroundFileOutputStream
+from .MultiFileCSVStream import CSVFileInputStream, MultiFileCSVStream, ParallelMultiFileCSVStream, \
+    MultiDirectoryCSVStream
+from .BinaryEventLog import (
+    BinaryEventLogWriter,
+    BinaryEventLogInputStream,
+    BinaryEventLogDataFormatter,
+    convert_to_binary_event_log,
+)
+from .BinaryMatchLog import BinaryMatchOutputStream, BinaryMatchLogReader
+from .AsyncStream import AsyncStream, AsyncLocalInputStream
+from .LocalStream import (
+    UnixSocketInputStream,
+    UnixSocketOutputStream,
+    NamedPipeInputStream,
+    NamedPipeOutputStream,
+    LocalStreamProducer,
+)
 from .CitiBikeDataFormatter import (
     CitiBikeDataFormatter,
     CitiBikeEventTypeClassifier,
@@ -9,13 +25,29 @@ from .CitiBikeDataFormatter import (
 
 __all__ = [
     'Stream',
+    'RingBufferStream',
     'InputStream',
     'OutputStream',
     'FileInputStream',
     'FileOutputStream',
+    'BackgroundFileOutputStream',
     'CSVFileInputStream',
     'MultiFileCSVStream',
+    'ParallelMultiFileCSVStream',
     'MultiDirectoryCSVStream',
+    'BinaryEventLogWriter',
+    'BinaryEventLogInputStream',
+    'BinaryEventLogDataFormatter',
+    'convert_to_binary_event_log',
+    'BinaryMatchOutputStream',
+    'BinaryMatchLogReader',
+    'AsyncStream',
+    'AsyncLocalInputStream',
+    'UnixSocketInputStream',
+    'UnixSocketOutputStream',
+    'NamedPipeInputStream',
+    'NamedPipeOutputStream',
+    'LocalStreamProducer',
     'CitiBikeDataFormatter',
     'CitiBikeEventTypeClassifier',
 ]
\ No newline at end of file
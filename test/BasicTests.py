@@ -17,8 +17,10 @@ citibikeEventDirectories = [
     "data/2013-citibike-tripdata"
 ]
 CITIBIKE_DATA_FORMATTER = CitiBikeDataFormatter(CitiBikeEventTypeClassifier())  
-citibikeEventStream = MultiDirectoryCSVStream(citibikeEventDirectories, "*.csv", CITIBIKE_DATA_FORMATTER, has_header=True)
-singleCitibikeEventStream = CSVFileInputStream("data/2013-citibike-tripdata/short-tripdata.csv", CITIBIKE_DATA_FORMATTER, has_header=True)
+citibikeEventStream = MultiDirectoryCSVStream(citibikeEventDirectories, "*.csv", CITIBIKE_DATA_FORMATTER, has_header=True,
+                                              yield_rows=True)
+singleCitibikeEventStream = CSVFileInputStream("data/2013-citibike-tripdata/short-tripdata.csv", CITIBIKE_DATA_FORMATTER, has_header=True,
+                                               yield_rows=True)
 
 
 def hotpathPatternSearchTest(createTestFile=False, eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
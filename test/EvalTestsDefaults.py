@@ -42,6 +42,9 @@ DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS = \
                                statistics_collector_params=DEFAULT_TESTING_STATISTICS_COLLECTOR_SELECTIVITY_AND_ARRIVAL_RATES_STATISTICS,
                                statistics_updates_wait_time=timedelta(minutes=10))
 
+DEFAULT_TESTING_NON_ADAPTIVE_TRIVIAL_OPTIMIZER_SETTINGS = \
+    TrivialOptimizerParameters(tree_plan_params=DEFAULT_BASIC_TESTING_TREE_BUILDER, statistics_updates_wait_time=None)
+
 DEFAULT_TESTING_DEVIATION_AWARE_OPTIMIZER_SETTINGS = \
     StatisticsDeviationAwareOptimizerParameters(tree_plan_params=DEFAULT_BASIC_TESTING_TREE_BUILDER, deviation_threshold=0.5,
                                statistics_collector_params=DEFAULT_TESTING_STATISTICS_COLLECTOR_SELECTIVITY_AND_ARRIVAL_RATES_STATISTICS,
@@ -136,3 +139,68 @@ DEFAULT_TESTING_SIMULTANEOUS_EVALUATION_MECHANISM_SETTINGS_AND_ZSTREAM_INVARIANT
     TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
                                            tree_update_type=TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION,
                                            optimizer_params=DEFAULT_TESTING_ZSTREAM_INVARIANT_OPTIMIZER_SETTINGS)
+
+
+"""
+evaluation mechanism: trivial, batched event ingestion
+optimizer: trivial, non-adaptive (batching is disabled while statistics are collected)
+"""
+DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_NON_ADAPTIVE_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           batch_size=128)
+
+
+"""
+evaluation mechanism: trivial, compact event representation
+optimizer: trivial
+"""
+DEFAULT_TESTING_COMPACT_EVENTS_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           compact_events=True)
+
+
+"""
+evaluation mechanism: trivial, integer timestamps
+optimizer: trivial, non-adaptive
+"""
+DEFAULT_TESTING_INTEGER_TIMESTAMPS_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_NON_ADAPTIVE_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           integer_timestamps=True)
+
+
+"""
+evaluation mechanism: trivial, out-of-order events reordered within a lateness bound of 5 minutes
+optimizer: trivial
+"""
+DEFAULT_TESTING_REORDERING_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           max_lateness=timedelta(minutes=5))
+
+"""
+evaluation mechanism: trivial, batched, out-of-order events reordered within a lateness bound of 5 minutes
+optimizer: trivial, non-adaptive
+"""
+DEFAULT_TESTING_BATCHED_REORDERING_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_NON_ADAPTIVE_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           batch_size=128,
+                                           max_lateness=timedelta(minutes=5))
+
+"""
+evaluation mechanism: trivial, the logical time of the tree is advanced by a watermark every minute
+optimizer: trivial
+"""
+DEFAULT_TESTING_WATERMARK_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           optimizer_params=DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS,
+                                           watermark_interval=timedelta(minutes=1))
@@ -315,3 +315,66 @@ def googleAmazonLowPatternSearchTest_8():
     googleAmazonLowPatternSearchTest(
         eval_mechanism_params=DEFAULT_TESTING_SIMULTANEOUS_EVALUATION_MECHANISM_SETTINGS_AND_ZSTREAM_INVARIANT_OPTIMIZER,
         test_name = 'googleAmazonLow|_adaptive_zstream_invariant_optimizer_simultaneous_tree_update')
+
+
+def simple_batched():
+    simplePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                            test_name='simple|_batched')
+
+
+def googleAscendPatternSearchTest_batched():
+    googleAscendPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                  test_name='googleAscend|_batched')
+
+
+def amazonInstablePatternSearchTest_batched():
+    amazonInstablePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                    test_name='amazonInstable|_batched')
+
+
+def msftDrivRacePatternSearchTest_batched():
+    msftDrivRacePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                  test_name='msftDrivRace|_batched')
+
+
+def googleAmazonLowPatternSearchTest_batched():
+    googleAmazonLowPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                     test_name='googleAmazonLow|_batched')
+
+
+def simple_compact():
+    simplePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_COMPACT_EVENTS_EVALUATION_MECHANISM_SETTINGS,
+                            test_name='simple|_compact')
+
+
+def googleAscendPatternSearchTest_compact():
+    googleAscendPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_COMPACT_EVENTS_EVALUATION_MECHANISM_SETTINGS,
+                                  test_name='googleAscend|_compact')
+
+
+def googleAmazonLowPatternSearchTest_compact():
+    googleAmazonLowPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_COMPACT_EVENTS_EVALUATION_MECHANISM_SETTINGS,
+                                     test_name='googleAmazonLow|_compact')
+
+
+def simple_integer_timestamps():
+    simplePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_INTEGER_TIMESTAMPS_EVALUATION_MECHANISM_SETTINGS,
+                            test_name='simple|_integer_timestamps')
+
+
+def googleAscendPatternSearchTest_integer_timestamps():
+    googleAscendPatternSearchTest(
+        eval_mechanism_params=DEFAULT_TESTING_INTEGER_TIMESTAMPS_EVALUATION_MECHANISM_SETTINGS,
+        test_name='googleAscend|_integer_timestamps')
+
+
+def amazonInstablePatternSearchTest_integer_timestamps():
+    amazonInstablePatternSearchTest(
+        eval_mechanism_params=DEFAULT_TESTING_INTEGER_TIMESTAMPS_EVALUATION_MECHANISM_SETTINGS,
+        test_name='amazonInstable|_integer_timestamps')
+
+
+def googleAmazonLowPatternSearchTest_integer_timestamps():
+    googleAmazonLowPatternSearchTest(
+        eval_mechanism_params=DEFAULT_TESTING_INTEGER_TIMESTAMPS_EVALUATION_MECHANISM_SETTINGS,
+        test_name='googleAmazonLow|_integer_timestamps')
@@ -152,6 +152,29 @@ def oneNotAtTheEndTest(create_test_file=False):
     runTest("OneNotEnd", [pattern], create_test_file, eval_params)
 
 
+# ON NASDAQ *HALF* SHORT
+def oneNotAtTheEndWatermarkTest(create_test_file=False):
+    """
+    The pending matches are released by periodic watermarks rather than by the arrivals of matching events.
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"), PrimitiveEventStructure("GOOG", "c"), NegationOperator(PrimitiveEventStructure("TYP1", "x"))),
+        AndCondition(
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"])),
+            SmallerThanCondition(Variable("b", lambda x: x["Opening Price"]),
+                                 Variable("c", lambda x: x["Opening Price"]))
+        ),
+        timedelta(minutes=5)
+    )
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=OptimizerParameters(opt_type=OptimizerTypes.TRIVIAL_OPTIMIZER,
+                                             tree_plan_params=TreePlanBuilderParameters(builder_type=TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE,
+                                  negation_algorithm_type=NegationAlgorithmTypes.NAIVE_NEGATION_ALGORITHM)),
+        watermark_interval=timedelta(minutes=1))
+    runTest("OneNotEnd|_watermarks", [pattern], create_test_file, eval_params, expected_file_name="OneNotEnd")
+
+
 # ON NASDAQ *HALF* SHORT
 def multipleNotAtTheEndTest(create_test_file=False):
     pattern = Pattern(
@@ -1,12 +1,32 @@
 from datetime import timedelta
 
-from condition.BaseRelationCondition import GreaterThanCondition, GreaterThanEqCondition
+from condition.BaseRelationCondition import GreaterThanCondition, GreaterThanEqCondition, EqCondition, \
+    SmallerThanCondition
 from test.testUtils import *
 from condition.Condition import Variable
-from condition.CompositeCondition import AndCondition
-from base.PatternStructure import AndOperator, PrimitiveEventStructure
+from condition.CompositeCondition import AndCondition, OrCondition
+from base.PatternStructure import AndOperator, SeqOperator, PrimitiveEventStructure, KleeneClosureOperator
 from base.Pattern import Pattern
 
+def get_disjunctive_condition_pattern():
+    """
+    A pattern whose condition is a disjunction of an equality and a range condition. Neither of them holds for every
+    match, hence the partial matches must not be indexed by any of them.
+    """
+    return Pattern(
+        SeqOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b")),
+        OrCondition(
+            EqCondition(
+                Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])
+            ),
+            GreaterThanCondition(
+                Variable("a", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])
+            ),
+        ),
+        timedelta(minutes=30),
+    )
+
+
 def sortedStorageTest(createTestFile=False):
     pattern = Pattern(
         AndOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"), PrimitiveEventStructure("CBRL", "c")),
@@ -25,6 +45,153 @@ def sortedStorageTest(createTestFile=False):
         optimizer_params=StatisticsDeviationAwareOptimizerParameters(tree_plan_params=TreePlanBuilderParameters()),
         storage_params=storage_params)
     runTest("sortedStorageTest", [pattern], createTestFile, eval_mechanism_params=eval_params, events=nasdaqEventStream)
+    storage_params = TreeStorageParameters(True, clean_up_interval=500, index_range_conditions=False)
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=StatisticsDeviationAwareOptimizerParameters(tree_plan_params=TreePlanBuilderParameters()),
+        storage_params=storage_params)
+    runTest("sortedStorageTest|_sortedList", [pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStream)
+
+
+def hashedStorageTest(createTestFile=False):
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        AndCondition(
+            EqCondition(
+                Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])
+            ),
+            GreaterThanCondition(
+                Variable("c", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])
+            ),
+        ),
+        timedelta(minutes=360),
+    )
+    storage_params = TreeStorageParameters(sort_storage=True, clean_up_interval=500,
+                                           prioritize_sorting_by_timestamp=False, build_composite_indices=False)
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=StatisticsDeviationAwareOptimizerParameters(tree_plan_params=TreePlanBuilderParameters()),
+        storage_params=storage_params)
+    runTest("hashedStorageTest", [pattern], createTestFile, eval_mechanism_params=eval_params, events=nasdaqEventStream)
+
+
+def compositeStorageTest(createTestFile=False):
+    condition = AndCondition(
+        EqCondition(
+            Variable("a", lambda x: x["Date"]), Variable("b", lambda x: x["Date"])
+        ),
+        SmallerThanCondition(
+            Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])
+        ),
+        GreaterThanCondition(
+            Variable("c", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])
+        ),
+    )
+    and_pattern = Pattern(
+        AndOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        condition,
+        timedelta(minutes=360),
+    )
+    seq_pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        condition,
+        timedelta(minutes=360),
+    )
+    storage_params = TreeStorageParameters(sort_storage=True, attributes_priorities={"a": 1, "b": 1, "c": 2},
+                                           clean_up_interval=500)
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=StatisticsDeviationAwareOptimizerParameters(tree_plan_params=TreePlanBuilderParameters()),
+        storage_params=storage_params)
+    runTest("compositeStorageTest", [and_pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStream)
+    runTest("compositeSeqStorageTest", [seq_pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStream)
+    # the expected matches were produced without indexing the partial matches
+    runTest("disjunctiveConditionStorageTest|_composite", [get_disjunctive_condition_pattern()], createTestFile,
+            eval_mechanism_params=eval_params, events=nasdaqEventStream)
+
+
+def automaticStorageSelectionTest(createTestFile=False):
+    condition = AndCondition(
+        EqCondition(
+            Variable("a", lambda x: x["Date"]), Variable("b", lambda x: x["Date"])
+        ),
+        SmallerThanCondition(
+            Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])
+        ),
+        GreaterThanCondition(
+            Variable("c", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])
+        ),
+    )
+    and_pattern = Pattern(
+        AndOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        condition,
+        timedelta(minutes=360),
+    )
+    seq_pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        condition,
+        timedelta(minutes=360),
+    )
+    range_pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("DRIV", "a"), PrimitiveEventStructure("MSFT", "b"),
+                    PrimitiveEventStructure("CBRL", "c")),
+        GreaterThanCondition(
+            Variable("a", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])
+        ),
+        timedelta(minutes=360),
+    )
+    expected_result = ('And', 'unsorted',
+                       ('And', 'range-indexed', ('a', 'composite-indexed'), ('b', 'composite-indexed')),
+                       ('c', 'range-indexed'))
+    runStorageStructuralTest('automaticStorageSelectionStructuralTest', [and_pattern], expected_result)
+    expected_result = ('Seq', 'unsorted',
+                       ('Seq', 'unsorted', ('a', 'range-indexed'), ('b', 'range-indexed')),
+                       ('c', 'arrival-ordered'))
+    runStorageStructuralTest('automaticRangeStorageSelectionStructuralTest', [range_pattern], expected_result)
+    # the nodes of a multi-pattern tree may be shared by parents evaluating different conditions
+    expected_result = (('And', 'unsorted',
+                        ('And', 'unsorted', ('a', 'arrival-ordered'), ('b', 'arrival-ordered')),
+                        ('c', 'arrival-ordered')),
+                       ('Seq', 'unsorted',
+                        ('Seq', 'unsorted', ('a', 'arrival-ordered'), ('b', 'arrival-ordered')),
+                        ('c', 'arrival-ordered')))
+    runStorageStructuralTest('automaticMultiPatternStorageSelectionStructuralTest', [and_pattern, range_pattern],
+                             expected_result)
+    runTest("compositeStorageTest|_automatic", [and_pattern], createTestFile, events=nasdaqEventStream)
+    runTest("compositeSeqStorageTest|_automatic", [seq_pattern], createTestFile, events=nasdaqEventStream)
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        storage_params=TreeStorageParameters(time_buckets_per_window=4))
+    expected_result = ('Seq', 'time-bucketed',
+                       ('Seq', 'time-bucketed', ('a', 'range-indexed'), ('b', 'range-indexed')),
+                       ('c', 'arrival-ordered'))
+    runStorageStructuralTest('timeBucketedStorageStructuralTest', [range_pattern], expected_result, eval_params)
+    runTest("compositeSeqStorageTest|_timeBuckets", [seq_pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStream)
+    # the partial matches of a Kleene closure cannot be looked up by a key, hence neither subtree is indexed
+    kc_pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"),
+                    KleeneClosureOperator(PrimitiveEventStructure("GOOG", "b"), min_size=1, max_size=2)),
+        EqCondition(
+            Variable("a", lambda x: x["Stock Ticker"]),
+            Variable("b", lambda x: x[0]["Stock Ticker"] if isinstance(x, list) else x["Stock Ticker"])
+        ),
+        timedelta(minutes=5),
+    )
+    expected_result = ('Seq', 'unsorted', ('a', 'arrival-ordered'), ('KC', 'unsorted', ('b', 'arrival-ordered')))
+    runStorageStructuralTest('automaticKCStorageSelectionStructuralTest', [kc_pattern], expected_result)
+    runTest("automaticKCStorageSelectionTest", [kc_pattern], createTestFile, events=nasdaqEventStreamShort)
+    # a disjunction of conditions does not yield any index key, hence the default storage is used
+    disjunctive_pattern = get_disjunctive_condition_pattern()
+    expected_result = ('Seq', 'unsorted', ('a', 'arrival-ordered'), ('b', 'arrival-ordered'))
+    runStorageStructuralTest('automaticDisjunctiveStorageSelectionStructuralTest', [disjunctive_pattern],
+                             expected_result)
+    runTest("disjunctiveConditionStorageTest|_automatic", [disjunctive_pattern], createTestFile,
+            events=nasdaqEventStream)
 
 
 def sortedStorageBenchMarkTest(createTestFile=False):
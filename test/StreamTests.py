@@ -0,0 +1,538 @@
+import asyncio
+import multiprocessing
+import random
+import socket
+import tempfile
+import threading
+from datetime import timedelta, datetime
+
+from test.testUtils import *
+from condition.Condition import Variable, BinaryCondition
+from condition.CompositeCondition import AndCondition
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure, NegationOperator
+from base.Pattern import Pattern
+from stream.BinaryEventLog import convert_to_binary_event_log, BinaryEventLogInputStream, \
+    BinaryEventLogDataFormatter, BinaryEventLogWriter
+from stream.MultiFileCSVStream import ParallelMultiFileCSVStream
+from stream.FileStream import BackgroundFileOutputStream
+from stream.BinaryMatchLog import BinaryMatchOutputStream, BinaryMatchLogReader
+from stream.Stream import Stream, RingBufferStream
+from test.EvalTestsDefaults import DEFAULT_TREE_STORAGE_PARAMETERS, DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS, \
+    DEFAULT_TESTING_REORDERING_EVALUATION_MECHANISM_SETTINGS, DEFAULT_TESTING_BATCHED_REORDERING_EVALUATION_MECHANISM_SETTINGS, \
+    DEFAULT_TESTING_WATERMARK_EVALUATION_MECHANISM_SETTINGS
+from evaluation.EvaluationMechanismFactory import EvaluationMechanismFactory
+from stream.AsyncStream import AsyncStream, AsyncLocalInputStream, iterate_in_micro_batches
+from stream.LocalStream import LocalStreamProducer, UnixSocketInputStream, UnixSocketOutputStream, \
+    NamedPipeInputStream
+from adaptive.optimizer.OptimizerFactory import OptimizerParameters
+from adaptive.optimizer.OptimizerTypes import OptimizerTypes
+from plan.negation.NegationAlgorithmTypes import NegationAlgorithmTypes
+from plugin.sensors.Sensors import SensorsDataFormatter
+from stream.CitiBikeDataFormatter import CitiBikeDataFormatter
+from misc.TimestampUtils import datetimes_to_epoch_micros
+
+
+def get_google_ascend_pattern():
+    """
+    PATTERN SEQ(GoogleStockPriceUpdate a, GoogleStockPriceUpdate b, GoogleStockPriceUpdate c)
+    WHERE a.PeakPrice < b.PeakPrice AND b.PeakPrice < c.PeakPrice
+    WITHIN 3 minutes
+    """
+    return Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"), PrimitiveEventStructure("GOOG", "b"),
+                    PrimitiveEventStructure("GOOG", "c")),
+        AndCondition(
+            BinaryCondition(Variable("a", lambda x: x["Peak Price"]),
+                            Variable("b", lambda x: x["Peak Price"]),
+                            relation_op=lambda x, y: x < y),
+            BinaryCondition(Variable("b", lambda x: x["Peak Price"]),
+                            Variable("c", lambda x: x["Peak Price"]),
+                            relation_op=lambda x, y: x < y)
+        ),
+        timedelta(minutes=3)
+    )
+
+
+def streamGetManyTest(createTestFile=False):
+    """
+    Verifies that the queue-based stream and the ring buffer stream implement get_many the same way: the items that are
+    available are returned without waiting for max_items items, and an empty list is returned once the stream is
+    exhausted.
+    """
+    test_name = "streamGetMany"
+    start = datetime.now()
+    is_test_successful = True
+    for stream in [Stream(), RingBufferStream(8)]:
+        stream.put_many([1, 2, 3])
+        is_test_successful = is_test_successful and stream.get_many(2) == [1, 2] and stream.get_many(10) == [3]
+        producer = threading.Timer(0.1, lambda s: (s.put_many([4, 5]), s.close()), args=(stream,))
+        producer.start()
+        received_items = []
+        for _ in range(3):
+            received_items.extend(stream.get_many(10))
+        producer.join()
+        is_test_successful = is_test_successful and received_items == [4, 5] and stream.get_many(10) == []
+    running_time = (datetime.now() - start).total_seconds()
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+def binaryEventLogTest(createTestFile=False):
+    """
+    Replays the NASDAQ stream from a binary event log and expects the same matches as for the text stream.
+    Also verifies that values other than primitive ones are rejected when the log is written.
+    """
+    with tempfile.TemporaryDirectory() as log_directory:
+        log_path = os.path.join(log_directory, "nasdaq.log")
+        convert_to_binary_event_log(nasdaqEventStream.duplicate(), DEFAULT_TESTING_DATA_FORMATTER, log_path)
+        with BinaryEventLogInputStream(log_path) as events:
+            runTest("binaryEventLog", [get_google_ascend_pattern()], createTestFile,
+                    events=events, data_formatter=BinaryEventLogDataFormatter(), expected_file_name="googleAscend")
+        with BinaryEventLogWriter(os.path.join(log_directory, "objects.log")) as writer:
+            try:
+                writer.write({"Prices": [1, 2]}, "GOOG", datetime(2020, 1, 1))
+                is_object_rejected = False
+            except Exception:
+                is_object_rejected = True
+    report_test_result("binaryEventLogObjectRejection", is_object_rejected)
+
+
+def parallelMultiFileCSVStreamTest(createTestFile=False):
+    """
+    Splits the NASDAQ stream into a file per ticker and merges the files back by timestamp while reading them
+    concurrently. Small chunks are used in order to exercise the read-ahead logic. Also verifies that the worker
+    processes are stopped once the stream is exhausted, as CEP.run does not close its input stream.
+    """
+    with tempfile.TemporaryDirectory() as stream_directory:
+        ticker_files = {}
+        for line in nasdaqEventStream.duplicate():
+            ticker = line.split(",", 1)[0]
+            if ticker not in ticker_files:
+                ticker_files[ticker] = open(os.path.join(stream_directory, "%s.csv" % (ticker,)), "w")
+            ticker_files[ticker].write(line.strip() + "\n")
+        for ticker_file in ticker_files.values():
+            ticker_file.close()
+        events = ParallelMultiFileCSVStream(stream_directory, data_formatter=DEFAULT_TESTING_DATA_FORMATTER,
+                                            has_header=False, max_workers=3, chunk_size=16)
+        runTest("parallelMultiFileCSVStream", [get_google_ascend_pattern()], createTestFile, events=events,
+                expected_file_name="googleAscend")
+        report_test_result("parallelMultiFileCSVStreamRelease", len(multiprocessing.active_children()) == 0)
+        events.close()
+
+
+def backgroundFileOutputStreamTest(createTestFile=False):
+    """
+    Writes the matches using a background writer thread. A tiny queue is used in order to exercise the backpressure.
+    """
+    runTest("backgroundFileOutputStream", [get_google_ascend_pattern()], createTestFile,
+            expected_file_name="googleAscend",
+            output_stream_factory=lambda base_path, file_name: BackgroundFileOutputStream(
+                base_path, file_name, queue_capacity=4, write_batch_size=3))
+
+
+def binaryMatchOutputTest(createTestFile=False):
+    """
+    Writes the matches into a binary match log with an event dictionary, re-hydrates them into the textual
+    representation and compares the result to the expected matches.
+    """
+    test_name = "binaryMatchOutput"
+    base_matches_directory = os.path.join(absolutePath, 'test', 'Matches')
+    actual_matches_path = os.path.join(base_matches_directory, "%sMatches.txt" % (test_name,))
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "googleAscendMatches.txt")
+    os.makedirs(base_matches_directory, exist_ok=True)
+    with tempfile.TemporaryDirectory() as log_directory:
+        match_log_path = os.path.join(log_directory, "matches.bin")
+        event_dictionary_path = os.path.join(log_directory, "events.log")
+        cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+        running_time = cep.run(nasdaqEventStream.duplicate(),
+                               BinaryMatchOutputStream(match_log_path, event_dictionary_path),
+                               DEFAULT_TESTING_DATA_FORMATTER)
+        match_log = BinaryMatchLogReader(match_log_path)
+        event_dictionary = match_log.load_event_dictionary()
+        with open(actual_matches_path, "w") as actual_matches_file:
+            for match in match_log:
+                for event_index in match.event_indices:
+                    actual_matches_file.write("%s\n" % (dict(event_dictionary[event_index]),))
+                actual_matches_file.write("\n")
+    is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+def iterMatchesTest(createTestFile=False):
+    """
+    Consumes the matches using the generator API and writes them to the output file, expecting the same matches as
+    for CEP.run. Also verifies that stopping early only consumes a prefix of the input stream.
+    """
+    test_name = "iterMatches"
+    base_matches_directory = os.path.join(absolutePath, 'test', 'Matches')
+    actual_matches_path = os.path.join(base_matches_directory, "%sMatches.txt" % (test_name,))
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "googleAscendMatches.txt")
+    cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    start = datetime.now()
+    matches_stream = FileOutputStream(base_matches_directory, "%sMatches.txt" % (test_name,))
+    for match in cep.iter_matches(nasdaqEventStream.duplicate(), DEFAULT_TESTING_DATA_FORMATTER):
+        matches_stream.add_item(match)
+    matches_stream.close()
+    running_time = (datetime.now() - start).total_seconds()
+    is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+
+    events = nasdaqEventStream.duplicate()
+    total_events = events.count()
+    early_stop_cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    first_match = next(early_stop_cep.iter_matches(events, DEFAULT_TESTING_DATA_FORMATTER), None)
+    is_test_successful = is_test_successful and first_match is not None and events.count() < total_events
+
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+def asyncRunTest(createTestFile=False):
+    """
+    Feeds the events through an AsyncStream from a concurrent producer task and consumes the matches from another
+    AsyncStream, expecting the same matches as for CEP.run.
+    """
+    test_name = "asyncRun"
+    base_matches_directory = os.path.join(absolutePath, 'test', 'Matches')
+    actual_matches_path = os.path.join(base_matches_directory, "%sMatches.txt" % (test_name,))
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "googleAscendMatches.txt")
+    cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+
+    async def produce(events: AsyncStream):
+        for raw_event in nasdaqEventStream.duplicate():
+            await events.add_item(raw_event)
+        await events.close()
+
+    async def consume(matches: AsyncStream):
+        matches_stream = FileOutputStream(base_matches_directory, "%sMatches.txt" % (test_name,))
+        async for match in matches:
+            matches_stream.add_item(match)
+        matches_stream.close()
+
+    async def run():
+        events, matches = AsyncStream(capacity=1024), AsyncStream()
+        results = await asyncio.gather(produce(events), consume(matches),
+                                       cep.run_async(events, matches, DEFAULT_TESTING_DATA_FORMATTER))
+        return results[2]
+
+    running_time = asyncio.run(run())
+    is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+def asyncSourcesTest(createTestFile=False):
+    """
+    Runs CEP.run_async on events received by an AsyncLocalInputStream over a Unix domain socket, on events yielded by
+    an asynchronous generator and on a regular input stream, expecting the same matches as for CEP.run in every case.
+    Also verifies that the items of an asynchronous generator are drained in micro-batches rather than one by one.
+    """
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "googleAscendMatches.txt")
+    base_matches_directory = os.path.join(absolutePath, 'test', 'Matches')
+
+    async def generate_events():
+        for raw_event in nasdaqEventStream.duplicate():
+            yield raw_event
+
+    async def run_on_socket(cep: CEP, matches: OutputStream):
+        with tempfile.TemporaryDirectory() as temp_directory:
+            socket_path = os.path.join(temp_directory, "events.sock")
+            producer = LocalStreamProducer(nasdaqEventStream.duplicate(), frame_size=100)
+            producer.serve_unix_socket(socket_path)
+            events = await AsyncLocalInputStream.connect_unix_socket(socket_path)
+            running_time = await cep.run_async(events, matches, DEFAULT_TESTING_DATA_FORMATTER)
+            events.close()
+            producer.join()
+        return running_time
+
+    async def get_micro_batches():
+        return [micro_batch async for micro_batch in iterate_in_micro_batches(generate_events(), 128)]
+
+    micro_batches = asyncio.run(get_micro_batches())
+    are_micro_batches_drained = max(map(len, micro_batches)) == 128 and \
+        [raw_event for micro_batch in micro_batches for raw_event in micro_batch] == \
+        list(nasdaqEventStream.duplicate())
+
+    runners = [("asyncLocalSocketStream", run_on_socket),
+               ("asyncGeneratorStream",
+                lambda cep, matches: cep.run_async(generate_events(), matches, DEFAULT_TESTING_DATA_FORMATTER)),
+               ("asyncRegularStream",
+                lambda cep, matches: cep.run_async(nasdaqEventStream.duplicate(), matches,
+                                                   DEFAULT_TESTING_DATA_FORMATTER))]
+    for test_name, runner in runners:
+        cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+        matches = FileOutputStream(base_matches_directory, "%sMatches.txt" % (test_name,))
+        running_time = asyncio.run(runner(cep, matches))
+        actual_matches_path = os.path.join(base_matches_directory, "%sMatches.txt" % (test_name,))
+        is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+        if test_name == "asyncGeneratorStream":
+            is_test_successful = is_test_successful and are_micro_batches_drained
+        report_test_result(test_name, is_test_successful, running_time)
+
+
+def pushEventsTest(createTestFile=False):
+    """
+    Pushes the events into a long-lived engine, alternating between single events and batches of varying sizes, and
+    collects the returned matches, expecting the same matches as for CEP.run.
+    """
+    test_name = "pushEvents"
+    base_matches_directory = os.path.join(absolutePath, 'test', 'Matches')
+    actual_matches_path = os.path.join(base_matches_directory, "%sMatches.txt" % (test_name,))
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "googleAscendMatches.txt")
+    cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    raw_events = list(nasdaqEventStream.duplicate())
+    start = datetime.now()
+    matches_stream = FileOutputStream(base_matches_directory, "%sMatches.txt" % (test_name,))
+    position, batch_size = 0, 1
+    while position < len(raw_events):
+        if batch_size == 1:
+            new_matches = cep.push_event(raw_events[position], DEFAULT_TESTING_DATA_FORMATTER)
+        else:
+            new_matches = cep.push_events(raw_events[position:position + batch_size], DEFAULT_TESTING_DATA_FORMATTER)
+        for match in new_matches + cep.flush():
+            matches_stream.add_item(match)
+        position += batch_size
+        batch_size = batch_size % 7 + 1
+    for match in cep.flush():
+        matches_stream.add_item(match)
+    matches_stream.close()
+    running_time = (datetime.now() - start).total_seconds()
+    is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+    report_test_result(test_name, is_test_successful, running_time)
+
+    # a pattern ending with a negative event: every flush releases the pending matches, which must not be released
+    # again by the following flushes. As the pending matches are released before their time windows expire, a match
+    # later invalidated by a negative event might be reported as well, hence only the absence of duplicates and the
+    # presence of the matches reported by CEP.run are verified
+    test_name = "pushEventsNegation"
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                    PrimitiveEventStructure("GOOG", "c"), NegationOperator(PrimitiveEventStructure("TYP1", "x"))),
+        AndCondition(
+            BinaryCondition(Variable("a", lambda x: x["Opening Price"]),
+                            Variable("b", lambda x: x["Opening Price"]),
+                            relation_op=lambda x, y: x > y),
+            BinaryCondition(Variable("b", lambda x: x["Opening Price"]),
+                            Variable("c", lambda x: x["Opening Price"]),
+                            relation_op=lambda x, y: x < y)
+        ),
+        timedelta(minutes=5)
+    )
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=OptimizerParameters(opt_type=OptimizerTypes.TRIVIAL_OPTIMIZER,
+                                             tree_plan_params=TreePlanBuilderParameters(
+                                                 builder_type=TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE,
+                                                 negation_algorithm_type=NegationAlgorithmTypes.NAIVE_NEGATION_ALGORITHM)))
+    expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', "OneNotEndMatches.txt")
+    with open(expected_matches_path) as expected_file:
+        expected_matches = set(match for match in expected_file.read().split("\n\n") if match.strip())
+    cep = CEP([pattern], eval_params)
+    raw_events = list(nasdaqEventStreamHalfShort.duplicate())
+    start = datetime.now()
+    reported_matches = []
+    position, batch_size = 0, 1
+    while position < len(raw_events):
+        reported_matches += cep.push_events(raw_events[position:position + batch_size], DEFAULT_TESTING_DATA_FORMATTER)
+        reported_matches += cep.flush()
+        position += batch_size
+        batch_size = batch_size % 7 + 1
+    reported_matches += cep.flush()
+    running_time = (datetime.now() - start).total_seconds()
+    reported_match_strings = [str(match).strip() for match in reported_matches]
+    is_test_successful = len(reported_match_strings) == len(set(reported_match_strings)) and \
+        {match.strip() for match in expected_matches}.issubset(reported_match_strings)
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+class LocalStreamSource:
+    """
+    Replays the given events over a local connection. Every duplicate starts a new stand-in producer sending the events
+    and returns the input stream created by connect for it, hence the source can be passed to runTest as the events.
+    """
+    def __init__(self, events: Stream, connect):
+        self.__events = events
+        self.__connect = connect
+        self.__producers = []
+        self.__input_streams = []
+
+    def duplicate(self):
+        producer = LocalStreamProducer(self.__events.duplicate(), frame_size=100)
+        self.__producers.append(producer)
+        input_stream = self.__connect(producer)
+        self.__input_streams.append(input_stream)
+        return input_stream
+
+    def close(self):
+        for producer in self.__producers:
+            producer.join()
+        for input_stream in self.__input_streams:
+            input_stream.close()
+
+
+class SocketRelayedFileOutputStream(UnixSocketOutputStream):
+    """
+    Sends the matches over a socket pair to a consumer thread writing them to the given file. Closing the stream waits
+    until the consumer has written all the matches.
+    """
+    def __init__(self, base_path: str, file_name: str):
+        sender_socket, receiver_socket = socket.socketpair()
+        super().__init__(connection=sender_socket)
+        self.__consumer_thread = threading.Thread(target=self.__consume, args=(receiver_socket, base_path, file_name))
+        self.__consumer_thread.start()
+
+    @staticmethod
+    def __consume(receiver_socket: socket.socket, base_path: str, file_name: str):
+        matches_stream = FileOutputStream(base_path, file_name)
+        received_matches = UnixSocketInputStream(connection=receiver_socket)
+        for match in received_matches:
+            matches_stream.add_item(match)
+        received_matches.close()
+        matches_stream.close()
+
+    def close(self):
+        super().close()
+        self.__consumer_thread.join()
+
+
+def localSocketStreamTest(createTestFile=False):
+    """
+    Receives the events from a stand-in producer over a Unix domain socket and sends the matches over another socket
+    to a consumer thread writing them to the output file. Expects the same matches as for CEP.run.
+    """
+    with tempfile.TemporaryDirectory() as temp_directory:
+        socket_path = os.path.join(temp_directory, "events.sock")
+
+        def connect(producer: LocalStreamProducer):
+            producer.serve_unix_socket(socket_path)
+            return UnixSocketInputStream(socket_path)
+
+        events = LocalStreamSource(nasdaqEventStream, connect)
+        runTest("localSocketStream", [get_google_ascend_pattern()], createTestFile, events=events,
+                expected_file_name="googleAscend", output_stream_factory=SocketRelayedFileOutputStream)
+        events.close()
+
+
+def namedPipeStreamTest(createTestFile=False):
+    """
+    Receives the events from a stand-in producer over a named pipe, expecting the same matches as for CEP.run.
+    """
+    with tempfile.TemporaryDirectory() as temp_directory:
+        pipe_path = os.path.join(temp_directory, "events.pipe")
+
+        def connect(producer: LocalStreamProducer):
+            producer.serve_named_pipe(pipe_path)
+            return NamedPipeInputStream(pipe_path)
+
+        events = LocalStreamSource(nasdaqEventStream, connect)
+        runTest("namedPipeStream", [get_google_ascend_pattern()], createTestFile, events=events,
+                expected_file_name="googleAscend")
+        events.close()
+
+
+def get_out_of_order_nasdaq_stream(block_size: int = 100):
+    """
+    Returns the NASDAQ events shuffled within consecutive blocks of block_size lines, which delays some of the events
+    by up to a few minutes.
+    """
+    lines = list(nasdaqEventStream.duplicate())
+    random_generator = random.Random(0)
+    events = Stream()
+    for start in range(0, len(lines), block_size):
+        block = lines[start:start + block_size]
+        random_generator.shuffle(block)
+        events.put_many(block)
+    events.close()
+    return events
+
+
+def outOfOrderEventsTest(createTestFile=False):
+    """
+    Evaluates a locally shuffled stream with a lateness bound covering the maximal delay, expecting the same matches
+    as for the ordered stream and no dropped events. Then verifies that late events are dropped and counted if the
+    bound is too tight.
+    """
+    out_of_order_events = get_out_of_order_nasdaq_stream()
+    runTest("outOfOrderEvents|", [get_google_ascend_pattern()], createTestFile,
+            DEFAULT_TESTING_REORDERING_EVALUATION_MECHANISM_SETTINGS, events=out_of_order_events,
+            expected_file_name="googleAscend")
+    runTest("outOfOrderEvents|_batched", [get_google_ascend_pattern()], createTestFile,
+            DEFAULT_TESTING_BATCHED_REORDERING_EVALUATION_MECHANISM_SETTINGS, events=out_of_order_events,
+            expected_file_name="googleAscend")
+
+    test_name = "outOfOrderEventsStatistics"
+    cep = CEP([get_google_ascend_pattern()], DEFAULT_TESTING_REORDERING_EVALUATION_MECHANISM_SETTINGS)
+    running_time = cep.run(out_of_order_events.duplicate(), Stream(), DEFAULT_TESTING_DATA_FORMATTER)
+    statistics = cep.get_reorder_statistics()
+    is_test_successful = statistics.out_of_order_events > 0 and statistics.dropped_late_events == 0 and \
+        statistics.max_observed_lateness <= timedelta(minutes=5)
+    strict_eval_params = TreeBasedEvaluationMechanismParameters(
+        storage_params=DEFAULT_TREE_STORAGE_PARAMETERS, optimizer_params=DEFAULT_TESTING_TRIVIAL_OPTIMIZER_SETTINGS,
+        max_lateness=timedelta(0))
+    strict_cep = CEP([get_google_ascend_pattern()], strict_eval_params)
+    running_time += strict_cep.run(out_of_order_events.duplicate(), Stream(), DEFAULT_TESTING_DATA_FORMATTER)
+    strict_statistics = strict_cep.get_reorder_statistics()
+    is_test_successful = is_test_successful and strict_statistics.dropped_late_events > 0 and \
+        strict_statistics.dropped_late_events <= strict_statistics.out_of_order_events
+    report_test_result(test_name, is_test_successful, running_time)
+
+
+def watermarkExpirationTest(createTestFile=False):
+    """
+    Pushes a prefix of the stream and verifies that advancing the watermark beyond the time window empties the storage
+    of every node, although no further events arrive. Also verifies that periodic watermarks do not affect the matches.
+    """
+    test_name = "watermarkExpiration"
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"), PrimitiveEventStructure("MSFT", "b")),
+        BinaryCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"]),
+                        relation_op=lambda x, y: x < y),
+        timedelta(minutes=10)
+    )
+    eval_mechanism = EvaluationMechanismFactory.build_eval_mechanism(DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
+                                                                     [pattern])
+    raw_events = list(nasdaqEventStream.duplicate())[:1000]
+    start = datetime.now()
+    eval_mechanism.push_events(raw_events, DEFAULT_TESTING_DATA_FORMATTER)
+    last_timestamp = DEFAULT_TESTING_DATA_FORMATTER.get_event_timestamp(
+        DEFAULT_TESTING_DATA_FORMATTER.parse_event(raw_events[-1]))
+    leaves = eval_mechanism._tree.get_leaves()
+    root = eval_mechanism._tree.get_root()
+    is_test_successful = any(len(node.get_storage_unit()) > 0 for node in leaves + [root])
+    eval_mechanism.advance_watermark(last_timestamp + timedelta(minutes=11))
+    is_test_successful = is_test_successful and all(len(node.get_storage_unit()) == 0 for node in leaves + [root])
+    running_time = (datetime.now() - start).total_seconds()
+    report_test_result(test_name, is_test_successful, running_time)
+    runTest("googleAscend|_watermarks", [get_google_ascend_pattern()], createTestFile,
+            DEFAULT_TESTING_WATERMARK_EVALUATION_MECHANISM_SETTINGS)
+
+
+def formatterTimestampsTest(createTestFile=False):
+    """
+    Verifies that the batch timestamp conversions of the data formatters agree with the per-event ones, and that
+    timezone-aware CitiBike timestamps are rejected.
+    """
+    test_name = "formatterTimestamps"
+    start = datetime.now()
+    stock_payloads = [DEFAULT_TESTING_DATA_FORMATTER.parse_event(raw_event)
+                      for raw_event in nasdaqEventStreamShort.duplicate()]
+    sensors_formatter = SensorsDataFormatter()
+    sensors_payloads = [sensors_formatter.parse_event(raw_event) for raw_event in
+                        ["PressTemp,03/04/2021 10:11:12,0.001,950.1,25.2",
+                         "Accelerometer,03/04/2021 10:11:12,0.002,1,2,3",
+                         "Magnetometer,03/05/2021 00:00:42,0.003,4,5,6"]]
+    citibike_formatter = CitiBikeDataFormatter()
+    citibike_payloads = [{"starttime": "2013-07-01 00:00:00"}, {"starttime": "2013-07-01 00:00:00"},
+                         {"starttime": "2018-01-01 13:50:57.4340"}]
+    is_test_successful = True
+    for data_formatter, payloads in [(DEFAULT_TESTING_DATA_FORMATTER, stock_payloads),
+                                     (sensors_formatter, sensors_payloads),
+                                     (citibike_formatter, citibike_payloads)]:
+        timestamps = [data_formatter.get_event_timestamp(payload) for payload in payloads]
+        is_test_successful = is_test_successful and data_formatter.get_event_timestamps(payloads) == timestamps and \
+            data_formatter.get_event_timestamps_micros(payloads) == datetimes_to_epoch_micros(timestamps) and \
+            [data_formatter.get_event_timestamp_micros(payload) for payload in payloads] == \
+            datetimes_to_epoch_micros(timestamps)
+    for get_timestamp in [citibike_formatter.get_event_timestamp, citibike_formatter.get_event_timestamp_micros]:
+        try:
+            get_timestamp({"starttime": "2013-07-01 00:00:00+02:00"})
+            is_test_successful = False
+        except Exception:
+            pass
+    running_time = (datetime.now() - start).total_seconds()
+    report_test_result(test_name, is_test_successful, running_time)
@@ -1,5 +1,8 @@
 from base.PatternMatch import PatternMatch
-from tree.PatternMatchStorage import SortedPatternMatchStorage, UnsortedPatternMatchStorage, EquationSides
+import tree.PatternMatchStorage as pattern_match_storage
+from tree.PatternMatchStorage import SortedPatternMatchStorage, UnsortedPatternMatchStorage, EquationSides, \
+    ArrivalOrderedPatternMatchStorage, HashedPatternMatchStorage, RangeIndexedPatternMatchStorage, \
+    CompositeIndexedPatternMatchStorage, TimeBucketedPatternMatchStorage
 from datetime import datetime, timedelta
 from condition.Condition import RelopTypes
 
@@ -30,6 +33,16 @@ def run_storage_tests():
     unsorted_storage_test.run_tests()
     sorted_storage_test = TestSortedStorage()
     sorted_storage_test.run_tests()
+    arrival_ordered_storage_test = TestArrivalOrderedStorage()
+    arrival_ordered_storage_test.run_tests()
+    hashed_storage_test = TestHashedStorage()
+    hashed_storage_test.run_tests()
+    range_indexed_storage_test = TestRangeIndexedStorage()
+    range_indexed_storage_test.run_tests()
+    composite_indexed_storage_test = TestCompositeIndexedStorage()
+    composite_indexed_storage_test.run_tests()
+    time_bucketed_storage_test = TestTimeBucketedStorage()
+    time_bucketed_storage_test.run_tests()
     print("PatternMatchStorage unit tests executed successfully.")
 
 
@@ -229,3 +242,273 @@ class TestSortedStorage:
     def run_tests(self):
         self.test_add()
         self.test_get()
+
+
+"""
+ARRIVAL ORDERED STORAGE
+"""
+
+
+class TestArrivalOrderedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i, "type", self.dt + timedelta(i * 10))]))
+
+    def test_add(self):
+        s = ArrivalOrderedPatternMatchStorage(0)
+        for pm in self.pm_list:
+            s.add(pm)
+
+        assert len(s) == 10, "ArrivalOrderedPatternMatchStorage: incorrect size"
+        for i in range(10):
+            assert s[i] == self.pm_list[i], "ArrivalOrderedPatternMatchStorage: addition wasn't by order"
+        assert s[2:4] == self.pm_list[2:4], "ArrivalOrderedPatternMatchStorage: slicing failed"
+
+    def test_get(self):
+        s = ArrivalOrderedPatternMatchStorage(0)
+        for pm in self.pm_list:
+            s.add(pm)
+
+        assert list(s.get("nothing")) == self.pm_list, \
+            "ArrivalOrderedPatternMatchStorage: getting values didn't return everything"
+
+    def test_clean_expired_partial_matches(self):
+        s = ArrivalOrderedPatternMatchStorage(0)
+        for pm in self.pm_list:
+            s.add(pm)
+        s._clean_expired_partial_matches(self.dt + timedelta(35))
+        assert list(s.get("nothing")) == self.pm_list[4:], \
+            "ArrivalOrderedPatternMatchStorage clean_expired_partial_matches failed"
+        s._clean_expired_partial_matches(self.dt + timedelta(1000))
+        assert len(s) == 0, "ArrivalOrderedPatternMatchStorage clean_expired_partial_matches failed to empty the storage"
+
+    def run_tests(self):
+        self.test_add()
+        self.test_get()
+        self.test_clean_expired_partial_matches()
+
+
+"""
+HASHED STORAGE
+"""
+
+
+class TestHashedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i % 3, "type", self.dt + timedelta(i * 10))]))
+
+    def create_storage(self, in_leaf: bool):
+        s = HashedPatternMatchStorage(lambda pm: pm.events[0].payload, 0, in_leaf)
+        for pm in self.pm_list:
+            s.add(pm)
+        return s
+
+    def test_add(self):
+        s = self.create_storage(True)
+        assert len(s) == 10, "HashedPatternMatchStorage: incorrect size"
+        assert list(s) == self.pm_list, "HashedPatternMatchStorage: iteration wasn't by timestamp order"
+        assert self.pm_list[4] in s, "HashedPatternMatchStorage: a stored match was not found"
+
+    def test_get(self):
+        s = self.create_storage(False)
+        # 0,3,6,9
+        result_pms = s.get(0)
+        assert result_pms == [self.pm_list[0], self.pm_list[3], self.pm_list[6], self.pm_list[9]], \
+            "HashedPatternMatchStorage: get returned incorrect pms"
+        assert s.get(5) == [], "HashedPatternMatchStorage: get of a missing value returned pms"
+
+    def test_clean_expired_partial_matches(self):
+        for in_leaf in [True, False]:
+            s = self.create_storage(in_leaf)
+            s._clean_expired_partial_matches(self.dt + timedelta(35))
+            assert len(s) == 6, "HashedPatternMatchStorage: clean_expired_partial_matches returned incorrect size"
+            assert s.get(0) == [self.pm_list[6], self.pm_list[9]], \
+                "HashedPatternMatchStorage clean_expired_partial_matches failed"
+            s._clean_expired_partial_matches(self.dt + timedelta(85))
+            assert len(s) == 1 and s.get(1) == [] and s.get(0) == [self.pm_list[9]], \
+                "HashedPatternMatchStorage clean_expired_partial_matches failed to remove the expired buckets"
+
+    def run_tests(self):
+        self.test_add()
+        self.test_get()
+        self.test_clean_expired_partial_matches()
+
+
+"""
+RANGE INDEXED STORAGE
+"""
+
+
+class TestRangeIndexedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            # the keys are 0,7,4,1,8,5,2,9,6,3 - unrelated to the arrival order
+            self.pm_list.append(PatternMatch([Event((i * 7) % 10, "type", self.dt + timedelta(i * 10))]))
+
+    def create_storage(self, rel_op: RelopTypes, equation_side: EquationSides = EquationSides.left):
+        s = RangeIndexedPatternMatchStorage(lambda pm: pm.events[0].payload, rel_op, equation_side, 0)
+        for pm in self.pm_list:
+            s.add(pm)
+        # a duplicate key
+        s.add(PatternMatch([Event(5, "type", self.dt + timedelta(100))]))
+        return s
+
+    @staticmethod
+    def get_keys(pms):
+        return [pm.events[0].payload for pm in pms]
+
+    def test_add(self):
+        s = self.create_storage(RelopTypes.Smaller)
+        assert len(s) == 11, "RangeIndexedPatternMatchStorage: incorrect size"
+        assert self.get_keys(s) == [0, 1, 2, 3, 4, 5, 5, 6, 7, 8, 9], "RangeIndexedPatternMatchStorage: incorrect order"
+        assert self.pm_list[5] in s, "RangeIndexedPatternMatchStorage: a stored match was not found"
+
+    def test_get(self):
+        s = self.create_storage(RelopTypes.Greater)
+        assert self.get_keys(s.get(5)) == [6, 7, 8, 9], "RangeIndexedPatternMatchStorage: get_greater failed"
+        s = self.create_storage(RelopTypes.GreaterEqual)
+        assert self.get_keys(s.get(5)) == [5, 5, 6, 7, 8, 9], \
+            "RangeIndexedPatternMatchStorage: get_greater_or_equal failed"
+        s = self.create_storage(RelopTypes.Smaller)
+        assert self.get_keys(s.get(5)) == [0, 1, 2, 3, 4], "RangeIndexedPatternMatchStorage: get_smaller failed"
+        s = self.create_storage(RelopTypes.SmallerEqual)
+        assert self.get_keys(s.get(5)) == [0, 1, 2, 3, 4, 5, 5], \
+            "RangeIndexedPatternMatchStorage: get_smaller_or_equal failed"
+        s = self.create_storage(RelopTypes.Greater, EquationSides.right)
+        assert self.get_keys(s.get(2.5)) == [0, 1, 2], "RangeIndexedPatternMatchStorage: right side get failed"
+        assert s.get(-1) == [], "RangeIndexedPatternMatchStorage: get returned pms out of range"
+
+    def test_clean_expired_partial_matches(self):
+        s = self.create_storage(RelopTypes.Smaller)
+        s._clean_expired_partial_matches(self.dt + timedelta(35))
+        # the matches with the keys 0,7,4,1 have expired
+        assert self.get_keys(s) == [2, 3, 5, 5, 6, 8, 9], \
+            "RangeIndexedPatternMatchStorage clean_expired_partial_matches failed"
+        assert self.get_keys(s.get(6)) == [2, 3, 5, 5], \
+            "RangeIndexedPatternMatchStorage: get failed after clean_expired_partial_matches"
+        s._clean_expired_partial_matches(self.dt + timedelta(1000))
+        assert len(s) == 0, "RangeIndexedPatternMatchStorage clean_expired_partial_matches failed to empty the storage"
+
+    def run_tests(self):
+        sorted_list = pattern_match_storage.SortedList
+        # the storage must also work without the optional sortedcontainers package
+        for backend in {sorted_list, None}:
+            pattern_match_storage.SortedList = backend
+            try:
+                self.test_add()
+                self.test_get()
+                self.test_clean_expired_partial_matches()
+            finally:
+                pattern_match_storage.SortedList = sorted_list
+
+
+"""
+COMPOSITE INDEXED STORAGE
+"""
+
+
+class TestCompositeIndexedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(12):
+            # the payloads are (ticker, price) pairs: (0,0),(1,1),(2,2),(0,3),(1,4),...,(2,11)
+            self.pm_list.append(PatternMatch([Event((i % 3, i), "type", self.dt + timedelta(i * 10))]))
+
+    def create_storage(self):
+        s = CompositeIndexedPatternMatchStorage(lambda pm: pm.events[0].payload[0],
+                                                lambda pm: pm.events[0].payload[1],
+                                                RelopTypes.Greater, EquationSides.left, 0)
+        for pm in self.pm_list:
+            s.add(pm)
+        return s
+
+    def test_add(self):
+        s = self.create_storage()
+        assert len(s) == 12, "CompositeIndexedPatternMatchStorage: incorrect size"
+        assert sorted(s, key=lambda pm: pm.events[0].payload[1]) == self.pm_list, \
+            "CompositeIndexedPatternMatchStorage: iteration didn't return everything"
+        assert self.pm_list[7] in s, "CompositeIndexedPatternMatchStorage: a stored match was not found"
+        assert s.get_key_function()(self.pm_list[7]) == (1, 7), "CompositeIndexedPatternMatchStorage: incorrect key"
+
+    def test_get(self):
+        s = self.create_storage()
+        # the same ticker and a greater price
+        assert s.get((1, 4)) == [self.pm_list[7], self.pm_list[10]], \
+            "CompositeIndexedPatternMatchStorage: get returned incorrect pms"
+        assert s.get((1, 10)) == [], "CompositeIndexedPatternMatchStorage: get returned pms out of range"
+        assert s.get((5, 0)) == [], "CompositeIndexedPatternMatchStorage: get of a missing hash key returned pms"
+
+    def test_clean_expired_partial_matches(self):
+        s = self.create_storage()
+        s._clean_expired_partial_matches(self.dt + timedelta(45))
+        assert len(s) == 7, "CompositeIndexedPatternMatchStorage: clean_expired_partial_matches returned incorrect size"
+        assert s.get((1, 0)) == [self.pm_list[7], self.pm_list[10]], \
+            "CompositeIndexedPatternMatchStorage clean_expired_partial_matches failed"
+        s._clean_expired_partial_matches(self.dt + timedelta(105))
+        assert len(s) == 1 and s.get((0, 0)) == [] and s.get((2, 0)) == [self.pm_list[11]], \
+            "CompositeIndexedPatternMatchStorage clean_expired_partial_matches failed to remove the expired buckets"
+
+    def run_tests(self):
+        self.test_add()
+        self.test_get()
+        self.test_clean_expired_partial_matches()
+
+
+"""
+TIME BUCKETED STORAGE
+"""
+
+
+class TestTimeBucketedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i, "type", self.dt + timedelta(i * 10))]))
+        self.integer_pm_list = []
+        for i in range(10):
+            self.integer_pm_list.append(PatternMatch([Event(i, "type", i * 10)]))
+        # the matches of an internal node do not arrive in the order of their earliest timestamps
+        self.arrival_order = [3, 0, 7, 1, 9, 2, 5, 8, 4, 6]
+
+    def create_storage(self, pm_list, bucket_size):
+        s = TimeBucketedPatternMatchStorage(bucket_size, 0)
+        for i in self.arrival_order:
+            s.add(pm_list[i])
+        return s
+
+    def test_add(self):
+        s = self.create_storage(self.pm_list, timedelta(25))
+        assert len(s) == 10, "TimeBucketedPatternMatchStorage: incorrect size"
+        assert sorted(s, key=lambda pm: pm.first_timestamp) == self.pm_list, \
+            "TimeBucketedPatternMatchStorage: iteration didn't return everything"
+        assert self.pm_list[8] in s, "TimeBucketedPatternMatchStorage: a stored match was not found"
+
+    def test_get(self):
+        s = self.create_storage(self.pm_list, timedelta(25))
+        assert sorted(s.get("nothing"), key=lambda pm: pm.first_timestamp) == self.pm_list, \
+            "TimeBucketedPatternMatchStorage: getting values didn't return everything"
+
+    def test_clean_expired_partial_matches(self):
+        for pm_list, start_time, time_unit in [(self.pm_list, self.dt, timedelta(1)), (self.integer_pm_list, 0, 1)]:
+            s = self.create_storage(pm_list, 25 * time_unit)
+            s._clean_expired_partial_matches(start_time + 35 * time_unit)
+            assert len(s) == 6, "TimeBucketedPatternMatchStorage: clean_expired_partial_matches returned incorrect size"
+            assert sorted(s.get("nothing"), key=lambda pm: pm.first_timestamp) == pm_list[4:], \
+                "TimeBucketedPatternMatchStorage clean_expired_partial_matches failed"
+            s._clean_expired_partial_matches(start_time + 1000 * time_unit)
+            assert len(s) == 0 and list(s) == [], \
+                "TimeBucketedPatternMatchStorage clean_expired_partial_matches failed to empty the storage"
+
+    def run_tests(self):
+        self.test_add()
+        self.test_get()
+        self.test_clean_expired_partial_matches()
@@ -164,7 +164,10 @@ def runTest(testName, patterns, createTestFile=False,
             eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
             parallel_execution_params: ParallelExecutionParameters = None,
             events=None, eventStream=nasdaqEventStream, expected_file_name=None,
-            data_formatter=DEFAULT_TESTING_DATA_FORMATTER):
+            data_formatter=DEFAULT_TESTING_DATA_FORMATTER, output_stream_factory=None):
+    """
+    If provided, output_stream_factory is called with the output directory and file name to create the output stream.
+    """
     if expected_file_name is None:
         expected_file_name = testName
 
@@ -196,7 +199,10 @@ def runTest(testName, patterns, createTestFile=False,
     output_file_name = "%sMatches.txt" % testName.split('|')[0]
     expected_output_file_name = "%sMatches.txt" % expected_file_name.split('|')[0]
     is_async = parallel_execution_params is not None and parallel_execution_params.execution_mode == ParallelExecutionModes.DATA_PARALLELISM
-    matches_stream = FileOutputStream(base_matches_directory, output_file_name, is_async)
+    if output_stream_factory is not None:
+        matches_stream = output_stream_factory(base_matches_directory, output_file_name)
+    else:
+        matches_stream = FileOutputStream(base_matches_directory, output_file_name, is_async)
     running_time = cep.run(events, matches_stream, data_formatter)
 
     expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', expected_output_file_name)
@@ -368,6 +374,32 @@ def runStructuralTest(testName, patterns, expected_result,
         num_failed_tests.failed_tests.add(testName)
 
 
+def report_test_result(test_name, is_test_successful, running_time=None):
+    """
+    Reports the result of a test that is not run by runTest. If provided, the running time is printed and added to
+    the overall time.
+    """
+    result = "Succeeded" if is_test_successful else "Failed"
+    if running_time is None:
+        print("Test %s result: %s" % (test_name, result))
+    else:
+        print("Test %s result: %s, Time Passed: %s" % (test_name, result, running_time))
+        runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(test_name)
+
+
+def runStorageStructuralTest(testName, patterns, expected_result,
+                             eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS):
+    """
+    Checks the kind of storage selected for each node of the tree, without actually running a test.
+    """
+    cep = CEP(patterns, eval_mechanism_params)
+    storage_summary = cep.get_evaluation_mechanism_storage_summary()
+    report_test_result(testName, storage_summary == expected_result)
+
+
 from unittest.mock import patch
 from parallel.data_parallel.DataParallelExecutionAlgorithm import *
 from base.PatternMatch import PatternMatch
@@ -377,12 +409,12 @@ from dataclasses import dataclass, field
 class runParallelTest:
     @dataclass
     class Unit:
-        events_list: List[str] = field(default_factory=list)
+        events_list: List[Event] = field(default_factory=list)
         filtered_matches_list: List[PatternMatch] = field(default_factory=list)
         unfiltered_matches_list: List[PatternMatch] = field(default_factory=list)
 
         def format(self, data_formatter):
-            events = [Event(e, data_formatter) for e in self.events_list]
+            events = [Event.from_raw_data(e, data_formatter) for e in self.events_list]
             events.sort(key=lambda e: e.timestamp)
             self.filtered_matches_list.sort(key=lambda mat: (mat.first_timestamp, mat.last_timestamp))
             self.unfiltered_matches_list.sort(key=lambda mat: (mat.first_timestamp, mat.last_timestamp))
@@ -411,9 +443,9 @@ class runParallelTest:
             runParallelTest.units[self.unit_id].unfiltered_matches_list.append(item)
             self.matches.add_item(item)
 
-    def new_add_event(self, raw_event):
-        runParallelTest.units[self.unit_id].events_list.append(raw_event)
-        self.events.add_item(raw_event)
+    def new_add_event(self, event: Event):
+        runParallelTest.units[self.unit_id].events_list.append(event)
+        self.events.add_item(event)
 
     @staticmethod
     @patch.object(DataParallelExecutionAlgorithm.ExecutionUnit, 'add_event', new=new_add_event)
@@ -7,6 +7,7 @@ from test.NegationTests import *
 from test.PolicyTests import *
 from test.MultiPattern_tests import *
 from test.StorageTests import *
+from test.StreamTests import *
 import test.EventProbabilityTests
 from test.NestedTests import *
 from test.UnitTests.test_storage import run_storage_tests
@@ -94,6 +95,7 @@ multipleNotInTheMiddleTest()
 oneNotAtTheBeginningTest()
 multipleNotAtTheBeginningTest()
 oneNotAtTheEndTest()
+oneNotAtTheEndWatermarkTest()
 multipleNotAtTheEndTest()
 multipleNotBeginAndEndTest()
 testWithMultipleNotAtBeginningMiddleEnd()
@@ -136,8 +138,27 @@ freezePolicy2PatternSearchTest()
 
 # storage tests
 sortedStorageTest()
+hashedStorageTest()
+compositeStorageTest()
+automaticStorageSelectionTest()
 run_storage_tests()
 
+# input stream tests
+streamGetManyTest()
+binaryEventLogTest()
+parallelMultiFileCSVStreamTest()
+backgroundFileOutputStreamTest()
+binaryMatchOutputTest()
+iterMatchesTest()
+asyncRunTest()
+asyncSourcesTest()
+pushEventsTest()
+localSocketStreamTest()
+namedPipeStreamTest()
+outOfOrderEventsTest()
+watermarkExpirationTest()
+formatterTimestampsTest()
+
 # multi-pattern tests
 leafIsRoot()
 distinctPatterns()
@@ -278,6 +299,24 @@ googleIncreasePatternSearchTest_8()
 amazonSpecificPatternSearchTest_8()
 googleAmazonLowPatternSearchTest_8()
 
+# batched event ingestion
+simple_batched()
+googleAscendPatternSearchTest_batched()
+amazonInstablePatternSearchTest_batched()
+msftDrivRacePatternSearchTest_batched()
+googleAmazonLowPatternSearchTest_batched()
+
+# compact event representation
+simple_compact()
+googleAscendPatternSearchTest_compact()
+googleAmazonLowPatternSearchTest_compact()
+
+# integer timestamps
+simple_integer_timestamps()
+googleAscendPatternSearchTest_integer_timestamps()
+amazonInstablePatternSearchTest_integer_timestamps()
+googleAmazonLowPatternSearchTest_integer_timestamps()
+
 # parallel testing
 simpleGroupByKeyTest()
 SensorsDataHIRZELTest()
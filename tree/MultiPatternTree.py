@@ -1,3 +1,4 @@
+from copy import copy
 from typing import Dict
 
 from base.Pattern import Pattern
@@ -6,6 +7,7 @@ from tree.PatternMatchStorage import TreeStorageParameters
 from base.PatternMatch import PatternMatch
 from tree.Tree import Tree
 from tree.nodes.NegationNode import NegationNode
+from misc.TimestampUtils import timedelta_to_micros
 
 
 class MultiPatternTree:
@@ -13,27 +15,42 @@ class MultiPatternTree:
     Represents a multi-pattern evaluation tree.
     """
     def __init__(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                 storage_params: TreeStorageParameters):
+                 storage_params: TreeStorageParameters, integer_timestamps: bool = False):
         self.__id_to_output_node_map = {}
         self.__id_to_pattern_map = {}
+        self.__id_to_window_map = {}
         self.__output_nodes = []
-        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params)
+        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params, integer_timestamps)
 
     def __construct_multi_pattern_tree(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                                       storage_params: TreeStorageParameters):
+                                       storage_params: TreeStorageParameters, integer_timestamps: bool):
         """
         Constructs a multi-pattern evaluation tree.
         It is assumed that each pattern appears only once in patterns (which is a legitimate assumption).
         """
+        if storage_params.automatic_selection:
+            # a node shared by several patterns is accessed by parents evaluating different conditions, hence its
+            # storage cannot be selected according to the conditions of a single parent
+            storage_params = copy(storage_params)
+            storage_params.automatic_selection = False
         # pattern IDs starts from 1
         plan_nodes_to_nodes_map = {}  # a cache for already created subtrees
         for i, (pattern, plan) in enumerate(pattern_to_tree_plan_map.items(), 1):
             pattern.id = i
-            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map).get_root()
+            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map,
+                                 integer_timestamps).get_root()
             self.__id_to_output_node_map[pattern.id] = new_tree_root
             self.__id_to_pattern_map[pattern.id] = pattern
+            self.__id_to_window_map[pattern.id] = \
+                timedelta_to_micros(pattern.window) if integer_timestamps else pattern.window
             self.__output_nodes.append(new_tree_root)
 
+    def get_storage_summary(self):
+        """
+        Returns a tuple containing the storage summaries of the output nodes, ordered by pattern ID.
+        """
+        return tuple(output_node.get_storage_summary() for output_node in self.__output_nodes)
+
     def get_leaves(self):
         """
         Returns all leaves in this multi-pattern-tree.
@@ -48,7 +65,7 @@ class MultiPatternTree:
         Returns True if the given match satisfies the window/confidence constraints of the given pattern
         and False otherwise.
         """
-        if match.last_timestamp - match.first_timestamp > pattern.window:
+        if match.last_timestamp - match.first_timestamp > self.__id_to_window_map[pattern.id]:
             return False
         return pattern.confidence is None or match.probability is None or match.probability >= pattern.confidence
 
@@ -73,6 +90,13 @@ class MultiPatternTree:
                 matches.append(match)
         return matches
 
+    def advance_watermark(self, watermark):
+        """
+        This method is similar to the method- advance_watermark in a Tree.
+        """
+        for output_node in self.__output_nodes:
+            output_node.advance_watermark(watermark)
+
     def get_last_matches(self):
         """
         This method is similar to the method- get_last_matches in a Tree.
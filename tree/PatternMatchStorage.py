@@ -1,10 +1,23 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+from itertools import chain
+
 from base.PatternMatch import PatternMatch
 from misc import DefaultConfig
 from misc.Utils import get_first_index, get_last_index
-from datetime import datetime
+from datetime import datetime, timedelta
 from misc.Utils import find_partial_match_by_timestamp
 from condition.Condition import RelopTypes, EquationSides
 
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # sortedcontainers might not be installed
+    SortedList = None
+
+# greater than any sequence number, hence (value, _AFTER_ALL_SEQUENCE_NUMBERS) follows every entry whose key is value
+_AFTER_ALL_SEQUENCE_NUMBERS = float("inf")
+
 
 class PatternMatchStorage:
     """
@@ -74,6 +87,12 @@ class PatternMatchStorage:
         """
         if self._access_count < self._clean_up_interval:
             return
+        self.clean_expired_partial_matches(earliest_timestamp)
+
+    def clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the expired partial matches immediately, regardless of the number of storage accesses.
+        """
         self._clean_expired_partial_matches(earliest_timestamp)
         self._access_count = 0
 
@@ -83,10 +102,10 @@ class PatternMatchStorage:
         """
         if self._sorted_by_arrival_order:
             count = find_partial_match_by_timestamp(self._partial_matches, earliest_timestamp)
-            self._partial_matches = self._partial_matches[count:]
+            if count > 0:
+                self._partial_matches = self._partial_matches[count:]
         else:
-            self._partial_matches = list(filter(lambda pm: pm.first_timestamp >= earliest_timestamp,
-                                                self._partial_matches))
+            self._partial_matches = [pm for pm in self._partial_matches if pm.first_timestamp >= earliest_timestamp]
 
     def get_internal_buffer(self):
         """
@@ -106,6 +125,12 @@ class PatternMatchStorage:
         """
         raise NotImplementedError()
 
+    def get_description(self):
+        """
+        Returns a short description of the way the pattern matches are stored - to be implemented by subclasses.
+        """
+        raise NotImplementedError()
+
 
 class SortedPatternMatchStorage(PatternMatchStorage):
     """
@@ -123,6 +148,9 @@ class SortedPatternMatchStorage(PatternMatchStorage):
         """
         return item in self.__get_equal(self._get_key(item))
 
+    def get_description(self):
+        return "sorted"
+
     def add(self, pm: PatternMatch):
         """
         Efficiently inserts the new pattern match to the storage according to its key.
@@ -257,6 +285,64 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
     def __init__(self, clean_up_interval: int):
         super().__init__(lambda x: x, False, clean_up_interval)
 
+    def get_description(self):
+        return "unsorted"
+
+    def add(self, pm: PatternMatch):
+        """
+        Appends the given pattern match to the match buffer.
+        """
+        self._access_count += 1
+        self._partial_matches.append(pm)
+
+    def get(self, value: int or float):
+        """
+        Unconditionally returns all the stored matches regardless of the given value.
+        """
+        return self._partial_matches
+
+
+class ArrivalOrderedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores pattern matches in the order of their arrival, which is assumed to also be the order of their
+    earliest timestamps (as is the case for the events arriving at a leaf).
+    The matches are kept in a deque, such that the expired ones are popped from its head in amortized O(1) time
+    without copying the rest of the matches.
+    """
+    def __init__(self, clean_up_interval: int, get_match_key: callable = None):
+        super().__init__(get_match_key, True, clean_up_interval)
+        self._partial_matches = deque()
+
+    def __getitem__(self, index):
+        """
+        Implements list-style "get item" semantics. Slices are returned as lists.
+        """
+        if isinstance(index, slice):
+            return list(self._partial_matches)[index]
+        return self._partial_matches[index]
+
+    def __delitem__(self, index):
+        """
+        Implements list-style "remove item" semantics.
+        """
+        if isinstance(index, slice):
+            partial_matches = list(self._partial_matches)
+            del partial_matches[index]
+            self._partial_matches = deque(partial_matches)
+            return
+        del self._partial_matches[index]
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Pops the pattern matches violating the time window constraint from the head of the storage.
+        """
+        partial_matches = self._partial_matches
+        while len(partial_matches) > 0 and partial_matches[0].first_timestamp < earliest_timestamp:
+            partial_matches.popleft()
+
+    def get_description(self):
+        return "arrival-ordered"
+
     def add(self, pm: PatternMatch):
         """
         Appends the given pattern match to the match buffer.
@@ -271,13 +357,486 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
         return self._partial_matches
 
 
+class TimeBucketedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class partitions the pattern matches into time buckets (panes) of a fixed size according to their earliest
+    timestamps. It is used instead of an unsorted storage, where the matches are not stored in the order of their
+    earliest timestamps and removing the expired ones would otherwise require scanning the whole storage.
+    A bucket whose time span precedes the earliest valid timestamp is dropped at once, such that only the single
+    bucket containing this timestamp has to be scanned. A lookup unconditionally returns the matches of all live buckets.
+    """
+    def __init__(self, bucket_size: timedelta or int, clean_up_interval: int):
+        super().__init__(lambda x: x, False, clean_up_interval)
+        self.__bucket_size = bucket_size
+        # the bucket of a match is determined by the time passed since the earliest timestamp of the first match
+        self.__origin = None
+        self.__buckets = {}
+        # the indices of the existing buckets in an ascending order
+        self.__bucket_indices = []
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        """
+        Iterates over the stored matches bucket by bucket, in the order of the bucket time spans.
+        """
+        return self.get(None)
+
+    def __getitem__(self, index):
+        return self.get_internal_buffer()[index]
+
+    def __setitem__(self, index, item):
+        raise Exception("Unsupported operation")
+
+    def __delitem__(self, index):
+        raise Exception("Unsupported operation")
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches the bucket corresponding to the earliest timestamp of the item.
+        """
+        if self.__origin is None:
+            return False
+        return item in self.__buckets.get(self.__get_bucket_index(item.first_timestamp), ())
+
+    def get_internal_buffer(self):
+        """
+        Returns a list of all the stored matches. As the matches are stored in buckets, the list is created on demand.
+        """
+        return list(self)
+
+    def get_description(self):
+        return "time-bucketed"
+
+    def add(self, pm: PatternMatch):
+        """
+        Appends the new pattern match to the bucket corresponding to its earliest timestamp.
+        """
+        self._access_count += 1
+        if self.__origin is None:
+            self.__origin = pm.first_timestamp
+        index = self.__get_bucket_index(pm.first_timestamp)
+        bucket = self.__buckets.get(index)
+        if bucket is None:
+            self.__buckets[index] = [pm]
+            insort(self.__bucket_indices, index)
+        else:
+            bucket.append(pm)
+        self.__size += 1
+
+    def get(self, value: int or float):
+        """
+        Unconditionally returns all the stored matches regardless of the given value.
+        The matches are returned as a view chaining the live buckets rather than copied into a new list. The view is
+        not affected by a subsequent cleanup, as the expired buckets are replaced rather than modified in place.
+        """
+        return chain.from_iterable([self.__buckets[index] for index in self.__bucket_indices])
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Drops the buckets whose time spans precede the given timestamp and removes the expired pattern matches from
+        the bucket containing it.
+        """
+        if self.__size == 0:
+            return
+        boundary_index = self.__get_bucket_index(earliest_timestamp)
+        expired_bucket_count = bisect_left(self.__bucket_indices, boundary_index)
+        for index in self.__bucket_indices[:expired_bucket_count]:
+            self.__size -= len(self.__buckets.pop(index))
+        del self.__bucket_indices[:expired_bucket_count]
+        bucket = self.__buckets.get(boundary_index)
+        if bucket is None:
+            return
+        remaining_matches = [pm for pm in bucket if pm.first_timestamp >= earliest_timestamp]
+        if len(remaining_matches) == len(bucket):
+            return
+        self.__size -= len(bucket) - len(remaining_matches)
+        if len(remaining_matches) == 0:
+            del self.__buckets[boundary_index]
+            self.__bucket_indices.remove(boundary_index)
+        else:
+            # the bucket is replaced rather than modified in place, as it might be iterated over by a caller of get
+            self.__buckets[boundary_index] = remaining_matches
+
+    def __get_bucket_index(self, timestamp: datetime or int):
+        return (timestamp - self.__origin) // self.__bucket_size
+
+
+class HashedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores the pattern matches in buckets according to the hash of a predefined function (key), such that
+    the matches whose keys are equal to a given value are retrieved without scanning or searching the whole storage.
+    It is used instead of a sorted storage when the matches are only looked up by equality, with an O(1) insertion
+    and a lookup time proportional to the number of returned matches.
+    Within a bucket, the matches are kept in the order of their arrival. In a leaf this is also the order of their
+    timestamps, allowing to remove the expired matches of a bucket using a binary search.
+    """
+    def __init__(self, get_match_key: callable, clean_up_interval: int, in_leaf=False):
+        super().__init__(get_match_key, in_leaf, clean_up_interval)
+        self.__buckets = {}
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        """
+        Iterates over the stored matches. In a leaf, the matches are returned in the order of their timestamps.
+        """
+        if self._sorted_by_arrival_order:
+            return heapq.merge(*self.__buckets.values(), key=lambda pm: pm.first_timestamp)
+        return chain.from_iterable(self.__buckets.values())
+
+    def __getitem__(self, index):
+        return self.get_internal_buffer()[index]
+
+    def __setitem__(self, index, item):
+        raise Exception("Unsupported operation")
+
+    def __delitem__(self, index):
+        raise Exception("Unsupported operation")
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches the bucket corresponding to the key of the item.
+        """
+        return item in self.__buckets.get(self._get_key(item), ())
+
+    def get_internal_buffer(self):
+        """
+        Returns a list of all the stored matches. As the matches are stored in buckets, the list is created on demand.
+        """
+        return list(self)
+
+    def get_description(self):
+        return "hashed"
+
+    def add(self, pm: PatternMatch):
+        """
+        Appends the new pattern match to the bucket corresponding to its key.
+        """
+        self._access_count += 1
+        key = self._get_key(pm)
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            self.__buckets[key] = [pm]
+        else:
+            bucket.append(pm)
+        self.__size += 1
+
+    def get(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are equal to the given value.
+        """
+        return self.__buckets.get(value, [])
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the pattern matches violating the time window constraint from every bucket and drops the buckets left
+        empty.
+        """
+        expired_keys = []
+        for key, bucket in self.__buckets.items():
+            if self._sorted_by_arrival_order:
+                count = find_partial_match_by_timestamp(bucket, earliest_timestamp)
+                if count == 0:
+                    continue
+                remaining_matches = bucket[count:]
+            else:
+                remaining_matches = [pm for pm in bucket if pm.first_timestamp >= earliest_timestamp]
+                if len(remaining_matches) == len(bucket):
+                    continue
+            self.__size -= len(bucket) - len(remaining_matches)
+            if len(remaining_matches) == 0:
+                expired_keys.append(key)
+            else:
+                # the bucket is replaced rather than modified in place, as it might be iterated over by a caller of get
+                self.__buckets[key] = remaining_matches
+        for key in expired_keys:
+            del self.__buckets[key]
+
+
+class _SortedEntryList:
+    """
+    A minimal replacement for sortedcontainers.SortedList used when the package is not installed. The entries are
+    located using a binary search, while an insertion or a removal shifts the underlying list.
+    """
+    def __init__(self):
+        self.__entries = []
+
+    def add(self, entry):
+        insort(self.__entries, entry)
+
+    def bisect_left(self, entry):
+        return bisect_left(self.__entries, entry)
+
+    def __getitem__(self, index):
+        return self.__entries[index]
+
+    def __delitem__(self, index):
+        del self.__entries[index]
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __iter__(self):
+        return iter(self.__entries)
+
+
+class RangeIndexedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores the pattern matches sorted in increasing order according to a predefined function (key), similarly
+    to SortedPatternMatchStorage, and is used for the matches looked up by "smaller than" or "greater than" conditions.
+    The matches are kept in a balanced structure (sortedcontainers.SortedList if available), allowing for a
+    logarithmic insertion and for returning the matches in a range of keys in O(log n + k) time.
+    Since the matches are sorted by key rather than by time, a secondary index (a heap ordered by the earliest
+    timestamps) is used for locating and removing the expired matches without scanning the whole storage.
+    """
+    def __init__(self, get_match_key: callable, rel_op: RelopTypes, equation_side: EquationSides,
+                 clean_up_interval: int):
+        super().__init__(get_match_key, False, clean_up_interval)
+        # each entry is a (key, sequence number, match) tuple, where the unique sequence number prevents the matches
+        # themselves from being compared
+        self.__entries = SortedList() if SortedList is not None else _SortedEntryList()
+        self.__time_index = []
+        self.__sequence_number = 0
+        self.__get_function = self.__generate_get_function(rel_op, equation_side)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __iter__(self):
+        """
+        Iterates over the stored matches in the order of their keys.
+        """
+        return (entry[2] for entry in self.__entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [entry[2] for entry in self.__entries[index]]
+        return self.__entries[index][2]
+
+    def __setitem__(self, index, item):
+        raise Exception("Unsupported operation")
+
+    def __delitem__(self, index):
+        raise Exception("Unsupported operation")
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches the matches whose keys are equal to the key of the item.
+        """
+        key = self._get_key(item)
+        index = self.__entries.bisect_left((key,))
+        while index < len(self.__entries) and self.__entries[index][0] == key:
+            if self.__entries[index][2] == item:
+                return True
+            index += 1
+        return False
+
+    def get_internal_buffer(self):
+        """
+        Returns a list of all the stored matches sorted by their keys.
+        """
+        return list(self)
+
+    def get_description(self):
+        return "range-indexed"
+
+    def add(self, pm: PatternMatch):
+        """
+        Inserts the new pattern match to the storage according to its key and registers it in the time index.
+        """
+        self._access_count += 1
+        entry = (self._get_key(pm), self.__sequence_number, pm)
+        self.__sequence_number += 1
+        self.__entries.add(entry)
+        heapq.heappush(self.__time_index, (pm.first_timestamp, entry[1], entry))
+
+    def get(self, value: int or float):
+        """
+        Applies the storage-specific get() function to extract the required pattern matches.
+        """
+        if len(self.__entries) == 0:
+            return []
+        return self.__get_function(value)
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the pattern matches violating the time window constraint, as located using the time index.
+        """
+        time_index = self.__time_index
+        entries = self.__entries
+        while len(time_index) > 0 and time_index[0][0] < earliest_timestamp:
+            entry = heapq.heappop(time_index)[2]
+            del entries[entries.bisect_left(entry)]
+
+    def __get_range(self, start: int, end: int):
+        """
+        Returns the pattern matches stored between the given positions.
+        """
+        return [entry[2] for entry in self.__entries[start:end]]
+
+    def __first_index_of(self, value: int or float):
+        """
+        Returns the position of the first match whose key is equal to or greater than the given value.
+        """
+        return self.__entries.bisect_left((value,))
+
+    def __first_index_after(self, value: int or float):
+        """
+        Returns the position of the first match whose key is greater than the given value.
+        """
+        return self.__entries.bisect_left((value, _AFTER_ALL_SEQUENCE_NUMBERS))
+
+    def __get_greater(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are greater than the given value.
+        """
+        return self.__get_range(self.__first_index_after(value), len(self.__entries))
+
+    def __get_greater_or_equal(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are greater than or equal to the given value.
+        """
+        return self.__get_range(self.__first_index_of(value), len(self.__entries))
+
+    def __get_smaller(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are smaller than the given value.
+        """
+        return self.__get_range(0, self.__first_index_of(value))
+
+    def __get_smaller_or_equal(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are smaller than or equal to the given value.
+        """
+        return self.__get_range(0, self.__first_index_after(value))
+
+    def __generate_get_function(self, rel_op: RelopTypes, equation_side: EquationSides):
+        """
+        Initializes the function responsible for selecting pattern matches to be returned upon a get() access.
+        """
+        if rel_op == RelopTypes.Greater:
+            return self.__get_greater if equation_side == EquationSides.left else self.__get_smaller
+        if rel_op == RelopTypes.Smaller:
+            return self.__get_smaller if equation_side == EquationSides.left else self.__get_greater
+        if rel_op == RelopTypes.GreaterEqual:
+            return self.__get_greater_or_equal if equation_side == EquationSides.left else self.__get_smaller_or_equal
+        if rel_op == RelopTypes.SmallerEqual:
+            return self.__get_smaller_or_equal if equation_side == EquationSides.left else self.__get_greater_or_equal
+        raise Exception("Range-indexed storage does not support the relation %s" % (rel_op,))
+
+
+class CompositeIndexedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores the pattern matches according to a composite key, consisting of the values of the attributes
+    compared by equality conditions (the hash key) and the value of a single attribute compared by a range condition
+    (the range key). The matches are stored in buckets according to the hash of their hash keys, and each bucket is a
+    range-indexed storage sorted by the range keys. Hence, a lookup only returns the matches satisfying both the
+    equality conditions and the range condition.
+    The key of this storage is a (hash key, range key) pair, and so are the values it is looked up by.
+    """
+    def __init__(self, get_hash_key: callable, get_range_key: callable, rel_op: RelopTypes,
+                 equation_side: EquationSides, clean_up_interval: int):
+        super().__init__(lambda pm: (get_hash_key(pm), get_range_key(pm)), False, clean_up_interval)
+        self.__get_hash_key = get_hash_key
+        self.__get_range_key = get_range_key
+        self.__rel_op = rel_op
+        self.__equation_side = equation_side
+        self.__buckets = {}
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        return chain.from_iterable(self.__buckets.values())
+
+    def __getitem__(self, index):
+        return self.get_internal_buffer()[index]
+
+    def __setitem__(self, index, item):
+        raise Exception("Unsupported operation")
+
+    def __delitem__(self, index):
+        raise Exception("Unsupported operation")
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches the bucket corresponding to the hash key of the item.
+        """
+        bucket = self.__buckets.get(self.__get_hash_key(item))
+        return bucket is not None and item in bucket
+
+    def get_internal_buffer(self):
+        """
+        Returns a list of all the stored matches. As the matches are stored in buckets, the list is created on demand.
+        """
+        return list(self)
+
+    def get_description(self):
+        return "composite-indexed"
+
+    def add(self, pm: PatternMatch):
+        """
+        Inserts the new pattern match to the bucket corresponding to its hash key.
+        """
+        self._access_count += 1
+        hash_key = self.__get_hash_key(pm)
+        bucket = self.__buckets.get(hash_key)
+        if bucket is None:
+            bucket = RangeIndexedPatternMatchStorage(self.__get_range_key, self.__rel_op, self.__equation_side,
+                                                     self._clean_up_interval)
+            self.__buckets[hash_key] = bucket
+        bucket.add(pm)
+        self.__size += 1
+
+    def get(self, value: tuple):
+        """
+        Returns the pattern matches whose hash keys are equal to the first item of the given value and whose range keys
+        satisfy the range condition with respect to the second item.
+        """
+        hash_value, range_value = value
+        bucket = self.__buckets.get(hash_value)
+        if bucket is None:
+            return []
+        return bucket.get(range_value)
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the pattern matches violating the time window constraint from every bucket and drops the buckets left
+        empty.
+        """
+        expired_keys = []
+        for key, bucket in self.__buckets.items():
+            bucket_size = len(bucket)
+            bucket.clean_expired_partial_matches(earliest_timestamp)
+            self.__size -= bucket_size - len(bucket)
+            if len(bucket) == 0:
+                expired_keys.append(key)
+        for key in expired_keys:
+            del self.__buckets[key]
+
+
 class TreeStorageParameters:
     """
     Parameters for the evaluation tree to specify how to store the data.
     """
     def __init__(self, sort_storage: bool = DefaultConfig.SHOULD_SORT_STORAGE, attributes_priorities: dict = None,
                  clean_up_interval: int = DefaultConfig.CLEANUP_INTERVAL,
-                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP):
+                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP,
+                 hash_equality_conditions: bool = DefaultConfig.HASH_EQUALITY_CONDITIONS,
+                 index_range_conditions: bool = DefaultConfig.INDEX_RANGE_CONDITIONS,
+                 build_composite_indices: bool = DefaultConfig.BUILD_COMPOSITE_STORAGE_INDICES,
+                 automatic_selection: bool = DefaultConfig.AUTOMATIC_STORAGE_SELECTION,
+                 time_buckets_per_window: int = DefaultConfig.STORAGE_TIME_BUCKETS_PER_WINDOW):
         if sort_storage is None:
             sort_storage = DefaultConfig.SHOULD_SORT_STORAGE
         if attributes_priorities is None:
@@ -286,6 +845,18 @@ class TreeStorageParameters:
             raise Exception('cleanup interval should be positive.')
         if prioritize_sorting_by_timestamp is None:
             prioritize_sorting_by_timestamp = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP
+        if hash_equality_conditions is None:
+            hash_equality_conditions = DefaultConfig.HASH_EQUALITY_CONDITIONS
+        if index_range_conditions is None:
+            index_range_conditions = DefaultConfig.INDEX_RANGE_CONDITIONS
+        if build_composite_indices is None:
+            build_composite_indices = DefaultConfig.BUILD_COMPOSITE_STORAGE_INDICES
+        if automatic_selection is None:
+            automatic_selection = DefaultConfig.AUTOMATIC_STORAGE_SELECTION
+        if time_buckets_per_window is None:
+            time_buckets_per_window = DefaultConfig.STORAGE_TIME_BUCKETS_PER_WINDOW
+        if time_buckets_per_window < 0:
+            raise Exception('the number of time buckets per window should be non-negative.')
 
         # True if the user is willing to use non-default sorted storage and False otherwise
         self.sort_storage = sort_storage
@@ -296,3 +867,23 @@ class TreeStorageParameters:
         # The number of partial match additions after which a cleanup operation will be applied
         self.clean_up_interval = clean_up_interval
         self.prioritize_sorting_by_timestamp = prioritize_sorting_by_timestamp
+
+        # True if the matches looked up according to an equality condition should be stored in a hashed storage
+        # rather than in a sorted one
+        self.hash_equality_conditions = hash_equality_conditions
+
+        # True if the matches looked up according to a "smaller than" or a "greater than" condition should be stored
+        # in a range-indexed storage rather than in a sorted list
+        self.index_range_conditions = index_range_conditions
+
+        # True if the matches should be indexed according to all the equality conditions between two subtrees and a
+        # single range condition, rather than according to a single condition
+        self.build_composite_indices = build_composite_indices
+
+        # True if, unless sorted storage was explicitly requested, the storage of every node should be selected
+        # automatically according to the conditions its parent evaluates on its partial matches
+        self.automatic_selection = automatic_selection
+
+        # The number of time buckets a time window is divided into in the storage of an internal node whose matches are
+        # not looked up by a key, allowing to drop the expired matches bucket by bucket. 0 disables the time buckets
+        self.time_buckets_per_window = time_buckets_per_window
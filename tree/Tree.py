@@ -14,6 +14,7 @@ from tree.nodes.NegationNode import NegativeSeqNode, NegativeAndNode, NegationNo
 from tree.nodes.Node import Node, PatternParameters
 from tree.PatternMatchStorage import TreeStorageParameters
 from tree.nodes.SeqNode import SeqNode
+from misc.TimestampUtils import timedelta_to_micros
 
 
 class Tree:
@@ -21,11 +22,14 @@ class Tree:
     Represents an evaluation tree. Implements the functionality of constructing an actual tree from tree plan
     object returned by a tree builder. Other than that, merely acts as a proxy to the tree root node.
     The plan_nodes_to_nodes_map is used in multi-pattern mode.
+    If integer_timestamps is set, the time window is converted into microseconds to match the integer timestamps of
+    the events.
     """
     def __init__(self, tree_plan: TreePlan, pattern: Pattern, storage_params: TreeStorageParameters,
-                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None):
+                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None, integer_timestamps: bool = False):
         self.__plan_nodes_to_nodes_map = plan_nodes_to_nodes_map
-        pattern_parameters = PatternParameters(pattern.window, pattern.confidence)
+        window = timedelta_to_micros(pattern.window) if integer_timestamps else pattern.window
+        pattern_parameters = PatternParameters(window, pattern.confidence)
         # Maps between the event to its order in the original pattern
         self.__event_to_index_mapping = {event: index for index, event in enumerate(pattern.get_primitive_event_names())}
         self.__root = self.__construct_tree(tree_plan.modified_pattern.full_structure, tree_plan.root,
@@ -69,6 +73,12 @@ class Tree:
         """
         return self.__root.get_structure_summary()
 
+    def get_storage_summary(self):
+        """
+        Returns a tuple summarizing the structure of the tree along with the kind of storage selected for each node.
+        """
+        return self.__root.get_storage_summary()
+
     @staticmethod
     def __get_operator_arg_list(operator: PatternStructure):
         """
@@ -237,6 +247,13 @@ class Tree:
         # the pending matches were released and have hopefully reached the root
         return self.get_matches()
 
+    def advance_watermark(self, watermark):
+        """
+        Advances the logical time of the entire tree to the given watermark, removing the expired state from all
+        nodes and releasing the pending matches whose time window has passed.
+        """
+        self.__root.advance_watermark(watermark)
+
     def get_root(self):
         """
         Returns the root node of the tree.
@@ -2,6 +2,7 @@ from datetime import timedelta, datetime
 from typing import Dict
 from base.Event import Event
 from base.Pattern import Pattern
+from misc import DefaultConfig
 from adaptive.optimizer.Optimizer import Optimizer
 from plan.TreePlan import TreePlan
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
@@ -21,11 +22,21 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 batch_size: int = DefaultConfig.EVENT_BATCH_SIZE,
+                 compact_events: bool = DefaultConfig.USE_COMPACT_EVENTS,
+                 integer_timestamps: bool = DefaultConfig.USE_INTEGER_TIMESTAMPS,
+                 max_lateness: timedelta = DefaultConfig.MAX_EVENT_LATENESS,
+                 watermark_interval: timedelta = DefaultConfig.WATERMARK_INTERVAL):
         super().__init__(pattern_to_tree_plan_map, storage_params,
                          statistics_collector,
                          optimizer,
-                         statistics_update_time_window)
+                         statistics_update_time_window,
+                         batch_size,
+                         compact_events,
+                         integer_timestamps,
+                         max_lateness,
+                         watermark_interval)
         self.__new_tree = None
         self.__new_event_types_listeners = None
         self.__is_simultaneous_state = False
@@ -59,7 +70,7 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
         if self.__is_simultaneous_state:
             # After this round we ask if we are in a simultaneous state.
             # If the pattern window is over then we want to return to single tree state.
-            if event.max_timestamp - self.__tree_update_time > self._pattern.window:
+            if event.max_timestamp - self.__tree_update_time > self._window:
                 # Passes pending matches from the old tree to the new tree if the root is a NegationNode
                 self.__last_matches_from_old_tree = self._tree.get_last_matches()
 
@@ -82,6 +93,11 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
                 matches.add_item(match)
             self.__last_matches_from_old_tree = None
 
+    def _advance_tree_watermark(self, watermark: datetime):
+        super()._advance_tree_watermark(watermark)
+        if self.__is_simultaneous_state:
+            self.__new_tree.advance_watermark(watermark)
+
     def __play_new_event_on_new_tree(self, event: Event, event_types_listeners):
         """
         Lets the new tree handle the event
@@ -1,19 +1,46 @@
+import asyncio
 from abc import ABC
 from typing import Dict
 from base.DataFormatter import DataFormatter
-from base.Event import Event
+from base.Event import Event, CompactEvent
+from base.PatternMatch import PatternMatch
 from plan.TreePlan import TreePlan
 from stream.Stream import InputStream, OutputStream
+from stream.AsyncStream import iterate_in_micro_batches, add_items, close_sink
 from misc.Utils import *
 from tree.nodes.LeafNode import LeafNode
 from tree.PatternMatchStorage import TreeStorageParameters
 from evaluation.EvaluationMechanism import EvaluationMechanism
+from evaluation.ReorderBuffer import ReorderBuffer
 from misc.ConsumptionPolicy import *
 from tree.MultiPatternTree import MultiPatternTree
 from adaptive.statistics import StatisticsCollector
 from tree.Tree import Tree
-from datetime import timedelta
+from datetime import timedelta, datetime
 from adaptive.optimizer import Optimizer
+from misc import DefaultConfig
+from misc.TimestampUtils import timedelta_to_micros, datetime_to_epoch_micros
+
+
+class _MatchCollector:
+    """
+    Collects the matches reported by the tree during a single evaluation step, so that they can be handed to the
+    consumer without an intermediate output stream.
+    """
+    __slots__ = ("__matches",)
+
+    def __init__(self):
+        self.__matches = []
+
+    def add_item(self, match: PatternMatch):
+        self.__matches.append(match)
+
+    def take(self):
+        """
+        Returns the collected matches and starts collecting anew.
+        """
+        matches, self.__matches = self.__matches, []
+        return matches
 
 
 class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
@@ -24,16 +51,21 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 batch_size: int = DefaultConfig.EVENT_BATCH_SIZE,
+                 compact_events: bool = DefaultConfig.USE_COMPACT_EVENTS,
+                 integer_timestamps: bool = DefaultConfig.USE_INTEGER_TIMESTAMPS,
+                 max_lateness: timedelta = DefaultConfig.MAX_EVENT_LATENESS,
+                 watermark_interval: timedelta = DefaultConfig.WATERMARK_INTERVAL):
         self.__is_multi_pattern_mode = len(pattern_to_tree_plan_map) > 1
         if self.__is_multi_pattern_mode:
             # TODO: support statistic collection in the multi-pattern mode
-            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params)
+            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params, integer_timestamps)
         else:
             pattern = list(pattern_to_tree_plan_map)[0]
             pattern.condition.set_statistics_collector(statistics_collector)
             self._tree = Tree(list(pattern_to_tree_plan_map.values())[0],
-                              list(pattern_to_tree_plan_map)[0], storage_params)
+                              list(pattern_to_tree_plan_map)[0], storage_params, integer_timestamps=integer_timestamps)
 
         self.__storage_params = storage_params
         self.__statistics_collector = statistics_collector
@@ -41,12 +73,31 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
 
         self._event_types_listeners = {}
         self.__statistics_update_time_window = statistics_update_time_window
+        self.__batch_size = batch_size
+        self.__last_statistics_refresh_time = None
+        self.__event_class = CompactEvent if compact_events else Event
+        # if enabled, all timestamps and windows are represented as integer microseconds since the epoch
+        self.__integer_timestamps = integer_timestamps
+        # if a lateness bound is specified, the events are reordered by timestamp before being played on the tree
+        self.__max_lateness = max_lateness
+        if max_lateness is not None and integer_timestamps:
+            self.__max_lateness = timedelta_to_micros(max_lateness)
+        self.__reorder_buffer = None
+        # if a watermark interval is specified, the logical time of the whole tree is periodically advanced
+        self.__watermark_interval = watermark_interval
+        if watermark_interval is not None and integer_timestamps:
+            self.__watermark_interval = timedelta_to_micros(watermark_interval)
+        self.__last_watermark = None
 
         # The remainder of the initialization process is only relevant for the freeze map feature. This feature can
         # only be enabled in single-pattern mode.
         self._pattern = list(pattern_to_tree_plan_map)[0] if not self.__is_multi_pattern_mode else None
+        self._window = None
+        if self._pattern is not None:
+            self._window = timedelta_to_micros(self._pattern.window) if integer_timestamps else self._pattern.window
         self.__freeze_map = {}
         self.__active_freezers = []
+        self.__is_push_session_started = False
 
         if not self.__is_multi_pattern_mode and self._pattern.consumption_policy is not None and \
                 self._pattern.consumption_policy.freeze_names is not None:
@@ -57,30 +108,237 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         Activates the tree evaluation mechanism on the input event stream and reports all found pattern matches to the
         given output stream.
         """
+        self._start_evaluation()
+        if self.__should_evaluate_in_batches():
+            while True:
+                raw_events = events.get_many(self.__batch_size)
+                if len(raw_events) == 0:
+                    break
+                self._handle_raw_events(raw_events, matches, data_formatter)
+        else:
+            for raw_event in events:
+                self._handle_raw_event(raw_event, matches, data_formatter)
+
+        # Now that we finished the input stream, if there were some pending matches somewhere in the tree, we will
+        # collect them now
+        self._get_last_pending_matches(matches)
+        matches.close()
+
+    def iter_matches(self, events: InputStream, data_formatter: DataFormatter):
+        """
+        A generator version of eval. The events are pulled from the input stream only as the matches are consumed,
+        and each match is yielded as soon as it is detected. Closing the generator stops the evaluation.
+        """
+        self._start_evaluation()
+        new_matches = _MatchCollector()
+        if self.__should_evaluate_in_batches():
+            while True:
+                raw_events = events.get_many(self.__batch_size)
+                if len(raw_events) == 0:
+                    break
+                self._handle_raw_events(raw_events, new_matches, data_formatter)
+                yield from new_matches.take()
+        else:
+            for raw_event in events:
+                self._handle_raw_event(raw_event, new_matches, data_formatter)
+                yield from new_matches.take()
+        self._get_last_pending_matches(new_matches)
+        yield from new_matches.take()
+
+    async def eval_async(self, events, matches, data_formatter: DataFormatter,
+                         micro_batch_size: int = DefaultConfig.ASYNC_MICRO_BATCH_SIZE):
+        """
+        An asyncio version of eval. The events are read from an asynchronous (or a regular) input stream in
+        micro-batches of up to micro_batch_size events, and the matches are delivered to an asynchronous (or a regular)
+        sink after each micro-batch. The control is yielded to the event loop between the micro-batches.
+        """
+        self._start_evaluation()
+        new_matches = _MatchCollector()
+        can_evaluate_in_batches = self.__can_evaluate_in_batches()
+        async for raw_events in iterate_in_micro_batches(events, micro_batch_size):
+            if can_evaluate_in_batches:
+                self._handle_raw_events(raw_events, new_matches, data_formatter)
+            else:
+                for raw_event in raw_events:
+                    self._handle_raw_event(raw_event, new_matches, data_formatter)
+            await add_items(matches, new_matches.take())
+            await asyncio.sleep(0)
+        self._get_last_pending_matches(new_matches)
+        await add_items(matches, new_matches.take())
+        await close_sink(matches)
+
+    def push_events(self, raw_events: list, data_formatter: DataFormatter):
+        """
+        Plays the given raw events on the tree and returns the matches detected as a result. Unlike eval, the tree
+        and its partial matches are kept intact between the calls, so that a long-lived evaluation mechanism can be
+        fed incrementally. The events must be pushed in the order of their timestamps.
+        """
+        self.__start_push_session()
+        new_matches = _MatchCollector()
+        if len(raw_events) > 1 and self.__can_evaluate_in_batches():
+            self._handle_raw_events(raw_events, new_matches, data_formatter)
+        else:
+            for raw_event in raw_events:
+                self._handle_raw_event(raw_event, new_matches, data_formatter)
+        return new_matches.take()
+
+    def flush(self):
+        """
+        Releases and returns the pending matches, i.e., the matches that would otherwise only be reported once the
+        input stream ends. The partial matches stored in the tree are retained.
+        """
+        new_matches = _MatchCollector()
+        self._get_last_pending_matches(new_matches)
+        return new_matches.take()
+
+    def advance_watermark(self, watermark: datetime):
+        """
+        Declares that no more events preceding the given watermark are expected and returns the matches detected as a
+        result. The logical time of the whole tree is advanced to the watermark, such that the expired state is
+        removed even from the nodes receiving no new events. Can serve as a heartbeat on a sparse event stream.
+        """
+        self.__start_push_session()
+        if self.__integer_timestamps:
+            watermark = datetime_to_epoch_micros(watermark)
+        new_matches = _MatchCollector()
+        if self.__reorder_buffer is not None:
+            for event in self.__reorder_buffer.release_until(watermark):
+                self.__handle_event(event, new_matches)
+        self.__advance_watermark(watermark, new_matches)
+        return new_matches.take()
+
+    def __start_push_session(self):
+        """
+        Prepares the evaluation mechanism for receiving events in the push-based mode, unless already prepared.
+        """
+        if not self.__is_push_session_started:
+            self._start_evaluation()
+            self.__is_push_session_started = True
+
+    def _start_evaluation(self):
+        """
+        Prepares the evaluation mechanism for receiving a new stream of events.
+        """
         self._event_types_listeners = self._register_event_listeners(self._tree)
-        last_statistics_refresh_time = None
+        self.__last_statistics_refresh_time = None
+        if self.__max_lateness is not None:
+            self.__reorder_buffer = ReorderBuffer(self.__max_lateness)
+        self.__last_watermark = None
 
-        for raw_event in events:
-            parsed = data_formatter.parse_event(raw_event)
-            if parsed is None:
-                #Skipping header row
-                continue
-            event = Event(raw_event, data_formatter)
-            if event.type not in self._event_types_listeners:
-                continue
-            self.__remove_expired_freezers(event)
+    def _handle_raw_event(self, raw_event, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Plays a single raw item of the input stream on the tree and reports the new matches to the given stream.
+        """
+        event = self.__create_relevant_event(raw_event, data_formatter)
+        if event is None:
+            return
+        if self.__reorder_buffer is None:
+            self.__handle_event(event, matches)
+            return
+        for released_event in self.__reorder_buffer.add(event):
+            self.__handle_event(released_event, matches)
+
+    def __handle_event(self, event: Event, matches: OutputStream):
+        """
+        Plays a single event on the tree and reports the new matches to the given stream.
+        """
+        self.__remove_expired_freezers(event)
+
+        if not self.__is_multi_pattern_mode and self.__statistics_collector is not None:
+            # TODO: support multi-pattern mode
+            self.__last_statistics_refresh_time = self.__perform_reoptimization(self.__last_statistics_refresh_time,
+                                                                                event)
 
-            if not self.__is_multi_pattern_mode and self.__statistics_collector is not None:
-                # TODO: support multi-pattern mode
-                last_statistics_refresh_time = self.__perform_reoptimization(last_statistics_refresh_time, event)
+        self._play_new_event_on_tree(event, matches)
+        if self.__watermark_interval is not None:
+            self.__try_advance_watermark(event.timestamp, matches)
+        self._get_matches(matches)
 
+    def _handle_raw_events(self, raw_events: list, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Plays a batch of raw items of the input stream on the tree in the order of their arrival.
+        The new matches are only collected once per batch, which amortizes the per-event overhead.
+        Should only be used if batched evaluation is possible.
+        """
+        events = self.__create_relevant_events(raw_events, data_formatter)
+        if self.__reorder_buffer is not None:
+            events = self.__reorder_buffer.add_many(events)
+        for event in events:
             self._play_new_event_on_tree(event, matches)
-            self._get_matches(matches)
+        if self.__watermark_interval is not None and len(events) > 0:
+            self.__try_advance_watermark(events[-1].timestamp, matches)
+        self._get_matches(matches)
 
-        # Now that we finished the input stream, if there were some pending matches somewhere in the tree, we will
-        # collect them now
-        self._get_last_pending_matches(matches)
-        matches.close()
+    def __try_advance_watermark(self, timestamp: datetime, matches: OutputStream):
+        """
+        Advances the watermark to the given timestamp of the last played event if the watermark interval has passed
+        since the previous watermark.
+        """
+        if self.__last_watermark is None:
+            self.__last_watermark = timestamp
+        elif timestamp - self.__last_watermark >= self.__watermark_interval:
+            self.__advance_watermark(timestamp, matches)
+
+    def __advance_watermark(self, watermark: datetime, matches: OutputStream):
+        """
+        Advances the logical time of the tree to the given watermark and collects the released matches.
+        """
+        self.__last_watermark = watermark
+        self._advance_tree_watermark(watermark)
+        self._get_matches(matches)
+
+    def _advance_tree_watermark(self, watermark: datetime):
+        """
+        Advances the logical time of the evaluation tree to the given watermark.
+        """
+        self._tree.advance_watermark(watermark)
+
+    def __should_evaluate_in_batches(self):
+        """
+        Returns True if the events should be pulled from the input stream and played on the tree in batches.
+        """
+        return self.__batch_size > 1 and self.__can_evaluate_in_batches()
+
+    def __create_relevant_event(self, raw_event, data_formatter: DataFormatter):
+        """
+        Creates an event from the given raw item of the input stream. Returns None if the item does not represent an
+        event (e.g., a header row) or if no leaf of the tree is interested in the type of the event.
+        Whenever the data formatter can cheaply extract the type of a raw item, irrelevant items are dropped
+        without being parsed.
+        """
+        if not isinstance(raw_event, Event):
+            raw_event_type = data_formatter.get_raw_event_type(raw_event)
+            if raw_event_type is not None and raw_event_type not in self._event_types_listeners:
+                return None
+        event = self.__event_class.from_raw_data(raw_event, data_formatter, self.__integer_timestamps)
+        if event is None or event.type not in self._event_types_listeners:
+            return None
+        return event
+
+    def __create_relevant_events(self, raw_events: list, data_formatter: DataFormatter):
+        """
+        Creates the events from the given batch of raw items of the input stream, dropping the items that do not
+        represent an event or are of irrelevant types. The timestamps of the batch are extracted in bulk.
+        """
+        event_types_listeners = self._event_types_listeners
+        relevant_raw_events = []
+        for raw_event in raw_events:
+            if not isinstance(raw_event, Event):
+                raw_event_type = data_formatter.get_raw_event_type(raw_event)
+                if raw_event_type is not None and raw_event_type not in event_types_listeners:
+                    continue
+            relevant_raw_events.append(raw_event)
+        events = self.__event_class.from_raw_data_batch(relevant_raw_events, data_formatter, self.__integer_timestamps)
+        return [event for event in events if event.type in event_types_listeners]
+
+    def __can_evaluate_in_batches(self):
+        """
+        Returns True if the matches can be collected once per batch rather than after each event.
+        This is not the case if the tree can be replaced during the evaluation (as the matches of the replaced tree
+        must be collected before the replacement) or if the 'freeze' consumption policy is enabled (as matched
+        freezers must be released before the next event arrives).
+        """
+        return self.__statistics_collector is None and len(self.__freeze_map) == 0
 
     def __perform_reoptimization(self, last_statistics_refresh_time: timedelta, last_event: Event):
         """
@@ -94,7 +352,8 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         new_statistics = self.__statistics_collector.get_statistics()
         if self.__optimizer.should_optimize(new_statistics, self._pattern):
             new_tree_plan = self.__optimizer.build_new_plan(new_statistics, self._pattern)
-            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params)
+            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params,
+                            integer_timestamps=self.__integer_timestamps)
             self._tree_update(new_tree, last_event.max_timestamp)
         # this is the new last statistic refresh time
         return last_event.max_timestamp
@@ -108,10 +367,19 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
             return True
         return last_event.max_timestamp - last_statistics_refresh_time > self.__statistics_update_time_window
 
+    def get_reorder_statistics(self):
+        """
+        Returns the metrics of the reorder buffer, or None if out-of-order event handling is disabled.
+        """
+        return self.__reorder_buffer.statistics if self.__reorder_buffer is not None else None
+
     def _get_last_pending_matches(self, matches):
         """
-        Collects the pending matches from the tree
+        Plays the events still held by the reorder buffer (if any) and collects the pending matches from the tree
         """
+        if self.__reorder_buffer is not None:
+            for event in self.__reorder_buffer.flush():
+                self.__handle_event(event, matches)
         for match in self._tree.get_last_matches():
             matches.add_item(match)
 
@@ -205,11 +473,14 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
             # freeze option disabled
             return False
         self.__active_freezers = [freezer for freezer in self.__active_freezers
-                                  if event.max_timestamp - freezer.min_timestamp <= self._pattern.window]
+                                  if event.max_timestamp - freezer.min_timestamp <= self._window]
 
     def get_structure_summary(self):
         return self._tree.get_structure_summary()
 
+    def get_storage_summary(self):
+        return self._tree.get_storage_summary()
+
     def __repr__(self):
         return self.get_structure_summary()
 
@@ -14,14 +14,28 @@ class AndNode(BinaryNode):
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
-        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side)
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
+        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side, hash_key=hash_key)
+        if not storage_params.sort_storage and storage_params.automatic_selection:
+            # the storage is selected according to the conditions of this node
+            self._create_subtree_storage_units_by_conditions(storage_params)
+            return
         if not storage_params.sort_storage:
             # efficient storage is disabled
             self._left_subtree.create_storage_unit(storage_params)
             self._right_subtree.create_storage_unit(storage_params)
             return
         # efficient storage was explicitly enabled
+        if storage_params.build_composite_indices:
+            left_hash_key, right_hash_key, left_key, left_rel_op, left_equation_size, \
+                right_key, right_rel_op, right_equation_size = \
+                self._get_condition_based_composite_keys(storage_params.attributes_priorities)
+            if left_hash_key is not None:
+                self._left_subtree.create_storage_unit(storage_params, left_key, left_rel_op, left_equation_size,
+                                                       hash_key=left_hash_key)
+                self._right_subtree.create_storage_unit(storage_params, right_key, right_rel_op, right_equation_size,
+                                                        hash_key=right_hash_key)
+                return
         left_key, left_rel_op, left_equation_size, right_key, right_rel_op, right_equation_size = \
             self._get_condition_based_sorting_keys(storage_params.attributes_priorities)
         self._left_subtree.create_storage_unit(storage_params, left_key, left_rel_op, left_equation_size)
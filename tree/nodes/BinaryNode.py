@@ -1,14 +1,16 @@
 from abc import ABC
-from datetime import timedelta
+from datetime import timedelta, datetime
 from typing import List, Set
 
 from base.Event import Event
 from misc.Utils import calculate_joint_probability
-from condition.Condition import Condition, Variable, EquationSides
+from condition.Condition import Condition, Variable, EquationSides, RelopTypes, AtomicCondition
+from condition.CompositeCondition import AndCondition
 from condition.BaseRelationCondition import BaseRelationCondition
 from base.PatternMatch import PatternMatch
 from tree.nodes.InternalNode import InternalNode
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
+from tree.PatternMatchStorage import TreeStorageParameters
 
 
 class BinaryNode(InternalNode, ABC):
@@ -40,6 +42,11 @@ class BinaryNode(InternalNode, ABC):
             result += self._right_subtree.get_leaves()
         return result
 
+    def advance_watermark(self, watermark: datetime):
+        self._left_subtree.advance_watermark(watermark)
+        self._right_subtree.advance_watermark(watermark)
+        super().advance_watermark(watermark)
+
     def _propagate_condition(self, condition: Condition):
         self._left_subtree.apply_condition(condition)
         self._right_subtree.apply_condition(condition)
@@ -148,6 +155,10 @@ class BinaryNode(InternalNode, ABC):
             return second_event_list + first_event_list
         raise Exception()
 
+    def get_storage_summary(self):
+        return (self.get_structure_summary()[0], self._partial_matches.get_description(),
+                self._left_subtree.get_storage_summary(), self._right_subtree.get_storage_summary())
+
     def is_equivalent(self, other):
         """
         In addition to the checks performed by the base class, checks if:
@@ -168,9 +179,13 @@ class BinaryNode(InternalNode, ABC):
     def __get_filtered_conditions(self, left_event_names: Set[str], right_event_names: Set[str]):
         """
         An auxiliary method returning the atomic binary conditions containing variables from the opposite subtrees
-        of this node.
+        of this node. Only the conjuncts of the condition of this node are considered, as the partial matches are
+        looked up by the keys derived from these conditions, i.e., every match must satisfy each of them.
         """
-        atomic_conditions = self._condition.extract_atomic_conditions()
+        atomic_conditions = self.__get_conjunct_atomic_conditions(self._condition)
+        if atomic_conditions is None:
+            # the condition is not a conjunction of atomic conditions, hence it cannot be used for filtering
+            return []
         filtered_conditions = []
         for atomic_condition in atomic_conditions:
             if not isinstance(atomic_condition, BaseRelationCondition):
@@ -188,6 +203,24 @@ class BinaryNode(InternalNode, ABC):
                 filtered_conditions.append(atomic_condition)
         return filtered_conditions
 
+    @staticmethod
+    def __get_conjunct_atomic_conditions(condition: Condition):
+        """
+        Returns the atomic conditions of the given condition if it is a (possibly nested) conjunction of atomic
+        conditions and None otherwise, e.g., if it contains a disjunction.
+        """
+        if isinstance(condition, AtomicCondition):
+            return condition.extract_atomic_conditions()
+        if not isinstance(condition, AndCondition):
+            return None
+        atomic_conditions = []
+        for inner_condition in condition.get_conditions_list():
+            inner_atomic_conditions = BinaryNode.__get_conjunct_atomic_conditions(inner_condition)
+            if inner_atomic_conditions is None:
+                return None
+            atomic_conditions.extend(inner_atomic_conditions)
+        return atomic_conditions
+
     def __get_params_for_sorting_keys(self, conditions: List[BaseRelationCondition], attributes_priorities: dict,
                                       left_event_names: List[str], right_event_names: List[str]):
         """
@@ -254,3 +287,95 @@ class BinaryNode(InternalNode, ABC):
             )
 
         return left_sorting_key, left_rel_op, left_equation_size, right_sorting_key, right_rel_op, right_equation_size
+
+    def _get_condition_based_composite_keys(self, attributes_priorities: dict):
+        """
+        Calculates the keys of a composite index over the conditions between the subtrees: a hash key consisting of the
+        terms of all the equality conditions and a sorting key according to a single range condition, selected
+        according to the user-provided priorities. Returns None hash keys if no equality condition is available and
+        None sorting keys if no range condition is available.
+        """
+        # the keys are calculated over the partial matches, which only contain the positive events
+        left_event_defs = self._left_subtree.get_positive_event_definitions()
+        right_event_defs = self._right_subtree.get_positive_event_definitions()
+        left_event_names = {item.name for item in left_event_defs}
+        right_event_names = {item.name for item in right_event_defs}
+        filtered_conditions = self.__get_filtered_conditions(left_event_names, right_event_names)
+
+        left_hash_key, right_hash_key = None, None
+        equality_conditions = [condition for condition in filtered_conditions
+                               if condition.relop_type == RelopTypes.Equal]
+        if len(equality_conditions) > 0:
+            left_hash_terms, right_hash_terms = [], []
+            for condition in equality_conditions:
+                if condition.get_left_term().name in left_event_names:
+                    left_hash_terms.append(condition.get_left_term())
+                    right_hash_terms.append(condition.get_right_term())
+                else:
+                    left_hash_terms.append(condition.get_right_term())
+                    right_hash_terms.append(condition.get_left_term())
+            left_hash_key = self.__create_key(left_hash_terms, left_event_defs)
+            right_hash_key = self.__create_key(right_hash_terms, right_event_defs)
+
+        range_conditions = [condition for condition in filtered_conditions
+                            if RelopTypes.is_range_relop_type(condition.relop_type)]
+        if len(range_conditions) == 0:
+            return left_hash_key, right_hash_key, None, None, None, None, None, None
+        if attributes_priorities is None:
+            attributes_priorities = {}
+        range_condition = max(range_conditions,
+                              key=lambda c: max(attributes_priorities.get(c.get_left_term().name, 0),
+                                                attributes_priorities.get(c.get_right_term().name, 0)))
+        rel_op = range_condition.relop_type
+        if range_condition.get_left_term().name in left_event_names:
+            left_term, left_equation_side = range_condition.get_left_term(), EquationSides.left
+            right_term, right_equation_side = range_condition.get_right_term(), EquationSides.right
+        else:
+            left_term, left_equation_side = range_condition.get_right_term(), EquationSides.right
+            right_term, right_equation_side = range_condition.get_left_term(), EquationSides.left
+        left_sorting_key = self.__create_key([left_term], left_event_defs)
+        right_sorting_key = self.__create_key([right_term], right_event_defs)
+        return left_hash_key, right_hash_key, \
+            left_sorting_key, rel_op, left_equation_side, right_sorting_key, rel_op, right_equation_side
+
+    def _create_subtree_storage_units_by_conditions(self, storage_params: TreeStorageParameters):
+        """
+        Creates the storage units of the subtrees according to the conditions evaluated at this node: the partial
+        matches are indexed by the equality conditions (and a range condition, if available) if there are any, by a
+        range condition if there are no equality conditions, and kept in the default storage otherwise (in particular,
+        if the condition of this node contains a disjunction).
+        As the partial matches of one subtree are looked up using the keys calculated over the partial matches of the
+        other, either both subtrees or none of them are indexed.
+        """
+        if not self._left_subtree.can_be_indexed_by_parent_conditions() or \
+                not self._right_subtree.can_be_indexed_by_parent_conditions():
+            self._left_subtree.create_storage_unit(storage_params)
+            self._right_subtree.create_storage_unit(storage_params)
+            return
+        left_hash_key, right_hash_key, left_key, left_rel_op, left_equation_side, \
+            right_key, right_rel_op, right_equation_side = \
+            self._get_condition_based_composite_keys(storage_params.attributes_priorities)
+        if left_hash_key is not None and not storage_params.build_composite_indices:
+            # only index by the equality conditions
+            left_key, left_rel_op, left_equation_side, right_key, right_rel_op, right_equation_side = \
+                None, None, None, None, None, None
+        self._left_subtree.create_storage_unit(storage_params, left_key, left_rel_op, left_equation_side,
+                                               hash_key=left_hash_key)
+        self._right_subtree.create_storage_unit(storage_params, right_key, right_rel_op, right_equation_side,
+                                                hash_key=right_hash_key)
+
+    def __create_key(self, terms: List[Variable], event_defs: List[PrimitiveEventDefinition]):
+        """
+        Converts the given terms into a key fetching callback. A single term is converted into its value, while
+        multiple terms are converted into a tuple of their values.
+        """
+        if len(terms) == 1:
+            term = terms[0]
+            return lambda pm: term.eval(
+                {event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
+            )
+
+        def get_key(pm: PatternMatch):
+            binding = {event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
+            return tuple(term.eval(binding) for term in terms)
+        return get_key
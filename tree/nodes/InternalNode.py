@@ -4,7 +4,9 @@ from typing import List, Set
 from base.Event import Event, AggregatedEvent
 from condition.Condition import RelopTypes, EquationSides
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage, \
+    HashedPatternMatchStorage, RangeIndexedPatternMatchStorage, CompositeIndexedPatternMatchStorage, \
+    TimeBucketedPatternMatchStorage
 
 
 class InternalNode(Node, ABC):
@@ -47,17 +49,49 @@ class InternalNode(Node, ABC):
 
     def _init_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                            rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                           sort_by_first_timestamp: bool = False):
+                           sort_by_first_timestamp: bool = False, hash_key: callable = None):
         """
         An auxiliary method for setting up the storage of an internal node.
-        In the internal nodes, we only sort the storage if a storage key is explicitly provided by the user.
+        In the internal nodes, we only sort the storage if a storage key is explicitly provided by the user or selected
+        automatically by the parent according to its conditions. Otherwise, the matches might be partitioned into time
+        buckets, such that the expired ones can be removed without scanning the whole storage.
+        A storage only accessed according to an equality condition is hashed rather than sorted, while a storage
+        accessed according to a range condition is backed by a range index unless it is sorted by time.
+        A hash key indicates that the storage is accessed according to several conditions and requires a composite
+        index.
         """
-        if not storage_params.sort_storage or sorting_key is None:
-            self._partial_matches = UnsortedPatternMatchStorage(storage_params.clean_up_interval)
+        is_indexing_enabled = storage_params.sort_storage or storage_params.automatic_selection
+        if is_indexing_enabled and hash_key is not None and sorting_key is None:
+            self._partial_matches = HashedPatternMatchStorage(hash_key, storage_params.clean_up_interval)
+        elif is_indexing_enabled and hash_key is not None:
+            self._partial_matches = CompositeIndexedPatternMatchStorage(hash_key, sorting_key, rel_op, equation_side,
+                                                                        storage_params.clean_up_interval)
+        elif not is_indexing_enabled or sorting_key is None:
+            time_bucket_size = self.__get_time_bucket_size(storage_params)
+            if time_bucket_size:
+                self._partial_matches = TimeBucketedPatternMatchStorage(time_bucket_size,
+                                                                        storage_params.clean_up_interval)
+            else:
+                self._partial_matches = UnsortedPatternMatchStorage(storage_params.clean_up_interval)
+        elif rel_op == RelopTypes.Equal and storage_params.hash_equality_conditions:
+            self._partial_matches = HashedPatternMatchStorage(sorting_key, storage_params.clean_up_interval)
+        elif RelopTypes.is_range_relop_type(rel_op) and not sort_by_first_timestamp and \
+             storage_params.index_range_conditions:
+            self._partial_matches = RangeIndexedPatternMatchStorage(sorting_key, rel_op, equation_side,
+                                                                    storage_params.clean_up_interval)
         else:
             self._partial_matches = SortedPatternMatchStorage(sorting_key, rel_op, equation_side,
                                                               storage_params.clean_up_interval, sort_by_first_timestamp)
 
+    def __get_time_bucket_size(self, storage_params: TreeStorageParameters):
+        """
+        Returns the time span of a single time bucket in an unsorted storage of this node, or zero if the matches should
+        not be partitioned into time buckets.
+        """
+        if storage_params.time_buckets_per_window == 0:
+            return 0
+        return self._sliding_window // storage_params.time_buckets_per_window
+
     def handle_new_partial_match(self, partial_match_source: Node):
         """
         A handler for a notification regarding a new partial match generated at one of this node's children.
@@ -1,13 +1,16 @@
+from copy import copy
 from typing import List, Set
 from functools import reduce
 from misc.Utils import calculate_joint_probability
 
 from base.Event import Event, AggregatedEvent
+from condition.Condition import RelopTypes, EquationSides
 from condition.CompositeCondition import CompositeCondition
 from base.PatternMatch import PatternMatch
 from misc.Utils import powerset_generator
 from tree.nodes.Node import Node, PatternParameters
 from tree.nodes.UnaryNode import UnaryNode
+from tree.PatternMatchStorage import TreeStorageParameters
 
 
 class KleeneClosureNode(UnaryNode):
@@ -66,7 +69,7 @@ class KleeneClosureNode(UnaryNode):
         The minimal size constraint on the other hand is enforced via post-processing filtering due to negligible
         overhead.
         """
-        child_partial_matches = self._child.get_partial_matches()
+        child_partial_matches = list(self._child.get_partial_matches())
         if len(child_partial_matches) == 0:
             return []
         last_partial_match = child_partial_matches[-1]
@@ -88,6 +91,28 @@ class KleeneClosureNode(UnaryNode):
         self._condition = condition.get_condition_of(names, get_kleene_closure_conditions=True,
                                                      consume_returned_conditions=True)
 
+    def can_be_indexed_by_parent_conditions(self):
+        """
+        The events of a partial match generated by this node are aggregated, hence a key calculated according to the
+        conditions of the parent cannot be applied to it.
+        """
+        return False
+
+    def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
+                            rel_op: RelopTypes = None, equation_side: EquationSides = None,
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
+        """
+        The sets generated by this node depend on the order in which the partial matches of the child were created.
+        As an indexed or a time-bucketed storage returns the partial matches in the order of their keys or time buckets
+        rather than in the order of their arrival, neither is used in the subtree rooted at this node.
+        """
+        if storage_params.automatic_selection or storage_params.time_buckets_per_window > 0:
+            storage_params = copy(storage_params)
+            storage_params.automatic_selection = False
+            storage_params.time_buckets_per_window = 0
+        super().create_storage_unit(storage_params, sorting_key, rel_op, equation_side, sort_by_first_timestamp,
+                                    hash_key)
+
     def get_structure_summary(self):
         return "KC", self._child.get_structure_summary()
 
@@ -6,7 +6,9 @@ from condition.Condition import Condition, RelopTypes, EquationSides
 from base.PatternStructure import PrimitiveEventStructure
 from tree.nodes.Node import Node
 from tree.nodes.Node import PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage, \
+    ArrivalOrderedPatternMatchStorage, HashedPatternMatchStorage, RangeIndexedPatternMatchStorage, \
+    CompositeIndexedPatternMatchStorage
 
 
 class LeafNode(Node):
@@ -84,22 +86,49 @@ class LeafNode(Node):
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
         """
         For leaf nodes, we always want to create a sorted storage, since the events arrive in their natural order
-        of occurrence anyway. Hence, a sorted storage is initialized either according to a user-specified key, or an
-        arrival order if no storage parameters were explicitly specified.
-        """
-        should_use_default_storage_mode = not storage_params.sort_storage or sorting_key is None
-        actual_sorting_key = (lambda pm: pm.events[0].timestamp) if should_use_default_storage_mode else sorting_key
-        actual_sort_by_first_timestamp = should_use_default_storage_mode or sort_by_first_timestamp
-        self._partial_matches = SortedPatternMatchStorage(actual_sorting_key, rel_op, equation_side,
+        of occurrence anyway. Hence, a sorted storage is initialized according to a user-specified key, while an
+        arrival-ordered storage is used if no storage parameters were explicitly specified and the parent did not
+        select a key according to its conditions. A storage only accessed according to an equality condition is hashed
+        rather than sorted, while a storage accessed according to a range condition is backed by a range index unless
+        it is sorted by time. A hash key indicates that the storage is accessed according to several conditions and
+        requires a composite index.
+        """
+        is_indexing_enabled = storage_params.sort_storage or storage_params.automatic_selection
+        if is_indexing_enabled and hash_key is not None:
+            if sorting_key is None:
+                self._partial_matches = HashedPatternMatchStorage(hash_key, storage_params.clean_up_interval, True)
+            else:
+                self._partial_matches = CompositeIndexedPatternMatchStorage(hash_key, sorting_key, rel_op,
+                                                                            equation_side,
+                                                                            storage_params.clean_up_interval)
+            return
+        should_use_default_storage_mode = not is_indexing_enabled or sorting_key is None
+        if should_use_default_storage_mode:
+            # the matches are kept in their arrival order, allowing for a cheap removal of the expired ones
+            self._partial_matches = ArrivalOrderedPatternMatchStorage(storage_params.clean_up_interval,
+                                                                      lambda pm: pm.events[0].timestamp)
+            return
+        if rel_op == RelopTypes.Equal and storage_params.hash_equality_conditions:
+            self._partial_matches = HashedPatternMatchStorage(sorting_key, storage_params.clean_up_interval, True)
+            return
+        if RelopTypes.is_range_relop_type(rel_op) and not sort_by_first_timestamp and \
+           storage_params.index_range_conditions:
+            self._partial_matches = RangeIndexedPatternMatchStorage(sorting_key, rel_op, equation_side,
+                                                                    storage_params.clean_up_interval)
+            return
+        self._partial_matches = SortedPatternMatchStorage(sorting_key, rel_op, equation_side,
                                                           storage_params.clean_up_interval,
-                                                          actual_sort_by_first_timestamp, True)
+                                                          sort_by_first_timestamp, True)
 
     def get_structure_summary(self):
         return self.__event_name
 
+    def get_storage_summary(self):
+        return self.__event_name, self._partial_matches.get_description()
+
     def is_equivalent(self, other):
         """
         Checks if the two nodes accept the same event type.
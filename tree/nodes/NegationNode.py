@@ -57,12 +57,12 @@ class NegationNode(BinaryNode, ABC):
         super()._set_event_definitions(positive_event_defs, negative_event_defs)
         self._positive_event_defs = positive_event_defs
 
-    def clean_expired_partial_matches(self, last_timestamp: datetime):
+    def clean_expired_partial_matches(self, last_timestamp: datetime, force: bool = False):
         """
         In addition to the normal functionality of this method, attempt to flush pending matches that can already
         be propagated.
         """
-        super().clean_expired_partial_matches(last_timestamp)
+        super().clean_expired_partial_matches(last_timestamp, force)
         if self.__is_first_unbounded_negative_node():
             self.flush_pending_matches(last_timestamp)
 
@@ -79,6 +79,8 @@ class NegationNode(BinaryNode, ABC):
             self.__pending_partial_matches = self.__pending_partial_matches[count:]
         else:
             matches_to_flush = self.__pending_partial_matches
+            # the engine might keep running after a full flush, hence the released matches must not be released again
+            self.__pending_partial_matches = []
 
         # since matches_to_flush could be expired, we need to temporarily disable timestamp checks
         Node._toggle_enable_partial_match_expiration(False)
@@ -184,11 +186,11 @@ class NegationNode(BinaryNode, ABC):
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
         """
         For now, only the most trivial storage settings will be supported by negative nodes.
         """
-        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side)
+        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side, hash_key=hash_key)
         self._positive_subtree.create_storage_unit(storage_params)
         self._negative_subtree.create_storage_unit(storage_params)
 
@@ -1,6 +1,6 @@
 from abc import ABC
 from datetime import timedelta, datetime
-from queue import Queue
+from collections import deque
 from typing import List, Set, Optional
 from dataclasses import dataclass
 
@@ -26,7 +26,7 @@ class PatternParameters:
     """
     The parameters of a pattern that are propagated down during evaluation tree during the construction process.
     """
-    window: timedelta
+    window: timedelta or int  # an integer number of microseconds if the engine operates on integer timestamps
     confidence: Optional[float]
 
 
@@ -65,7 +65,7 @@ class Node(ABC):
 
         # Full pattern matches that were not yet reported. Only relevant for an output node, that is, for a node
         # corresponding to a full pattern definition.
-        self._unreported_matches = Queue()
+        self._unreported_matches = deque()
         self._is_output_node = False
 
         # set of event types that will only appear in a single full match
@@ -94,29 +94,41 @@ class Node(ABC):
         Removes and returns an unreported match buffered at this node.
         Used in an output node to collect full pattern matches.
         """
-        ret = self._unreported_matches.get()
+        ret = self._unreported_matches.popleft()
         return ret
 
     def has_unreported_matches(self):
         """
         Returns True if this node contains any matches we did not report yet and False otherwise.
         """
-        return self._unreported_matches.qsize() > 0
+        return len(self._unreported_matches) > 0
 
-    def clean_expired_partial_matches(self, last_timestamp: datetime):
+    def clean_expired_partial_matches(self, last_timestamp: datetime, force: bool = False):
         """
         Removes partial matches whose earliest timestamp violates the time window constraint.
         Also removes the expired filtered events if the "single" consumption policy is enabled.
+        Unless force is set, the storage is only actually cleaned once in a predefined number of accesses.
         """
         if not Node._is_partial_match_expiration_enabled():
             return
-        self._partial_matches.try_clean_expired_partial_matches(last_timestamp - self._sliding_window)
+        if force:
+            self._partial_matches.clean_expired_partial_matches(last_timestamp - self._sliding_window)
+        else:
+            self._partial_matches.try_clean_expired_partial_matches(last_timestamp - self._sliding_window)
         if len(self._single_event_types) == 0:
             # "single" consumption policy is disabled or no event types under the policy reach this node
             return
         self._filtered_events = set([event for event in self._filtered_events
                                     if event.min_timestamp >= last_timestamp - self._sliding_window])
 
+    def advance_watermark(self, watermark: datetime):
+        """
+        Notifies this node and the nodes below it that no more events with timestamps preceding the given watermark
+        are expected. Removes all the state that expired by the watermark, including the nodes that receive no new
+        input. The subtrees are handled first, such that the state released by them reaches this node.
+        """
+        self.clean_expired_partial_matches(watermark, force=True)
+
     def _add_partial_match(self, pm: PatternMatch):
         """
         Registers a new partial match at this node.
@@ -125,10 +137,10 @@ class Node(ABC):
         """
         self._partial_matches.add(pm)
         for parent in self._parents:
-            self._parent_to_unhandled_queue_dict[parent].put(pm)
+            self._parent_to_unhandled_queue_dict[parent].append(pm)
             parent.handle_new_partial_match(self)
         if self.is_output_node():
-            self._unreported_matches.put(pm)
+            self._unreported_matches.append(pm)
 
     def __can_add_partial_match(self, pm: PatternMatch) -> bool:
         """
@@ -197,7 +209,7 @@ class Node(ABC):
         """
         Returns the last partial match buffered at this node and not yet transferred to parent.
         """
-        return self._parent_to_unhandled_queue_dict[parent].get(block=False)
+        return self._parent_to_unhandled_queue_dict[parent].popleft()
 
     def set_parents(self, parents, on_init: bool = False):
         """
@@ -229,7 +241,7 @@ class Node(ABC):
         if parent in self._parents:
             return
         self._parents.append(parent)
-        self._parent_to_unhandled_queue_dict[parent] = Queue()
+        self._parent_to_unhandled_queue_dict[parent] = deque()
         if not on_init:
             self._parent_to_info_dict[parent] = self.get_positive_event_definitions()
 
@@ -401,10 +413,26 @@ class Node(ABC):
         """
         raise NotImplementedError()
 
+    def can_be_indexed_by_parent_conditions(self):
+        """
+        Returns True if the storage of this node can be indexed according to the conditions evaluated by its parent
+        and False otherwise.
+        """
+        return True
+
+    def get_storage_summary(self):
+        """
+        Returns the summary of the subtree rooted at this node, annotated with the kind of storage selected for each
+        node - to be implemented by subclasses.
+        """
+        raise NotImplementedError()
+
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
         """
         An abstract method for recursive partial match storage initialization.
+        If hash_key is provided, the matches are looked up by the equality of its value in addition to the relation
+        specified by sorting_key and rel_op (if any).
         """
         raise NotImplementedError()
@@ -88,7 +88,7 @@ class SeqNode(BinaryNode):
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
         """
         This function creates the storage for partial_matches it gives a special key: callable
         to the storage unit which tells the storage unit on which attribute(only timestamps here)
@@ -96,13 +96,34 @@ class SeqNode(BinaryNode):
         We assume all events are in SEQ(,,,,...) which makes the order in partial match the same
         as in event_defs: [(1,a),(2,b)] in event_defs and [a,b] in pm.
         """
-        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side, sort_by_first_timestamp)
+        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side, sort_by_first_timestamp, hash_key)
+        if not storage_params.sort_storage and storage_params.automatic_selection:
+            # the storage is selected according to the conditions of this node
+            self._create_subtree_storage_units_by_conditions(storage_params)
+            return
         if not storage_params.sort_storage:
             # efficient storage is disabled
             self._left_subtree.create_storage_unit(storage_params)
             self._right_subtree.create_storage_unit(storage_params)
             return
         left_sort_by_first_timestamp, right_sort_by_first_timestamp = False, False
+        left_hash_key, right_hash_key = None, None
+        if storage_params.build_composite_indices:
+            left_hash_key, right_hash_key, left_key, left_rel_op, left_equation_size, \
+                right_key, right_rel_op, right_equation_size = \
+                self._get_condition_based_composite_keys(storage_params.attributes_priorities)
+        if left_hash_key is not None:
+            # the equality conditions are used for hashing, while either the sequence order or a range condition is
+            # used for sorting
+            if left_key is None or storage_params.prioritize_sorting_by_timestamp:
+                left_key, right_key, left_rel_op, _, _ = self._get_sequence_based_sorting_keys()
+                right_rel_op, left_equation_size, right_equation_size = \
+                    left_rel_op, EquationSides.left, EquationSides.right
+            self._left_subtree.create_storage_unit(storage_params, left_key, left_rel_op, left_equation_size,
+                                                   hash_key=left_hash_key)
+            self._right_subtree.create_storage_unit(storage_params, right_key, right_rel_op, right_equation_size,
+                                                    hash_key=right_hash_key)
+            return
         # finding sorting keys in case user requested to sort by condition
         if storage_params.prioritize_sorting_by_timestamp:
             # first try the timestamps, then the conditions
@@ -1,5 +1,5 @@
 from abc import ABC
-from datetime import timedelta
+from datetime import timedelta, datetime
 from typing import List, Set
 
 from condition.Condition import Condition, RelopTypes, EquationSides
@@ -22,6 +22,10 @@ class UnaryNode(InternalNode, ABC):
             raise Exception("Unary Node with no child")
         return self._child.get_leaves()
 
+    def advance_watermark(self, watermark: datetime):
+        self._child.advance_watermark(watermark)
+        super().advance_watermark(watermark)
+
     def _propagate_condition(self, condition: Condition):
         self._child.apply_condition(condition)
 
@@ -54,8 +58,8 @@ class UnaryNode(InternalNode, ABC):
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
-                            sort_by_first_timestamp: bool = False):
-        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side)
+                            sort_by_first_timestamp: bool = False, hash_key: callable = None):
+        self._init_storage_unit(storage_params, sorting_key, rel_op, equation_side, hash_key=hash_key)
         self._child.create_storage_unit(storage_params)
 
     def get_child(self):
@@ -64,6 +68,10 @@ class UnaryNode(InternalNode, ABC):
         """
         return self._child
 
+    def get_storage_summary(self):
+        return (self.get_structure_summary()[0], self._partial_matches.get_description(),
+                self._child.get_storage_summary())
+
     def is_equivalent(self, other):
         """
         In addition to the checks performed by the base class, verifies the equivalence of the child nodes.